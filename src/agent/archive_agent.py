@@ -4,12 +4,16 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from src.core.archive_handler import ArchiveHandler
+from src.core.extraction_guard import ExtractionLimitExceeded
+from src.core.file_sniffer import sniff_file
 from src.core.office_parser import OfficeParser
+from src.core.parse_cache import ParseCache
 from src.core.powerbi_parser import PowerBIParser
 from src.core.tableau_parser import TableauParser
 from src.core.synapse_parser import SynapseParser
 from src.core.relevance_engine import RelevanceEngine
 from src.core.content_summarizer import ContentSummarizer
+from src.utils.async_executor import run_blocking
 from src.utils.config import load_config
 from .authentication import TokenAuthenticator
 
@@ -19,13 +23,33 @@ from .request_interpreter import RequestInterpreter
 class ArchiveAgent:
     """Main agent class orchestrating archive processing."""
 
+    # Processing strategy for each content kind reported by ``sniff_file``.
+    STRATEGY_TYPES = {
+        "docx": "office",
+        "xlsx": "office",
+        "pptx": "office",
+        "pbix": "powerbi",
+        "twbx": "tableau",
+        "synapse": "synapse",
+        "zip": "zip",
+        "tar": "tar",
+        "7z": "7z",
+    }
+
     def __init__(self, authenticator: TokenAuthenticator | None = None) -> None:
         self.config = load_config()
         self.archive_handler = ArchiveHandler()
-        self.office_parser = OfficeParser()
-        self.powerbi_parser = PowerBIParser()
-        self.tableau_parser = TableauParser()
-        self.synapse_parser = SynapseParser()
+        self.parse_cache = None
+        if self.config.parse_cache_memory_mb > 0 or self.config.parse_cache_mb > 0:
+            self.parse_cache = ParseCache(
+                Path(self.config.temp_storage_path) / "parse_cache",
+                memory_bytes=self.config.parse_cache_memory_mb * 1024 * 1024,
+                disk_bytes=self.config.parse_cache_mb * 1024 * 1024,
+            )
+        self.office_parser = OfficeParser(self.parse_cache)
+        self.powerbi_parser = PowerBIParser(self.parse_cache)
+        self.tableau_parser = TableauParser(self.parse_cache)
+        self.synapse_parser = SynapseParser(self.parse_cache)
         self.relevance_engine = RelevanceEngine()
         self.summarizer = ContentSummarizer()
         self.interpreter = RequestInterpreter()
@@ -40,6 +64,34 @@ class ArchiveAgent:
         auth_token: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Process a request against the provided file."""
+        response = self._build_response(file_path, request_text, auth_token)
+        self.context.append({"request": request_text, "response": response})
+        return response
+
+    async def process_request_async(
+        self,
+        file_path: str,
+        request_text: str,
+        context: Optional[Dict[str, Any]] = None,
+        auth_token: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Asynchronous :meth:`process_request` on the shared bounded executor.
+
+        A cancelled request is not recorded in the conversation context.
+        """
+        response = await run_blocking(
+            self.archive_handler.executor,
+            self._build_response,
+            file_path,
+            request_text,
+            auth_token,
+        )
+        self.context.append({"request": request_text, "response": response})
+        return response
+
+    def _build_response(
+        self, file_path: str, request_text: str, auth_token: Optional[str]
+    ) -> Dict[str, Any]:
         if not self.authenticator.is_authorized(auth_token):
             raise PermissionError("Unauthorized")
 
@@ -56,23 +108,18 @@ class ArchiveAgent:
             {"files": [str(path)], "categories": {"files": [str(path)]}},
             request_text,
         )
-        response = {"summary": summary, "content": content, "parameters": params}
-        self.context.append({"request": request_text, "response": response})
-        return response
+        return {"summary": summary, "content": content, "parameters": params}
 
     def determine_processing_strategy(
         self, file_path: Path, intent_analysis: Dict[str, Any]
     ) -> Dict[str, Any]:
-        ext = file_path.suffix.lower()
-        if ext in {".docx", ".xlsx", ".pptx"}:
-            file_type = "office"
-        elif ext == ".pbix":
-            file_type = "powerbi"
-        elif ext == ".twbx":
-            file_type = "tableau"
-        elif ext == ".zip" and file_path.name.endswith("synapse.zip"):
-            file_type = "synapse"
-        else:
+        kind = sniff_file(file_path)
+        if kind == "zip" and file_path.name.endswith("synapse.zip"):
+            # No Synapse folders or files were found, so the member names are
+            # inconclusive; keep routing by the export's file name.
+            kind = "synapse"
+        file_type = self.STRATEGY_TYPES.get(kind)
+        if file_type is None:
             detected = self.archive_handler.detect_archive_type(file_path)
             file_type = detected or "unknown"
         return {"type": file_type, "intent": intent_analysis.get("intent")}
@@ -81,11 +128,12 @@ class ArchiveAgent:
         self, file_path: Path, file_type: str, intent: Dict[str, Any]
     ) -> Dict[str, Any]:
         if file_type == "office":
-            if file_path.suffix.lower() == ".docx":
+            kind = sniff_file(file_path)
+            if kind == "docx":
                 return self.office_parser.parse_docx(file_path)
-            if file_path.suffix.lower() == ".xlsx":
+            if kind == "xlsx":
                 return self.office_parser.parse_xlsx(file_path)
-            if file_path.suffix.lower() == ".pptx":
+            if kind == "pptx":
                 return self.office_parser.parse_pptx(file_path)
         if file_type == "powerbi":
             return self.powerbi_parser.parse_pbix(file_path)
@@ -95,5 +143,18 @@ class ArchiveAgent:
             return self.synapse_parser.parse_synapse_package(file_path)
         if file_type in {"zip", "tar", "7z"}:
             files = self.archive_handler.list_contents(file_path)
-            return {"files": files}
+            result: Dict[str, Any] = {"files": files}
+            if any(self.archive_handler.archive_type_for_name(f) for f in files):
+                nested = self.archive_handler.open_nested(file_path)
+                nested_files: List[str] = []
+                result["nested_truncated"] = False
+                try:
+                    for member in nested.walk():
+                        if not member.is_dir:
+                            nested_files.append(member.path)
+                except ExtractionLimitExceeded:
+                    # The flat listing stands; report how far the walk got.
+                    result["nested_truncated"] = True
+                result["nested_files"] = nested_files
+            return result
         return {"unsupported": str(file_path)}
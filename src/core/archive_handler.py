@@ -1,22 +1,375 @@
 from __future__ import annotations
 
+import asyncio
+import fnmatch
+import io
+import lzma
 import os
+import shutil
 import tarfile
 import tempfile
+import threading
+import time
 import zipfile
-from contextlib import contextmanager
+import zlib
+from collections import deque
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import List, Optional
+from typing import (
+    Any,
+    AsyncIterator,
+    BinaryIO,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import py7zr
 
+from src.core.archive_index import ArchiveIndex, ArchiveIndexCache
+from src.core.decompression import (
+    ParallelDecompressor,
+    detect_codec,
+    stream_decoder,
+)
+from src.core.extraction_cache import CachedTree, ExtractionCache
+from src.core.extraction_guard import (
+    ExtractionBudget,
+    ExtractionCancelled,
+    ExtractionGuard,
+    ExtractionLimitExceeded,
+)
+from src.core.file_sniffer import ARCHIVE_TYPES, sniff_file
+from src.core.gzip_index import GzipTarIndex, is_gzip
+from src.core.nested_archive import NestedArchive, NestedBudget
+from src.utils.async_executor import get_executor, run_blocking, run_cancellable
 from src.utils.storage import StorageClient
 from src.utils.config import AppConfig, load_config
+from src.utils.partition import partition_by_weight
 
-try:
-    import magic
-except Exception:  # pragma: no cover - optional dependency
-    magic = None
+
+@dataclass
+class ArchiveMember:
+    """Metadata and a lazily-opened reader for a single archive entry."""
+
+    name: str
+    size: int
+    compressed_size: Optional[int] = None
+    is_dir: bool = False
+    mtime: Optional[float] = None
+    crc: Optional[int] = None
+    opener: Optional[Callable[[], BinaryIO]] = field(default=None, repr=False)
+    info: Any = field(default=None, repr=False)
+
+    def open(self) -> BinaryIO:
+        """Return a binary file-like reader positioned at the member start."""
+        if self.opener is None:
+            raise ValueError(f"Member has no readable content: {self.name}")
+        return self.opener()
+
+    def read(self) -> bytes:
+        """Return the full decompressed member content."""
+        with self.open() as fh:
+            return fh.read()
+
+
+@dataclass
+class MemberFilter:
+    """Selection rules evaluated against archive headers before decompression.
+
+    ``include`` and ``exclude`` are glob patterns matched against the full
+    member name. ``limit`` caps the number of selected files.
+    """
+
+    include: Sequence[str] = ()
+    exclude: Sequence[str] = ()
+    min_size: Optional[int] = None
+    max_size: Optional[int] = None
+    predicate: Optional[Callable[[ArchiveMember], bool]] = None
+    limit: Optional[int] = None
+
+    def matches(self, member: ArchiveMember) -> bool:
+        """Return True if ``member`` satisfies every rule except ``limit``."""
+        if self.include and not any(
+            fnmatch.fnmatchcase(member.name, pat) for pat in self.include
+        ):
+            return False
+        if any(fnmatch.fnmatchcase(member.name, pat) for pat in self.exclude):
+            return False
+        if self.min_size is not None and member.size < self.min_size:
+            return False
+        if self.max_size is not None and member.size > self.max_size:
+            return False
+        if self.predicate is not None and not self.predicate(member):
+            return False
+        return True
+
+    def select(self, members: Iterable[ArchiveMember]) -> Iterator[ArchiveMember]:
+        """Yield matching members, stopping once ``limit`` files are selected."""
+        selected = 0
+        for member in members:
+            if self.limit is not None and selected >= self.limit:
+                return
+            if not self.matches(member):
+                continue
+            if not member.is_dir:
+                selected += 1
+            yield member
+
+
+class _BufferWriter:
+    """In-memory writer compatible with py7zr's ``Py7zIO`` protocol."""
+
+    def __init__(self) -> None:
+        self._buffer = io.BytesIO()
+
+    def write(self, data: bytes) -> int:
+        return self._buffer.write(data)
+
+    def read(self, size: Optional[int] = None) -> bytes:
+        return self._buffer.read(size)
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        return self._buffer.seek(offset, whence)
+
+    def flush(self) -> None:
+        pass
+
+    def size(self) -> int:
+        return len(self._buffer.getbuffer())
+
+    def close(self) -> None:
+        # py7zr closes each writer once the member is decoded; keep the data.
+        pass
+
+    def getvalue(self) -> bytes:
+        return self._buffer.getvalue()
+
+
+class _BufferWriterFactory:
+    """py7zr ``WriterFactory`` collecting members into memory buffers."""
+
+    def __init__(self) -> None:
+        self.products: Dict[str, _BufferWriter] = {}
+
+    def create(self, filename: str) -> _BufferWriter:
+        product = _BufferWriter()
+        self.products[filename] = product
+        return product
+
+
+class _GuardedZipFile(zipfile.ZipFile):
+    """ZipFile whose member readers account output against a guard."""
+
+    def __init__(self, file: Any, guard: ExtractionGuard) -> None:
+        super().__init__(file)
+        self._guard = guard
+
+    def open(self, name: Any, mode: str = "r", pwd: Any = None, **kwargs: Any):
+        fh = super().open(name, mode, pwd=pwd, **kwargs)
+        if mode != "r":
+            return fh
+        info = name if isinstance(name, zipfile.ZipInfo) else self.getinfo(name)
+        return self._guard.wrap(fh, _zip_member(self, info))
+
+
+class _GuardedFileWriter:
+    """py7zr writer streaming a member to disk under an extraction guard."""
+
+    def __init__(self, path: Path, member: ArchiveMember, guard: ExtractionGuard):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = open(path, "wb")
+        self._member = member
+        self._guard = guard
+        self._size = 0
+
+    def write(self, data: bytes) -> int:
+        self._guard.account(self._member, len(data))
+        self._size += len(data)
+        return self._fh.write(data)
+
+    def read(self, size: Optional[int] = None) -> bytes:
+        raise io.UnsupportedOperation("write-only")
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        return self._fh.seek(offset, whence)
+
+    def flush(self) -> None:
+        self._fh.flush()
+
+    def size(self) -> int:
+        return self._size
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+class _GuardedFileWriterFactory:
+    """py7zr ``WriterFactory`` writing members below ``target_dir``."""
+
+    def __init__(
+        self,
+        target_dir: Path,
+        members: Dict[str, ArchiveMember],
+        guard: ExtractionGuard,
+    ) -> None:
+        self.target_dir = target_dir
+        self.members = members
+        self.guard = guard
+
+    def create(self, filename: str) -> _GuardedFileWriter:
+        member = self.members.get(filename) or ArchiveMember(name=filename, size=0)
+        return _GuardedFileWriter(self.target_dir / filename, member, self.guard)
+
+
+def _read_7z(z: py7zr.SevenZipFile, targets: Iterable[str]) -> Dict[str, BinaryIO]:
+    """Decompress ``targets`` from an open 7z archive into memory buffers."""
+    targets = list(targets)
+    if hasattr(z, "read"):  # py7zr < 1.0
+        data = z.read(targets)
+        for buf in data.values():
+            buf.seek(0)
+    else:
+        factory = _BufferWriterFactory()
+        z.extract(targets=targets, factory=factory)
+        data = {n: io.BytesIO(w.getvalue()) for n, w in factory.products.items()}
+    z.reset()
+    return data
+
+
+def _open_7z_member(z: py7zr.SevenZipFile, name: str) -> BinaryIO:
+    return _read_7z(z, [name])[name]
+
+
+class _SolidBlockReader:
+    """Decode 7z members one solid block at a time for sequential readers.
+
+    Opening the first member of a block decodes every member of that block in
+    a single pass and keeps the buffers until they are opened or a member from
+    another block is requested. Blocks larger than ``max_bytes`` are decoded
+    per member instead.
+    """
+
+    def __init__(self, z: py7zr.SevenZipFile, max_bytes: int) -> None:
+        self._z = z
+        self._max_bytes = max_bytes
+        self._block_of: Dict[str, int] = {}
+        self._blocks: Dict[int, List[str]] = {}
+        self._block_sizes: Dict[int, int] = {}
+        for f in z.files:
+            if f.folder is None or f.is_directory:
+                continue
+            key = id(f.folder)
+            self._block_of[f.filename] = key
+            self._blocks.setdefault(key, []).append(f.filename)
+            self._block_sizes[key] = self._block_sizes.get(key, 0) + f.uncompressed
+        self._cache: Dict[str, BinaryIO] = {}
+
+    def open(self, name: str) -> BinaryIO:
+        if name in self._cache:
+            return self._cache.pop(name)
+        key = self._block_of.get(name)
+        if key is None:
+            return io.BytesIO(b"")  # empty stream, no block to decode
+        if self._block_sizes[key] > self._max_bytes:
+            return _open_7z_member(self._z, name)
+        self._cache = _read_7z(self._z, self._blocks[key])
+        return self._cache.pop(name)
+
+
+def _zip_mtime(info: zipfile.ZipInfo) -> Optional[float]:
+    # ZIP timestamps are naive local times with two-second resolution.
+    try:
+        return time.mktime(info.date_time + (0, 0, -1))
+    except (OverflowError, ValueError):
+        return None
+
+
+def _zip_member(z: zipfile.ZipFile, info: zipfile.ZipInfo) -> ArchiveMember:
+    return ArchiveMember(
+        name=info.filename,
+        size=info.file_size,
+        compressed_size=info.compress_size,
+        is_dir=info.is_dir(),
+        mtime=_zip_mtime(info),
+        crc=info.CRC,
+        opener=None if info.is_dir() else partial(z.open, info),
+        info=info,
+    )
+
+
+def _tar_member(t: tarfile.TarFile, info: tarfile.TarInfo) -> ArchiveMember:
+    return ArchiveMember(
+        name=info.name,
+        size=info.size,
+        is_dir=info.isdir(),
+        mtime=float(info.mtime),
+        opener=partial(t.extractfile, info) if info.isfile() else None,
+        info=info,
+    )
+
+
+def _7z_member(
+    z: py7zr.SevenZipFile, info: Any, blocks: Optional[_SolidBlockReader] = None
+) -> ArchiveMember:
+    if info.is_directory:
+        opener = None
+    elif blocks is not None:
+        opener = partial(blocks.open, info.filename)
+    else:
+        opener = partial(_open_7z_member, z, info.filename)
+    return ArchiveMember(
+        name=info.filename,
+        size=info.uncompressed,
+        compressed_size=info.compressed,
+        is_dir=info.is_directory,
+        mtime=info.creationtime.timestamp() if info.creationtime else None,
+        crc=info.crc32,
+        opener=opener,
+        info=info,
+    )
+
+
+def _extract_zip_partition(
+    file_path: str, names: List[str], target_dir: str, worker: int
+) -> Dict[str, Any]:
+    """Process-pool worker extracting ``names`` through its own ZipFile handle."""
+    start = time.perf_counter()
+    total = 0
+    compressed = 0
+    with zipfile.ZipFile(file_path) as z:
+        for name in names:
+            info = z.getinfo(name)
+            z.extract(info, path=target_dir)
+            total += info.file_size
+            compressed += info.compress_size
+    seconds = time.perf_counter() - start
+    return {
+        "worker": worker,
+        "files": len(names),
+        "bytes": total,
+        "compressed_bytes": compressed,
+        "seconds": seconds,
+        "throughput_mb_s": (total / (1024 * 1024)) / seconds if seconds else 0.0,
+    }
+
+
+def _zip_weight(member: ArchiveMember) -> int:
+    return member.compressed_size or member.size
 
 
 class ArchiveHandler:
@@ -27,17 +380,45 @@ class ArchiveHandler:
         ".tar": "tar",
         ".tar.gz": "tar",
         ".tgz": "tar",
+        ".tar.xz": "tar",
+        ".txz": "tar",
+        ".tar.zst": "tar",
+        ".tzst": "tar",
+        ".tar.bz2": "tar",
+        ".tbz2": "tar",
         ".7z": "7z",
     }
+    # Compression suffixes that combine with ``.tar``.
+    COMPRESSION_SUFFIXES = {".gz", ".xz", ".zst", ".bz2"}
+
+    # Largest 7z solid block decoded in one pass by ``iter_members``.
+    SOLID_BLOCK_CACHE_BYTES = 64 * 1024 * 1024
+
+    # Listing indexes are shared by all handlers in the process.
+    _index_cache = ArchiveIndexCache()
 
     def __init__(
         self,
         storage_client: StorageClient | None = None,
         config: AppConfig | None = None,
+        extraction_cache: ExtractionCache | None = None,
     ) -> None:
         """Initialize handler with optional storage client and config."""
         self.storage_client = storage_client
         self.config = config or load_config()
+        if extraction_cache is None and self.config.extraction_cache_mb > 0:
+            extraction_cache = ExtractionCache(
+                Path(self.config.temp_storage_path) / "extraction_cache",
+                self.config.extraction_cache_mb * 1024 * 1024,
+            )
+        self.extraction_cache = extraction_cache
+        self._extraction_stats: List[Dict[str, Any]] = []
+        self._decompressor = ParallelDecompressor(
+            threads=self.config.decompression_threads or None
+        )
+        self.executor = get_executor(self.config.async_workers)
+        if storage_client is not None and self.config.temp_blob_ttl_seconds > 0:
+            storage_client.start_temp_reaper(self.config.temp_blob_ttl_seconds)
 
     def _use_storage(self, file_path: Path) -> bool:
         """Return True if external storage should be used for this file."""
@@ -51,32 +432,39 @@ class ArchiveHandler:
         return True
 
     def detect_archive_type(self, file_path: Path) -> Optional[str]:
-        """Return archive type based on extension and magic bytes."""
-        ext = (
-            "".join(file_path.suffixes[-2:])
-            if file_path.suffix == ".gz"
-            else file_path.suffix
-        )
-        if ext in self.SUPPORTED_TYPES:
-            return self.SUPPORTED_TYPES[ext]
-        if magic is not None:
-            try:
-                mime = magic.from_file(str(file_path), mime=True)
-                if "zip" in mime:
-                    return "zip"
-                if "tar" in mime:
-                    return "tar"
-                if "7z" in mime:
-                    return "7z"
-            except Exception:
-                pass
-        return None
+        """Return archive type based on content signature, then extension.
+
+        Office, Power BI, Tableau and Synapse packages are reported as
+        ``zip``; use :func:`sniff_file` for the package kind.
+        """
+        try:
+            kind = sniff_file(file_path)
+        except OSError:
+            kind = None
+        if kind in ARCHIVE_TYPES:
+            return ARCHIVE_TYPES[kind]
+        return self.archive_type_for_name(file_path.name)
+
+    @classmethod
+    def archive_type_for_name(cls, name: str) -> Optional[str]:
+        """Return the archive type implied by ``name``'s extension, if any."""
+        path = Path(name)
+        if path.suffix in cls.COMPRESSION_SUFFIXES:
+            ext = "".join(path.suffixes[-2:])
+        else:
+            ext = path.suffix
+        return cls.SUPPORTED_TYPES.get(ext)
 
     def extract_archive(
         self,
         file_path: Path,
         extract_to: Optional[Path] = None,
         max_members: int = 1000,
+        member_filter: Optional[MemberFilter] = None,
+        workers: Optional[int] = None,
+        budget: Optional[ExtractionBudget] = None,
+        cancel: Optional[threading.Event] = None,
+        prefix: str = "",
     ) -> List[Path]:
         """Extract the archive and return list of extracted file paths.
 
@@ -85,9 +473,35 @@ class ArchiveHandler:
         file_path: Path
             Archive to extract.
         extract_to: Optional[Path]
-            Destination directory. Temporary directory created if not provided.
+            Destination directory. Temporary directory created if not provided,
+            the storage directory itself when the storage backend is local, or
+            a temporary directory of hard links into the extraction cache when
+            enabled and no ``budget`` or ``prefix`` is given; those files are
+            shared with the cache and must not be modified in place.
+            With a remote storage backend and no ``extract_to``, members are
+            streamed to storage (see :meth:`stream_to_storage`) and their
+            names are returned as relative paths.
         max_members: int
             Maximum number of archive entries allowed to prevent zip bombs.
+        member_filter: Optional[MemberFilter]
+            Rules applied to member headers; non-matching members are never
+            decompressed. With the extraction cache, a filter selects from an
+            already cached tree, and otherwise extracts only matching members
+            without populating the cache.
+        workers: Optional[int]
+            Number of processes used to inflate ZIP members in parallel.
+            Defaults to ``AppConfig.extraction_workers``.
+        budget: Optional[ExtractionBudget]
+            Limits on decompressed bytes and compression ratio, enforced from
+            member headers and again while streaming. Defaults to the
+            configured budget. Partial output is removed when exceeded.
+        cancel: Optional[threading.Event]
+            When set from another thread, extraction stops at the next member
+            or chunk, partial output is removed and ``ExtractionCancelled`` is
+            raised.
+        prefix: str
+            Storage name prefix for extracted files, e.g. a job prefix from
+            ``StorageClient.new_job_prefix``. Ignored without storage.
         """
         archive_type = self.detect_archive_type(file_path)
         if archive_type is None:
@@ -101,96 +515,734 @@ class ArchiveHandler:
         ):
             raise ValueError("Archive exceeds configured size limit")
 
-        target_dir = Path(tempfile.mkdtemp()) if extract_to is None else extract_to
+        workers = self.config.extraction_workers if workers is None else workers
+        # Cached trees are extracted under the configured budget, so a
+        # caller's own budget or prefix bypasses the cache.
+        use_cache = (
+            self.extraction_cache is not None
+            and not use_storage
+            and budget is None
+            and not prefix
+        )
+        if extract_to is None and use_cache:
+            # The returned files outlive any lease, so they are linked out of
+            # the cached tree rather than pointing into it.
+            cache = self.extraction_cache
+            with cache.lease(cache.digest(file_path)):
+                cached = self._cached_paths(
+                    file_path, max_members, member_filter, workers, cancel
+                )
+                if cached is not None:
+                    return self._link_out(*cached)
+
+        # Local storage backends are extracted into directly, with no copy.
+        local_root = self.storage_client.local_root() if use_storage else None
+        direct = extract_to is None and local_root is not None
+        if direct:
+            target_dir = local_root / prefix
+        elif extract_to is None:
+            target_dir = Path(tempfile.mkdtemp())
+        else:
+            target_dir = extract_to
+        owned = extract_to is None and not direct
+        if use_storage and extract_to is None and not direct:
+            names = self.stream_to_storage(
+                file_path, max_members, member_filter, budget, prefix, cancel=cancel
+            )
+            return [Path(name) for name in names]
+        self._extraction_stats = []
+        guard = ExtractionGuard(
+            budget or self._budget(), file_path.stat().st_size, cancel
+        )
+
+        try:
+            if archive_type == "zip":
+                extracted = self._extract_zip(
+                    file_path, target_dir, max_members, member_filter, workers, guard
+                )
+            elif archive_type == "tar":
+                extracted = self._extract_tar(
+                    file_path, target_dir, max_members, member_filter, guard
+                )
+            elif archive_type == "7z":
+                extracted = self._extract_7z(
+                    file_path, target_dir, max_members, member_filter, guard
+                )
+            else:
+                raise ValueError("Unsupported archive type")
+        except (ExtractionLimitExceeded, ExtractionCancelled):
+            self._discard_partial(target_dir, guard.admitted, owned)
+            raise
+
+        if use_storage and not direct:
+            self.storage_client.move_files(extracted, prefix, base_dir=target_dir)
+            if owned:
+                shutil.rmtree(target_dir, ignore_errors=True)
+        return extracted
+
+    def stream_to_storage(
+        self,
+        file_path: Path,
+        max_members: int = 1000,
+        member_filter: Optional[MemberFilter] = None,
+        budget: Optional[ExtractionBudget] = None,
+        prefix: str = "",
+        concurrency: Optional[int] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> List[str]:
+        """Upload archive members to storage without writing them to disk.
+
+        Each member's decompressed stream is passed to
+        ``StorageClient.upload_stream`` under ``prefix`` + its archive path.
+        ZIP members are uploaded ``concurrency`` at a time (default
+        ``UPLOAD_CONCURRENCY``); tar and 7z members are read in archive order.
+        The extraction budget applies as in :meth:`extract_archive`; when it
+        is exceeded or the extraction is cancelled, members already uploaded
+        are deleted before the error is raised. Returns the uploaded names.
+        """
+        if self.storage_client is None:
+            raise ValueError("No storage client configured")
+        archive_type = self.detect_archive_type(file_path)
+        if archive_type is None:
+            raise ValueError("Unsupported archive type")
+        concurrency = concurrency or self.config.upload_concurrency
+        guard = ExtractionGuard(
+            budget or self._budget(), file_path.stat().st_size, cancel
+        )
+
+        def upload(member: ArchiveMember) -> None:
+            with io.BufferedReader(guard.wrap(member.open(), member)) as reader:
+                self.storage_client.upload_stream(
+                    prefix + member.name, reader, member.size
+                )
+
+        if archive_type != "zip" or concurrency == 1:
+            members = self.iter_members(file_path, stream=True)
+            return self._upload_members(
+                members, upload, None, 1, max_members, member_filter, guard, prefix
+            )
+        try:
+            zf = zipfile.ZipFile(file_path)
+        except zipfile.BadZipFile as exc:
+            raise ValueError("Corrupted archive") from exc
+        # The pool is shut down before the archive is closed.
+        with zf as z, ThreadPoolExecutor(max_workers=concurrency) as pool:
+            members = (_zip_member(z, info) for info in z.infolist())
+            return self._upload_members(
+                members,
+                upload,
+                pool,
+                concurrency,
+                max_members,
+                member_filter,
+                guard,
+                prefix,
+            )
+
+    def _upload_members(
+        self,
+        members: Iterable[ArchiveMember],
+        upload: Callable[[ArchiveMember], None],
+        pool: Optional[ThreadPoolExecutor],
+        in_flight: int,
+        max_members: int,
+        member_filter: Optional[MemberFilter],
+        guard: ExtractionGuard,
+        prefix: str,
+    ) -> List[str]:
+        uploaded: List[str] = []
+        pending: Deque[Future] = deque()
+        try:
+            for member in self._select(members, member_filter):
+                if member.is_dir:
+                    continue
+                if len(uploaded) >= max_members:
+                    raise ValueError("Archive contains too many files")
+                guard.check_declared(member)
+                if pool is None:
+                    upload(member)
+                else:
+                    pending.append(pool.submit(upload, member))
+                    if len(pending) >= in_flight:
+                        pending.popleft().result()
+                uploaded.append(prefix + member.name)
+            while pending:
+                pending.popleft().result()
+        except (ExtractionLimitExceeded, ExtractionCancelled):
+            # Stop queued uploads and let running ones finish before deleting,
+            # so no blob is written after the cleanup.
+            for future in pending:
+                future.cancel()
+            wait(pending)
+            self.storage_client.delete_blobs(uploaded)
+            raise
+        return uploaded
+
+    async def extract_archive_async(
+        self, file_path: Path, extract_to: Optional[Path] = None, **kwargs: Any
+    ) -> List[Path]:
+        """Asynchronous :meth:`extract_archive` on the shared bounded executor.
+
+        Cancelling the awaiting task stops extraction at the next member or
+        chunk and waits for partial output to be removed before
+        ``CancelledError`` propagates.
+        """
+        return await run_cancellable(
+            self.executor, self.extract_archive, file_path, extract_to, **kwargs
+        )
+
+    def _extract_zip(
+        self,
+        file_path: Path,
+        target_dir: Path,
+        max_members: int,
+        member_filter: Optional[MemberFilter],
+        workers: int,
+        guard: ExtractionGuard,
+    ) -> List[Path]:
+        extracted: List[Path] = []
+        try:
+            zf = _GuardedZipFile(file_path, guard)
+        except zipfile.BadZipFile as exc:
+            raise ValueError("Corrupted archive") from exc
+        with zf as z:
+            infos = z.infolist()
+            if len(infos) > max_members:
+                raise ValueError("Archive contains too many files")
+            members = (_zip_member(z, info) for info in infos)
+            selected = list(self._select(members, member_filter))
+            if workers > 1 and len(selected) > 1:
+                # ZipExtFile never yields more than the declared size, so the
+                # header check bounds worker output.
+                for member in selected:
+                    guard.check_declared(member)
+                self._parallel_extract_zip(file_path, selected, target_dir, workers)
+                extracted.extend(target_dir / m.name for m in selected)
+            else:
+                for member in selected:
+                    guard.check_declared(member)
+                    self._safe_extract(z, member.name, target_dir)
+                    extracted.append(target_dir / member.name)
+        return extracted
+
+    def _extract_tar(
+        self,
+        file_path: Path,
+        target_dir: Path,
+        max_members: int,
+        member_filter: Optional[MemberFilter],
+        guard: ExtractionGuard,
+    ) -> List[Path]:
+        if self._is_sequential_tar(file_path):
+            return self._extract_tar_stream(
+                file_path, target_dir, max_members, member_filter, guard
+            )
+        extracted: List[Path] = []
+        with self._open_tar(file_path) as t:
+            infos = t.getmembers()
+            if len(infos) > max_members:
+                raise ValueError("Archive contains too many files")
+            members = (_tar_member(t, info) for info in infos)
+            for member in self._select(members, member_filter):
+                # tarfile copies exactly the header size, so this is exact.
+                guard.check_declared(member)
+                self._safe_extract_tar(t, member.info, target_dir)
+                if member.info.isfile():
+                    extracted.append(target_dir / member.name)
+        return extracted
+
+    def _extract_tar_stream(
+        self,
+        file_path: Path,
+        target_dir: Path,
+        max_members: int,
+        member_filter: Optional[MemberFilter],
+        guard: ExtractionGuard,
+    ) -> List[Path]:
+        # xz and zstd tars are decoded as a forward-only stream, so members
+        # are extracted while counting; the limit error removes partial output.
         extracted: List[Path] = []
+        with self._open_tar(file_path) as t:
+
+            def members() -> Iterator[ArchiveMember]:
+                for count, info in enumerate(t, 1):
+                    if count > max_members:
+                        raise ExtractionLimitExceeded(
+                            "Archive contains too many files"
+                        )
+                    yield _tar_member(t, info)
+
+            for member in self._select(members(), member_filter):
+                guard.check_declared(member)
+                self._safe_extract_tar(t, member.info, target_dir)
+                if member.info.isfile():
+                    extracted.append(target_dir / member.name)
+        return extracted
+
+    def _extract_7z(
+        self,
+        file_path: Path,
+        target_dir: Path,
+        max_members: int,
+        member_filter: Optional[MemberFilter],
+        guard: ExtractionGuard,
+    ) -> List[Path]:
+        try:
+            zf = py7zr.SevenZipFile(file_path)
+        except py7zr.exceptions.Bad7zFile as exc:
+            raise ValueError("Corrupted archive") from exc
+        with zf as z:
+            infos = z.list()
+            if len(infos) > max_members:
+                raise ValueError("Archive contains too many files")
+            members = (_7z_member(z, info) for info in infos)
+            selected = [
+                m for m in self._select(members, member_filter) if not m.is_dir
+            ]
+            for member in selected:
+                guard.check_declared(member)
+            return self._extract_7z_targets(z, selected, target_dir, guard)
 
+    def list_contents(
+        self, file_path: Path, member_filter: Optional[MemberFilter] = None
+    ) -> List[str]:
+        """Return list of contents without extraction."""
+        archive_type = self.detect_archive_type(file_path)
+        if archive_type == "zip":
+            with zipfile.ZipFile(file_path) as z:
+                if member_filter is None:
+                    return z.namelist()
+                members = (_zip_member(z, info) for info in z.infolist())
+                return [m.name for m in member_filter.select(members)]
+        if archive_type == "tar":
+            members = self.iter_members(file_path)
+            return [m.name for m in self._select(members, member_filter)]
+        if archive_type == "7z":
+            with py7zr.SevenZipFile(file_path) as z:
+                if member_filter is None:
+                    return z.getnames()
+                members = (_7z_member(z, info) for info in z.list())
+                return [m.name for m in member_filter.select(members)]
+        raise ValueError("Unsupported archive type")
+
+    def list_index(
+        self, file_path: Path, member_filter: Optional[MemberFilter] = None
+    ) -> ArchiveIndex:
+        """Return a metadata index of the archive without extracting it.
+
+        The index is read from the ZIP central directory, tar headers or 7z
+        header and cached per archive digest.
+        """
+        key = self._index_key(file_path)
+        index = self._index_cache.get(key)
+        if index is None:
+            index = ArchiveIndex.from_members(self.iter_members(file_path))
+            self._index_cache.put(key, index)
+        if member_filter is None:
+            return index
+        members = (
+            ArchiveMember(**index.member_fields(i)) for i in range(len(index))
+        )
+        return ArchiveIndex.from_members(member_filter.select(members))
+
+    def iter_members(
+        self, file_path: Path, stream: bool = False
+    ) -> Iterator[ArchiveMember]:
+        """Yield archive members without extracting them to disk.
+
+        The archive stays open while the iterator is alive, so readers must be
+        consumed before the iterator is closed. With ``stream=True`` tar
+        archives are read in ``r|*`` mode and each member can only be read
+        before advancing to the next one. 7z members are decompressed into
+        memory when opened because solid blocks have no per-member offsets.
+        """
+        archive_type = self.detect_archive_type(file_path)
+        if archive_type == "tar" and not stream and is_gzip(file_path):
+            yield from self._iter_gzip_tar(file_path)
+            return
+        yield from self.iter_stream_members(file_path, archive_type, stream)
+
+    def iter_stream_members(
+        self,
+        source: Path | BinaryIO,
+        archive_type: Optional[str],
+        stream: bool = False,
+    ) -> Iterator[ArchiveMember]:
+        """Yield members of an archive given as a path or a file object.
+
+        Zip and 7z file objects must be seekable; tar file objects only need
+        to be readable when ``stream=True``. This lets archives nested inside
+        other archives be read straight from their parent member's reader.
+        xz and zstd tar archives are always read as a stream.
+        """
         if archive_type == "zip":
             try:
-                zf = zipfile.ZipFile(file_path)
+                zf = zipfile.ZipFile(source)
             except zipfile.BadZipFile as exc:
                 raise ValueError("Corrupted archive") from exc
             with zf as z:
-                members = z.namelist()
-                if len(members) > max_members:
-                    raise ValueError("Archive contains too many files")
-                for member in members:
-                    self._safe_extract(z, member, target_dir)
-                    extracted.append(target_dir / member)
+                for info in z.infolist():
+                    yield _zip_member(z, info)
         elif archive_type == "tar":
-            try:
-                tf = tarfile.open(file_path)
-            except tarfile.TarError as exc:
-                raise ValueError("Corrupted archive") from exc
-            with tf as t:
-                members = t.getmembers()
-                if len(members) > max_members:
-                    raise ValueError("Archive contains too many files")
-                for member in members:
-                    self._safe_extract_tar(t, member, target_dir)
-                    if member.isfile():
-                        extracted.append(target_dir / member.name)
+            with self._open_tar(source, stream) as t:
+                for info in t:
+                    yield _tar_member(t, info)
         elif archive_type == "7z":
             try:
-                zf = py7zr.SevenZipFile(file_path)
+                zf = py7zr.SevenZipFile(source)
             except py7zr.exceptions.Bad7zFile as exc:
                 raise ValueError("Corrupted archive") from exc
             with zf as z:
-                members = z.getnames()
-                if len(members) > max_members:
-                    raise ValueError("Archive contains too many files")
-                z.extractall(target_dir)
-                extracted.extend([p for p in target_dir.rglob("*") if p.is_file()])
+                blocks = _SolidBlockReader(z, self.SOLID_BLOCK_CACHE_BYTES)
+                for info in z.list():
+                    yield _7z_member(z, info, blocks)
         else:
             raise ValueError("Unsupported archive type")
 
-        if use_storage:
-            self.storage_client.upload_files(extracted)
-            for f in extracted:
-                try:
-                    f.unlink()
-                except Exception:
-                    pass
-        return extracted
+    def open_nested(
+        self, file_path: Path, budget: Optional[NestedBudget] = None
+    ) -> NestedArchive:
+        """Return a view of ``file_path`` with inner archives as directories.
 
-    def list_contents(self, file_path: Path) -> List[str]:
-        """Return list of contents without extraction."""
-        archive_type = self.detect_archive_type(file_path)
-        if archive_type == "zip":
-            with zipfile.ZipFile(file_path) as z:
-                return z.namelist()
-        if archive_type == "tar":
-            with tarfile.open(file_path) as t:
-                return [m.name for m in t.getmembers()]
-        if archive_type == "7z":
-            with py7zr.SevenZipFile(file_path) as z:
-                return z.getnames()
-        raise ValueError("Unsupported archive type")
+        The default budget comes from ``MAX_NESTED_DEPTH``,
+        ``MAX_ARCHIVE_FILES`` and ``MAX_EXTRACTED_MB``.
+        """
+        if self.detect_archive_type(file_path) is None:
+            raise ValueError("Unsupported archive type")
+        if budget is None:
+            cfg = self.config
+            budget = NestedBudget(
+                max_depth=cfg.max_nested_depth,
+                max_members=cfg.max_archive_files or None,
+                max_total_bytes=cfg.max_extracted_mb * 1024 * 1024 or None,
+            )
+        return NestedArchive(self, file_path, budget)
+
+    async def iter_members_async(
+        self, file_path: Path, stream: bool = False
+    ) -> AsyncIterator[ArchiveMember]:
+        """Asynchronous :meth:`iter_members`.
+
+        Each step of the underlying iterator runs on the shared executor.
+        Member readers are blocking; read them with ``run_blocking``.
+        """
+        members = self.iter_members(file_path, stream)
+        step: Optional[asyncio.Future] = None
+        try:
+            while True:
+                step = asyncio.ensure_future(
+                    run_blocking(self.executor, next, members, None)
+                )
+                member = await asyncio.shield(step)
+                if member is None:
+                    return
+                yield member
+        finally:
+            # A step still running after cancellation owns the generator.
+            if step is not None and not step.done():
+                with suppress(Exception):
+                    await step
+            await run_blocking(self.executor, members.close)
 
     @contextmanager
     def temp_extract(self, file_path: Path, max_members: int = 1000):
-        """Context manager that extracts to a temporary directory and cleans up."""
+        """Context manager that extracts to a temporary directory and cleans up.
+
+        When the extraction cache is enabled the cached tree for the archive is
+        yielded instead and protected from eviction until the context exits.
+        """
+        cache = self.extraction_cache
+        if cache is not None and not self._use_storage(file_path):
+            with cache.lease(cache.digest(file_path)):
+                _, paths = self._cached_paths(
+                    file_path, max_members, None, self.config.extraction_workers
+                )
+                yield paths
+            return
+        use_storage = self._use_storage(file_path)
+        # Each call gets its own prefix so concurrent jobs only remove
+        # their own temporary blobs.
+        job_prefix = self.storage_client.new_job_prefix() if use_storage else ""
         with tempfile.TemporaryDirectory() as tmpdir:
-            files = self.extract_archive(
-                file_path, Path(tmpdir), max_members=max_members
-            )
             try:
-                yield files
+                yield self.extract_archive(
+                    file_path, Path(tmpdir), max_members=max_members, prefix=job_prefix
+                )
             finally:
-                if self._use_storage(file_path) and self.storage_client:
-                    self.storage_client.cleanup_temp_blobs()
+                if use_storage:
+                    self.storage_client.cleanup_temp_blobs(job_prefix)
+
+    def read_member(self, file_path: Path, name: str) -> bytes:
+        """Return the content of a single member without extracting others.
+
+        Gzip-compressed tar archives are read through a persisted checkpoint
+        index so only the data between the nearest checkpoint and the member
+        is inflated.
+        """
+        archive_type = self.detect_archive_type(file_path)
+        if archive_type == "tar" and is_gzip(file_path):
+            with self._gzip_tar_index(file_path).open_member(name) as fh:
+                return fh.read()
+        for member in self.iter_members(file_path):
+            if member.name == name and not member.is_dir:
+                return member.read()
+        raise KeyError(name)
+
+    @contextmanager
+    def _open_tar(
+        self, source: Path | BinaryIO, stream: bool = False
+    ) -> Iterator[tarfile.TarFile]:
+        """Open a tar archive, decoding xz and zstd on the threaded backend."""
+        reader: Optional[BinaryIO] = None
+        try:
+            if not isinstance(source, (str, os.PathLike)):
+                fileobj = stream_decoder(source)
+                mode = "r|*" if stream or fileobj is not source else "r"
+                tf = tarfile.open(fileobj=fileobj, mode=mode)
+            elif self._is_sequential_tar(Path(source)):
+                reader = self._decompressor.open(Path(source))
+                tf = tarfile.open(fileobj=reader, mode="r|")
+            else:
+                tf = tarfile.open(source, "r|*" if stream else "r")
+        except (tarfile.TarError, lzma.LZMAError, EOFError) as exc:
+            if reader is not None:
+                reader.close()
+            raise ValueError("Corrupted archive") from exc
+        try:
+            with tf as t:
+                yield t
+        finally:
+            if reader is not None:
+                reader.close()
+
+    @staticmethod
+    def _is_sequential_tar(file_path: Path) -> bool:
+        return detect_codec(file_path) in ParallelDecompressor.CODECS
+
+    def _gzip_tar_index(self, file_path: Path) -> GzipTarIndex:
+        # Indexes are persisted only with the extraction cache, whose size
+        # limit and LRU eviction also cover them.
+        cache = self.extraction_cache
+        return GzipTarIndex.load_or_build(
+            file_path,
+            cache.index_dir if cache is not None else None,
+            self._index_key(file_path),
+            on_persist=cache.evict if cache is not None else None,
+        )
+
+    def _iter_gzip_tar(self, file_path: Path) -> Iterator[ArchiveMember]:
+        try:
+            index = self._gzip_tar_index(file_path)
+        except (tarfile.TarError, zlib.error, EOFError) as exc:
+            raise ValueError("Corrupted archive") from exc
+        for entry in index.entries:
+            yield ArchiveMember(
+                name=entry.name,
+                size=entry.size,
+                is_dir=entry.is_dir,
+                mtime=entry.mtime,
+                opener=partial(index.open_member, entry.name)
+                if entry.is_file
+                else None,
+            )
+
+    def _index_key(self, file_path: Path) -> str:
+        if self.extraction_cache is not None:
+            return self.extraction_cache.digest(file_path)
+        stat = file_path.stat()
+        return f"{file_path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    def _cached_paths(
+        self,
+        file_path: Path,
+        max_members: int,
+        member_filter: Optional[MemberFilter],
+        workers: int,
+        cancel: Optional[threading.Event] = None,
+    ) -> Optional[Tuple[Path, List[Path]]]:
+        """Return the cached tree's files directory and the selected paths.
+
+        A filter is served from a tree that is already cached; ``None`` is
+        returned when there is none, and only the selected members are then
+        extracted, outside the cache. Callers must hold a lease.
+        """
+        if member_filter is None:
+            tree = self._cached_tree(file_path, max_members, workers, cancel)
+            return tree.files_dir, tree.paths
+        tree = self.extraction_cache.get(file_path)
+        if tree is None:
+            return None
+        paths = self._select_cached(file_path, tree, max_members, member_filter)
+        return tree.files_dir, paths
+
+    @staticmethod
+    def _link_out(files_dir: Path, paths: List[Path]) -> List[Path]:
+        target_dir = Path(tempfile.mkdtemp())
+        linked = []
+        for source in paths:
+            dest = target_dir / source.relative_to(files_dir)
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.link(source, dest)
+            except OSError:
+                # Across filesystems, or where hard links are unsupported.
+                shutil.copy2(source, dest)
+            linked.append(dest)
+        return linked
+
+    def _cached_tree(
+        self,
+        file_path: Path,
+        max_members: int,
+        workers: int,
+        cancel: Optional[threading.Event] = None,
+    ) -> CachedTree:
+        tree = self.extraction_cache.get_or_populate(
+            file_path,
+            lambda dest: self.extract_archive(
+                file_path,
+                dest,
+                max_members=max_members,
+                workers=workers,
+                cancel=cancel,
+            ),
+        )
+        if len(tree.members) > max_members:
+            raise ValueError("Archive contains too many files")
+        return tree
+
+    def _select_cached(
+        self,
+        file_path: Path,
+        tree: CachedTree,
+        max_members: int,
+        member_filter: MemberFilter,
+    ) -> List[Path]:
+        if len(tree.members) > max_members:
+            raise ValueError("Archive contains too many files")
+        # Header metadata comes from the archive index, so filters see the
+        # same fields as on an uncached extraction (except the raw ``info``).
+        cached = {name for name, _ in tree.members}
+        index = self.list_index(file_path)
+        members = []
+        for i in range(len(index)):
+            fields = index.member_fields(i)
+            if fields["is_dir"] or fields["name"] in cached:
+                path = tree.files_dir / fields["name"]
+                opener = None if fields["is_dir"] else partial(open, path, "rb")
+                members.append(ArchiveMember(**fields, opener=opener))
+        return [
+            tree.files_dir / m.name
+            for m in member_filter.select(members)
+            if not m.is_dir
+        ]
+
+    def _budget(self) -> ExtractionBudget:
+        cfg = self.config
+        ratio = cfg.max_compression_ratio or None
+        return ExtractionBudget(
+            max_member_bytes=cfg.max_member_mb * 1024 * 1024 or None,
+            max_total_bytes=cfg.max_extracted_mb * 1024 * 1024 or None,
+            max_member_ratio=ratio,
+            max_total_ratio=ratio,
+        )
+
+    @staticmethod
+    def _discard_partial(target_dir: Path, names: List[str], owned: bool) -> None:
+        if owned:
+            shutil.rmtree(target_dir, ignore_errors=True)
+            return
+        for name in names:
+            path = target_dir / name
+            if path.is_file():
+                path.unlink()
+
+    def get_extraction_stats(self) -> List[Dict[str, Any]]:
+        """Return per-worker throughput stats for the last parallel extraction."""
+        return [dict(s) for s in self._extraction_stats]
+
+    def get_decompression_stats(self) -> List[Dict[str, Any]]:
+        """Return codec, backend, thread count and throughput per xz/zstd read."""
+        return self._decompressor.get_stats()
+
+    def _parallel_extract_zip(
+        self,
+        file_path: Path,
+        members: Sequence[ArchiveMember],
+        target_dir: Path,
+        workers: int,
+    ) -> None:
+        for member in members:
+            self._check_traversal(target_dir, member.name, "Zip")
+        # Workers racing on ZipFile.extract's makedirs can fail with
+        # FileExistsError, so create the directory tree up front.
+        for parent in {(target_dir / m.name).parent for m in members}:
+            parent.mkdir(parents=True, exist_ok=True)
+        partitions = partition_by_weight(
+            members, _zip_weight, min(workers, len(members))
+        )
+        with ProcessPoolExecutor(max_workers=len(partitions)) as pool:
+            futures = [
+                pool.submit(
+                    _extract_zip_partition,
+                    str(file_path),
+                    [m.name for m in part],
+                    str(target_dir),
+                    idx,
+                )
+                for idx, part in enumerate(partitions)
+            ]
+            self._extraction_stats = [f.result() for f in futures]
+
+    def _extract_7z_targets(
+        self,
+        z: py7zr.SevenZipFile,
+        members: List[ArchiveMember],
+        target_dir: Path,
+        guard: ExtractionGuard,
+    ) -> List[Path]:
+        """Extract only ``members`` and return the paths written, in order.
+
+        A single targeted call lets py7zr decode each solid block once and skip
+        blocks that contain no requested member, and the result is built from
+        the target list rather than by rescanning ``target_dir``. Output is
+        streamed through the guard where py7zr supports writer factories.
+        """
+        names = [m.name for m in members]
+        for name in names:
+            self._check_traversal(target_dir, name, "7z")
+        if not names:
+            return []
+        if hasattr(z, "read"):  # py7zr < 1.0 has no writer factories
+            z.extract(target_dir, targets=names)
+        else:
+            factory = _GuardedFileWriterFactory(
+                target_dir, {m.name: m for m in members}, guard
+            )
+            z.extract(targets=names, factory=factory)
+        z.reset()
+        return [target_dir / name for name in names]
+
+    @staticmethod
+    def _select(
+        members: Iterable[ArchiveMember], member_filter: Optional[MemberFilter]
+    ) -> Iterable[ArchiveMember]:
+        return members if member_filter is None else member_filter.select(members)
+
+    @staticmethod
+    def _check_traversal(target_dir: Path, name: str, kind: str) -> None:
+        dest = target_dir / name
+        if not str(dest.resolve()).startswith(str(target_dir.resolve())):
+            raise ValueError(f"Attempted Path Traversal in {kind} File")
 
     def _safe_extract(
         self, zipf: zipfile.ZipFile, member: str, target_dir: Path
     ) -> None:
-        dest = target_dir / member
-        if not str(dest.resolve()).startswith(str(target_dir.resolve())):
-            raise ValueError("Attempted Path Traversal in Zip File")
+        self._check_traversal(target_dir, member, "Zip")
         zipf.extract(member, path=target_dir)
 
     def _safe_extract_tar(
         self, tarf: tarfile.TarFile, member: tarfile.TarInfo, target_dir: Path
     ) -> None:
-        dest = target_dir / member.name
-        if not str(dest.resolve()).startswith(str(target_dir.resolve())):
-            raise ValueError("Attempted Path Traversal in Tar File")
+        self._check_traversal(target_dir, member.name, "Tar")
         tarf.extract(member, path=target_dir)
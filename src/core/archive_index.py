@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import math
+import threading
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle at runtime
+    from src.core.archive_handler import ArchiveMember
+
+
+class ArchiveIndex:
+    """Compact, column-oriented listing of archive members.
+
+    Numeric columns are stored in ``array`` buffers rather than per-member
+    objects. Missing values are stored as ``-1`` (or NaN for ``mtime``) and
+    reported as ``None``.
+    """
+
+    def __init__(self) -> None:
+        self.names: List[str] = []
+        self.sizes = array("q")
+        self.compressed_sizes = array("q")
+        self.crcs = array("q")
+        self.mtimes = array("d")
+        self.kinds = bytearray()
+
+    @classmethod
+    def from_members(cls, members: Iterable[ArchiveMember]) -> "ArchiveIndex":
+        """Build an index from archive members without reading their content."""
+        index = cls()
+        for member in members:
+            index.append(member)
+        return index
+
+    def append(self, member: ArchiveMember) -> None:
+        self.names.append(member.name)
+        self.sizes.append(member.size)
+        self.compressed_sizes.append(
+            -1 if member.compressed_size is None else member.compressed_size
+        )
+        self.crcs.append(-1 if member.crc is None else member.crc)
+        self.mtimes.append(math.nan if member.mtime is None else member.mtime)
+        self.kinds.append(ord("d") if member.is_dir else ord("f"))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return (self.record(i) for i in range(len(self)))
+
+    def is_dir(self, i: int) -> bool:
+        return self.kinds[i] == ord("d")
+
+    def member_fields(self, i: int) -> Dict[str, Any]:
+        """Return the raw metadata of member ``i`` as ``ArchiveMember`` fields."""
+        compressed = self.compressed_sizes[i]
+        crc = self.crcs[i]
+        mtime = self.mtimes[i]
+        return {
+            "name": self.names[i],
+            "size": self.sizes[i],
+            "compressed_size": None if compressed < 0 else compressed,
+            "is_dir": self.is_dir(i),
+            "mtime": None if math.isnan(mtime) else mtime,
+            "crc": None if crc < 0 else crc,
+        }
+
+    def record(self, i: int) -> Dict[str, Any]:
+        """Return member ``i`` as a JSON-serializable dictionary."""
+        fields = self.member_fields(i)
+        mtime = fields.pop("mtime")
+        fields["type"] = "dir" if fields.pop("is_dir") else "file"
+        fields["modified"] = (
+            None
+            if mtime is None
+            else datetime.fromtimestamp(mtime, timezone.utc)
+            .replace(tzinfo=None)
+            .isoformat()
+        )
+        return fields
+
+    def files(self) -> List[str]:
+        """Return names of non-directory members in archive order."""
+        return [n for i, n in enumerate(self.names) if not self.is_dir(i)]
+
+    @property
+    def total_size(self) -> int:
+        return sum(self.sizes)
+
+
+class ArchiveIndexCache:
+    """Thread-safe LRU of ``ArchiveIndex`` objects keyed by archive digest."""
+
+    def __init__(self, max_entries: int = 128) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, ArchiveIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest: str) -> Optional[ArchiveIndex]:
+        with self._lock:
+            index = self._entries.get(digest)
+            if index is not None:
+                self._entries.move_to_end(digest)
+            return index
+
+    def put(self, digest: str, index: ArchiveIndex) -> None:
+        with self._lock:
+            self._entries[digest] = index
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,402 @@
+from __future__ import annotations
+
+import bz2
+import gzip
+import io
+import lzma
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Deque, Dict, List, Optional, Tuple
+
+from src.core.file_sniffer import BZIP2_MAGIC, GZIP_MAGIC, XZ_MAGIC, ZSTD_MAGIC
+
+try:
+    import zstandard
+except Exception:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+CODEC_MAGICS = (
+    ("gzip", GZIP_MAGIC),
+    ("xz", XZ_MAGIC),
+    ("zstd", ZSTD_MAGIC),
+    ("bzip2", BZIP2_MAGIC),
+)
+
+_XZ_FOOTER_MAGIC = b"YZ"
+_ZSTD_FRAME_MAGIC = 0xFD2FB528
+_ZSTD_SKIPPABLE_MASK = 0xFFFFFFF0
+_ZSTD_SKIPPABLE_MAGIC = 0x184D2A50
+
+
+def detect_codec(file_path: Path) -> Optional[str]:
+    """Return the compression codec of ``file_path`` from its magic bytes."""
+    with open(file_path, "rb") as fh:
+        head = fh.read(6)
+    for codec, magic in CODEC_MAGICS:
+        if head.startswith(magic):
+            return codec
+    return None
+
+
+def stream_decoder(fileobj: BinaryIO) -> BinaryIO:
+    """Wrap a buffered reader in a zstd decoder if its content is zstd.
+
+    Other codecs are left to ``tarfile``'s own detection. The returned reader
+    does not close ``fileobj``.
+    """
+    peek = getattr(fileobj, "peek", None)
+    if peek is None or not peek(4)[:4] == ZSTD_MAGIC:
+        return fileobj
+    if zstandard is None:
+        raise ValueError("Reading zstd archives requires the zstandard package")
+    return zstandard.ZstdDecompressor().stream_reader(
+        fileobj, read_across_frames=True, closefd=False
+    )
+
+
+@dataclass
+class _Unit:
+    """An independently decodable xz block or zstd frame."""
+
+    offset: int
+    length: int
+    size: Optional[int]
+    # Stream header of the xz stream containing the block and the block's
+    # size without padding, as recorded in the xz index.
+    header: bytes = b""
+    unpadded: int = 0
+
+
+class ParallelDecompressor:
+    """Decode xz and zstd files, using threads when the layout permits.
+
+    Files written as several independent units -- xz blocks (``xz -T``) or
+    concatenated streams, and zstd frames (``pzstd`` or concatenated files)
+    -- are decoded by a pool of threads in order. At most two units per
+    thread, and at most ``MAX_INFLIGHT_BYTES`` of decoded output, are in
+    flight at once (a single unit is always admitted). Single-unit files,
+    units without a recorded size or larger than ``MAX_UNIT_BYTES``, and
+    zstd without the optional ``zstandard`` package fall back to a
+    single-threaded streaming decoder.
+    """
+
+    CODECS = ("xz", "zstd")
+    MAX_UNIT_BYTES = 64 * 1024 * 1024
+    # Decoded bytes pending or buffered per reader, whatever the thread count.
+    MAX_INFLIGHT_BYTES = 2 * MAX_UNIT_BYTES
+
+    def __init__(self, threads: Optional[int] = None) -> None:
+        self.threads = threads or os.cpu_count() or 1
+        self._stats: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def open(self, file_path: Path, codec: Optional[str] = None) -> BinaryIO:
+        """Return a buffered reader over the decompressed content."""
+        codec = codec or detect_codec(file_path)
+        units = self._plan(file_path, codec) if self.threads > 1 else None
+        if units is not None:
+            decode = _decode_xz if codec == "xz" else _decode_zstd
+            raw: BinaryIO = _ParallelReader(
+                file_path, units, decode, self.threads, self.MAX_INFLIGHT_BYTES
+            )
+            backend, threads = "parallel", self.threads
+        else:
+            raw = _serial_reader(file_path, codec)
+            backend, threads, units = "serial", 1, []
+        stats = {
+            "codec": codec,
+            "backend": backend,
+            "threads": threads,
+            "units": len(units),
+            "compressed_bytes": file_path.stat().st_size,
+        }
+        metered = _MeteredReader(raw, stats, self._record)
+        return io.BufferedReader(metered, buffer_size=1024 * 1024)
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Return throughput stats of decompressed files, oldest first."""
+        with self._lock:
+            return [dict(s) for s in self._stats]
+
+    def _record(self, stats: Dict[str, Any]) -> None:
+        with self._lock:
+            self._stats.append(stats)
+            del self._stats[:-100]
+
+    def _plan(self, file_path: Path, codec: Optional[str]) -> Optional[List[_Unit]]:
+        try:
+            with open(file_path, "rb") as fh:
+                size = file_path.stat().st_size
+                if codec == "xz":
+                    units = _xz_units(fh, size)
+                elif codec == "zstd" and zstandard is not None:
+                    units = _zstd_units(fh, size)
+                else:
+                    return None
+        except (OSError, ValueError, struct.error):
+            return None
+        if units is None or len(units) < 2:
+            return None
+        if any(u.size is None or u.size > self.MAX_UNIT_BYTES for u in units):
+            return None
+        return units
+
+
+def _serial_reader(file_path: Path, codec: Optional[str]) -> BinaryIO:
+    if codec == "xz":
+        return lzma.open(file_path)
+    if codec == "gzip":
+        return gzip.open(file_path)
+    if codec == "bzip2":
+        return bz2.open(file_path)
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("Reading zstd archives requires the zstandard package")
+        return zstandard.ZstdDecompressor().stream_reader(
+            open(file_path, "rb"), read_across_frames=True
+        )
+    return open(file_path, "rb")
+
+
+class _MeteredReader(io.RawIOBase):
+    """Count decompressed bytes and report throughput once closed."""
+
+    def __init__(
+        self,
+        reader: BinaryIO,
+        stats: Dict[str, Any],
+        record: Callable[[Dict[str, Any]], None],
+    ) -> None:
+        self._reader = reader
+        self._stats = stats
+        self._record = record
+        self._bytes = 0
+        self._start = time.perf_counter()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b: Any) -> int:
+        data = self._reader.read(len(b))
+        n = len(data)
+        b[:n] = data
+        self._bytes += n
+        return n
+
+    def close(self) -> None:
+        if not self.closed:
+            self._reader.close()
+            seconds = time.perf_counter() - self._start
+            self._stats.update(
+                bytes=self._bytes,
+                seconds=seconds,
+                throughput_mb_s=(self._bytes / (1024 * 1024)) / seconds
+                if seconds
+                else 0.0,
+            )
+            self._record(self._stats)
+        super().close()
+
+
+class _ParallelReader(io.RawIOBase):
+    """Decode units on a thread pool and return their output in order."""
+
+    def __init__(
+        self,
+        file_path: Path,
+        units: List[_Unit],
+        decode: Callable[[bytes, _Unit], bytes],
+        threads: int,
+        max_bytes: int,
+    ) -> None:
+        self._file_path = file_path
+        self._units = iter(units)
+        self._next = next(self._units, None)
+        self._decode = decode
+        self._window = threads * 2
+        self._max_bytes = max_bytes
+        # Decoded size of the pending units plus the unit being read out.
+        self._in_flight = 0
+        self._held = 0
+        self._pool = ThreadPoolExecutor(
+            max_workers=threads, thread_name_prefix="decompress"
+        )
+        self._pending: Deque[Tuple[Future, int]] = deque()
+        self._buffer = memoryview(b"")
+        self._fill()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b: Any) -> int:
+        while not self._buffer:
+            if not self._pending:
+                return 0
+            future, size = self._pending.popleft()
+            self._buffer = memoryview(future.result())
+            self._in_flight -= self._held
+            self._held = size
+            self._fill()
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+    def close(self) -> None:
+        if not self.closed:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pending.clear()
+        super().close()
+
+    def _fill(self) -> None:
+        while self._next is not None and len(self._pending) < self._window:
+            unit = self._next
+            if self._in_flight and self._in_flight + unit.size > self._max_bytes:
+                return
+            self._pending.append(
+                (self._pool.submit(self._read_and_decode, unit), unit.size)
+            )
+            self._in_flight += unit.size
+            self._next = next(self._units, None)
+
+    def _read_and_decode(self, unit: _Unit) -> bytes:
+        with open(self._file_path, "rb") as fh:
+            fh.seek(unit.offset)
+            data = fh.read(unit.length)
+        return self._decode(data, unit)
+
+
+def _pad4(n: int) -> int:
+    return (n + 3) & ~3
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+        if shift > 63:
+            raise ValueError("Invalid xz varint")
+
+
+def _write_varint(value: int) -> bytes:
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _read_at(fh: BinaryIO, offset: int, length: int) -> bytes:
+    fh.seek(offset)
+    data = fh.read(length)
+    if len(data) != length:
+        raise ValueError("Truncated archive")
+    return data
+
+
+def _xz_units(fh: BinaryIO, size: int) -> Optional[List[_Unit]]:
+    """Locate every block of every stream from the xz indexes, back to front."""
+    streams: List[List[_Unit]] = []
+    pos = size
+    while pos > 0:
+        # Stream padding: zero bytes in multiples of four between streams.
+        while pos >= 4 and _read_at(fh, pos - 4, 4) == b"\0\0\0\0":
+            pos -= 4
+        footer = _read_at(fh, pos - 12, 12)
+        if footer[10:] != _XZ_FOOTER_MAGIC:
+            return None
+        index_size = (struct.unpack("<I", footer[4:8])[0] + 1) * 4
+        index_start = pos - 12 - index_size
+        index = _read_at(fh, index_start, index_size)
+        if index[0] != 0:
+            return None
+        count, p = _read_varint(index, 1)
+        records = []
+        for _ in range(count):
+            unpadded, p = _read_varint(index, p)
+            uncompressed, p = _read_varint(index, p)
+            records.append((unpadded, uncompressed))
+        stream_start = index_start - sum(_pad4(u) for u, _ in records) - 12
+        header = _read_at(fh, stream_start, 12)
+        if not header.startswith(XZ_MAGIC) or header[6:8] != footer[8:10]:
+            return None
+        units = []
+        offset = stream_start + 12
+        for unpadded, uncompressed in records:
+            units.append(
+                _Unit(offset, _pad4(unpadded), uncompressed, header, unpadded)
+            )
+            offset += _pad4(unpadded)
+        streams.append(units)
+        pos = stream_start
+    return [unit for units in reversed(streams) for unit in units]
+
+
+def _decode_xz(block: bytes, unit: _Unit) -> bytes:
+    # Wrap the block in a single-block stream so lzma verifies its check.
+    records = b"\0" + _write_varint(1)
+    records += _write_varint(unit.unpadded) + _write_varint(unit.size or 0)
+    records += b"\0" * (_pad4(len(records)) - len(records))
+    index = records + struct.pack("<I", zlib.crc32(records))
+    flags = unit.header[6:8]
+    backward = struct.pack("<I", len(index) // 4 - 1)
+    footer = struct.pack("<I", zlib.crc32(backward + flags)) + backward + flags
+    stream = unit.header + block + index + footer + _XZ_FOOTER_MAGIC
+    return lzma.decompress(stream, format=lzma.FORMAT_XZ)
+
+
+def _zstd_units(fh: BinaryIO, size: int) -> Optional[List[_Unit]]:
+    """Locate zstd frames by walking frame and block headers."""
+    units = []
+    pos = 0
+    while pos < size:
+        magic = struct.unpack("<I", _read_at(fh, pos, 4))[0]
+        if magic & _ZSTD_SKIPPABLE_MASK == _ZSTD_SKIPPABLE_MAGIC:
+            pos += 8 + struct.unpack("<I", _read_at(fh, pos + 4, 4))[0]
+            continue
+        if magic != _ZSTD_FRAME_MAGIC:
+            return None
+        descriptor = _read_at(fh, pos + 4, 1)[0]
+        single_segment = descriptor >> 5 & 1
+        fcs_bytes = (1 if single_segment else 0, 2, 4, 8)[descriptor >> 6]
+        dict_bytes = (0, 1, 2, 4)[descriptor & 3]
+        p = pos + 5 + (0 if single_segment else 1) + dict_bytes
+        content_size = None
+        if fcs_bytes:
+            raw = _read_at(fh, p, fcs_bytes)
+            content_size = int.from_bytes(raw, "little")
+            if fcs_bytes == 2:
+                content_size += 256
+        p += fcs_bytes
+        while True:
+            block = int.from_bytes(_read_at(fh, p, 3), "little")
+            block_type = block >> 1 & 3
+            if block_type == 3:
+                return None
+            p += 3 + (1 if block_type == 1 else block >> 3)
+            if block & 1:
+                break
+        if descriptor >> 2 & 1:
+            p += 4
+        units.append(_Unit(pos, p - pos, content_size))
+        pos = p
+    return units
+
+
+def _decode_zstd(frame: bytes, unit: _Unit) -> bytes:
+    return zstandard.ZstdDecompressor().decompressobj().decompress(frame)
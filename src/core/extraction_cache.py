@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+
+@dataclass
+class CachedTree:
+    """An extracted archive tree stored in the extraction cache."""
+
+    digest: str
+    files_dir: Path
+    members: List[Tuple[str, int]]
+
+    @property
+    def paths(self) -> List[Path]:
+        """Return absolute paths of the cached files in archive order."""
+        return [self.files_dir / name for name, _ in self.members]
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(size for _, size in self.members)
+
+
+class ExtractionCache:
+    """Content-addressed on-disk cache of extracted archive trees.
+
+    Entries live under ``root/<digest>/`` with the extracted files in
+    ``files/`` and a ``manifest.json`` describing them. Entries are populated
+    in a scratch directory and renamed into place so readers never observe a
+    partial tree, and evicted least-recently-used first once the total size
+    exceeds ``max_bytes``. Cached trees are shared and must be treated as
+    read-only. Scratch directories and leases abandoned by a crashed worker
+    are removed when the cache is opened.
+    """
+
+    MANIFEST = "manifest.json"
+    # Per-archive read indexes (e.g. ``GzipTarIndex`` files), evicted with
+    # the extracted trees; files sharing a stem form one entry.
+    INDEX_DIR = ".indexes"
+    HASH_CHUNK_SIZE = 1024 * 1024
+    # Leases older than this are considered abandoned by a crashed reader.
+    LEASE_TTL_SECONDS = 3600
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._keys_dir = self.root / ".keys"
+        self._leases_dir = self.root / ".leases"
+        self.index_dir = self.root / self.INDEX_DIR
+        self._keys_dir.mkdir(exist_ok=True)
+        self._leases_dir.mkdir(exist_ok=True)
+        self.index_dir.mkdir(exist_ok=True)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "full_hashes": 0,
+        }
+        self._sweep()
+
+    def digest(self, file_path: Path) -> str:
+        """Return the content digest of ``file_path``.
+
+        The (path, size, mtime) fast key is looked up first so unchanged files
+        are only hashed once; otherwise the file is hashed in full and the
+        result recorded under the fast key.
+        """
+        stat = file_path.stat()
+        fast_key = f"{file_path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+        key_file = self._keys_dir / hashlib.sha1(fast_key.encode()).hexdigest()
+        try:
+            return key_file.read_text().strip()
+        except OSError:
+            pass
+        hasher = hashlib.blake2b(digest_size=20)
+        with open(file_path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(self.HASH_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+        digest = f"{hasher.hexdigest()}-{stat.st_size}"
+        self._atomic_write(key_file, digest)
+        with self._lock:
+            self._stats["full_hashes"] += 1
+        return digest
+
+    def lookup(self, digest: str) -> Optional[CachedTree]:
+        """Return the cached tree for ``digest`` and mark it recently used."""
+        entry = self.root / digest
+        try:
+            manifest = json.loads((entry / self.MANIFEST).read_text())
+            os.utime(entry / self.MANIFEST)
+        except (OSError, ValueError):
+            return None
+        return CachedTree(
+            digest=digest,
+            files_dir=entry / "files",
+            members=[(m["name"], m["size"]) for m in manifest["members"]],
+        )
+
+    def get(self, file_path: Path) -> Optional[CachedTree]:
+        """Return the cached tree for ``file_path`` if present, without populating."""
+        tree = self.lookup(self.digest(file_path))
+        if tree is not None:
+            self._count("hits")
+        return tree
+
+    def get_or_populate(
+        self, file_path: Path, extract: Callable[[Path], List[Path]]
+    ) -> CachedTree:
+        """Return the cached tree for ``file_path``, extracting it on a miss.
+
+        ``extract`` receives an empty directory and must return the list of
+        paths it wrote there; directories in that list are not recorded.
+        """
+        digest = self.digest(file_path)
+        tree = self.lookup(digest)
+        if tree is not None:
+            self._count("hits")
+            return tree
+        self._count("misses")
+        return self._populate(digest, extract)
+
+    @contextmanager
+    def lease(self, digest: str) -> Iterator[None]:
+        """Protect the entry for ``digest`` from eviction while in use."""
+        lease_file = self._leases_dir / f"{digest}.{uuid.uuid4().hex}"
+        lease_file.touch()
+        try:
+            yield
+        finally:
+            try:
+                lease_file.unlink()
+            except OSError:
+                pass
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """Evict least-recently-used entries until under ``max_bytes``.
+
+        Read indexes in ``index_dir`` count toward the total and are evicted
+        in the same order as extracted trees. Entries with a live lease and
+        the ``keep`` digest are never evicted, and the fast-key records of
+        evicted digests are dropped. Returns the number of entries removed.
+        """
+        entries = []
+        total = 0
+        for entry in self.root.iterdir():
+            if entry.name.startswith("."):
+                continue
+            manifest = entry / self.MANIFEST
+            try:
+                data = json.loads(manifest.read_text())
+                atime = manifest.stat().st_mtime
+            except (OSError, ValueError):
+                continue
+            entries.append((atime, entry, data["bytes"]))
+            total += data["bytes"]
+        indexes: Dict[str, List[Path]] = {}
+        for path in self.index_dir.iterdir():
+            indexes.setdefault(path.name.split(".", 1)[0], []).append(path)
+        for paths in indexes.values():
+            try:
+                stats = [p.stat() for p in paths]
+            except OSError:
+                continue
+            size = sum(st.st_size for st in stats)
+            entries.append((max(st.st_mtime for st in stats), paths, size))
+            total += size
+
+        evicted = set()
+        for _, entry, size in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            if isinstance(entry, list):
+                for path in entry:
+                    path.unlink(missing_ok=True)
+                evicted.add(entry[0].name.split(".", 1)[0])
+            elif entry.name == keep or self._is_leased(entry.name):
+                continue
+            else:
+                self._discard(entry)
+                evicted.add(entry.name)
+            total -= size
+        if evicted:
+            self._forget_keys(evicted)
+            self._count("evictions", len(evicted))
+        return len(evicted)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return cache hit/miss/eviction counters."""
+        with self._lock:
+            return dict(self._stats)
+
+    def _populate(
+        self, digest: str, extract: Callable[[Path], List[Path]]
+    ) -> CachedTree:
+        scratch = self.root / f".tmp-{uuid.uuid4().hex}"
+        files_dir = scratch / "files"
+        files_dir.mkdir(parents=True)
+        try:
+            written = [p for p in extract(files_dir) if p.is_file()]
+            members = [
+                (p.relative_to(files_dir).as_posix(), p.stat().st_size)
+                for p in written
+            ]
+            manifest = {
+                "members": [{"name": n, "size": s} for n, s in members],
+                "bytes": sum(s for _, s in members),
+                "created": time.time(),
+            }
+            (scratch / self.MANIFEST).write_text(json.dumps(manifest))
+            entry = self.root / digest
+            try:
+                os.rename(scratch, entry)
+            except OSError:
+                # Another worker populated the same digest first; use theirs.
+                tree = self.lookup(digest)
+                if tree is None:
+                    raise
+                return tree
+        finally:
+            if scratch.exists():
+                shutil.rmtree(scratch, ignore_errors=True)
+        self.evict(keep=digest)
+        return CachedTree(digest=digest, files_dir=entry / "files", members=members)
+
+    def _is_leased(self, digest: str) -> bool:
+        cutoff = time.time() - self.LEASE_TTL_SECONDS
+        for lease_file in self._leases_dir.glob(f"{digest}.*"):
+            try:
+                if lease_file.stat().st_mtime >= cutoff:
+                    return True
+            except OSError:
+                continue
+        return False
+
+    def _forget_keys(self, digests: Set[str]) -> None:
+        # A digest is still needed while its tree or a read index remains.
+        stale = {
+            d
+            for d in digests
+            if not (self.root / d).exists() and not any(self.index_dir.glob(f"{d}.*"))
+        }
+        if not stale:
+            return
+        for key_file in self._keys_dir.iterdir():
+            try:
+                if key_file.read_text().strip() in stale:
+                    key_file.unlink()
+            except OSError:
+                continue
+
+    def _sweep(self) -> None:
+        # Trash and scratch directories left by a crashed worker, and
+        # abandoned leases. Recent scratch directories may belong to a
+        # populate still running in another process.
+        cutoff = time.time() - self.LEASE_TTL_SECONDS
+        for path in self.root.iterdir():
+            if path.name.startswith(".trash-") or (
+                path.name.startswith(".tmp-") and _older(path, cutoff)
+            ):
+                shutil.rmtree(path, ignore_errors=True)
+        for lease_file in self._leases_dir.iterdir():
+            if _older(lease_file, cutoff):
+                lease_file.unlink(missing_ok=True)
+
+    def _discard(self, entry: Path) -> None:
+        # Rename first so concurrent lookups see the entry vanish atomically.
+        trash = self.root / f".trash-{uuid.uuid4().hex}"
+        try:
+            os.rename(entry, trash)
+        except OSError:
+            return
+        shutil.rmtree(trash, ignore_errors=True)
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += amount
+
+    @staticmethod
+    def _atomic_write(path: Path, text: str) -> None:
+        tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp.write_text(text)
+        os.replace(tmp, path)
+
+
+def _older(path: Path, cutoff: float) -> bool:
+    try:
+        return path.stat().st_mtime < cutoff
+    except OSError:
+        return False
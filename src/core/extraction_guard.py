@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import io
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, List, Optional
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle at runtime
+    from src.core.archive_handler import ArchiveMember
+
+
+class ExtractionLimitExceeded(ValueError):
+    """Raised when decompressed output exceeds the configured budget."""
+
+
+class ExtractionCancelled(Exception):
+    """Raised when an extraction is cancelled by its caller."""
+
+
+@dataclass
+class ExtractionBudget:
+    """Limits on decompressed output; ``None`` disables a limit.
+
+    Ratios compare decompressed bytes to compressed bytes (the member's
+    compressed size, or the archive file size for the whole archive) and are
+    only enforced once at least ``ratio_floor_bytes`` have been produced so
+    small, highly compressible files are not rejected.
+    """
+
+    max_member_bytes: Optional[int] = None
+    max_total_bytes: Optional[int] = None
+    max_member_ratio: Optional[float] = None
+    max_total_ratio: Optional[float] = None
+    ratio_floor_bytes: int = 1024 * 1024
+
+
+class ExtractionGuard:
+    """Track decompressed bytes for one extraction against a budget.
+
+    When ``cancel`` is given, setting it aborts the extraction at the next
+    member or chunk with ``ExtractionCancelled``.
+    """
+
+    def __init__(
+        self,
+        budget: ExtractionBudget,
+        archive_size: int,
+        cancel: Optional[threading.Event] = None,
+    ) -> None:
+        self.budget = budget
+        self.archive_size = archive_size
+        self.cancel = cancel
+        self.total_bytes = 0
+        self._declared_total = 0
+        self._member_bytes: Dict[str, int] = {}
+        # Members may be streamed from several threads at once.
+        self._lock = threading.Lock()
+        # Members admitted for extraction, used to clean up partial output.
+        self.admitted: List[str] = []
+
+    def check_declared(self, member: ArchiveMember) -> None:
+        """Reject a member from its header sizes before decompressing it."""
+        self._check_cancelled()
+        with self._lock:
+            self.admitted.append(member.name)
+            self._declared_total += member.size
+            declared_total = self._declared_total
+        self._check_member(member, member.size)
+        self._check_total(declared_total)
+
+    def account(self, member: ArchiveMember, nbytes: int) -> None:
+        """Record ``nbytes`` of actual output for ``member``."""
+        self._check_cancelled()
+        with self._lock:
+            produced = self._member_bytes.get(member.name, 0) + nbytes
+            self._member_bytes[member.name] = produced
+            self.total_bytes += nbytes
+            total = self.total_bytes
+        self._check_member(member, produced)
+        self._check_total(total)
+
+    def wrap(self, reader: BinaryIO, member: ArchiveMember) -> BinaryIO:
+        """Return ``reader`` with every read accounted against the budget."""
+        return _GuardedReader(reader, self, member)
+
+    def _check_cancelled(self) -> None:
+        if self.cancel is not None and self.cancel.is_set():
+            raise ExtractionCancelled("Extraction cancelled")
+
+    def _check_member(self, member: ArchiveMember, produced: int) -> None:
+        budget = self.budget
+        limit = budget.max_member_bytes
+        if limit is not None and produced > limit:
+            raise ExtractionLimitExceeded(
+                f"Member {member.name} exceeds {budget.max_member_bytes} bytes"
+            )
+        if (
+            budget.max_member_ratio is not None
+            and member.compressed_size
+            and produced >= budget.ratio_floor_bytes
+            and produced / member.compressed_size > budget.max_member_ratio
+        ):
+            raise ExtractionLimitExceeded(
+                f"Member {member.name} exceeds compression ratio "
+                f"{budget.max_member_ratio}"
+            )
+
+    def _check_total(self, produced: int) -> None:
+        budget = self.budget
+        limit = budget.max_total_bytes
+        if limit is not None and produced > limit:
+            raise ExtractionLimitExceeded(
+                f"Archive output exceeds {budget.max_total_bytes} bytes"
+            )
+        if (
+            budget.max_total_ratio is not None
+            and self.archive_size
+            and produced >= budget.ratio_floor_bytes
+            and produced / self.archive_size > budget.max_total_ratio
+        ):
+            raise ExtractionLimitExceeded(
+                f"Archive exceeds compression ratio {budget.max_total_ratio}"
+            )
+
+
+class _GuardedReader(io.RawIOBase):
+    def __init__(
+        self, reader: BinaryIO, guard: ExtractionGuard, member: ArchiveMember
+    ) -> None:
+        self._reader = reader
+        self._guard = guard
+        self._member = member
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._reader.read(size)
+        self._guard.account(self._member, len(data))
+        return data
+
+    def readinto(self, b: Any) -> int:
+        data = self.read(len(b))
+        b[: len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._reader.close()
+        super().close()
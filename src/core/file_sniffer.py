@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import io
+import lzma
+import struct
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, List, Optional
+
+try:
+    import zstandard
+except Exception:  # pragma: no cover - optional dependency
+    zstandard = None
+
+HEAD_BYTES = 4096
+# Central directories larger than this are only partially inspected.
+MAX_CENTRAL_DIRECTORY_BYTES = 1024 * 1024
+
+ZIP_MAGICS = (b"PK\x03\x04", b"PK\x05\x06", b"PK\x07\x08")
+SEVEN_ZIP_MAGIC = b"7z\xbc\xaf\x27\x1c"
+GZIP_MAGIC = b"\x1f\x8b"
+XZ_MAGIC = b"\xfd7zXZ\x00"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+BZIP2_MAGIC = b"BZh"
+
+# Kinds that are zip containers, and the archive type each sniffed kind
+# maps to for ``ArchiveHandler``.
+ZIP_KINDS = {"zip", "docx", "xlsx", "pptx", "pbix", "twbx", "synapse"}
+ARCHIVE_TYPES = {**{kind: "zip" for kind in ZIP_KINDS}, "tar": "tar", "7z": "7z"}
+
+# Top-level folders of a Synapse workspace export.
+SYNAPSE_FOLDERS = {
+    "pipeline",
+    "notebook",
+    "sqlscript",
+    "linkedService",
+    "dataset",
+    "dataflow",
+    "trigger",
+    "integrationRuntime",
+}
+SYNAPSE_FILES = {"etl_pipeline.json", "connection_strings.json"}
+
+_EOCD = struct.Struct("<4s4H2LH")
+_CENTRAL_HEADER = struct.Struct("<4s6H3L5H2L")
+
+
+def sniff_file(file_path: Path) -> Optional[str]:
+    """Classify ``file_path`` from its leading bytes.
+
+    Returns one of ``zip``, ``tar``, ``7z``, ``gzip``, ``xz``, ``zstd``,
+    ``bzip2`` or, for zip containers recognised from their central directory,
+    ``docx``, ``xlsx``, ``pptx``, ``pbix``, ``twbx`` or ``synapse``. Compressed
+    streams that contain a tar archive are reported as ``tar``. Returns
+    ``None`` for unrecognised content. Results are memoized per path, size
+    and modification time.
+    """
+    stat = file_path.stat()
+    return _sniff(str(file_path.resolve()), stat.st_size, stat.st_mtime_ns)
+
+
+def clear_cache() -> None:
+    """Forget memoized classifications."""
+    _sniff.cache_clear()
+
+
+@lru_cache(maxsize=4096)
+def _sniff(path: str, size: int, mtime_ns: int) -> Optional[str]:
+    with open(path, "rb") as fh:
+        head = fh.read(HEAD_BYTES)
+        if head.startswith(ZIP_MAGICS):
+            return classify_zip_names(_central_directory_names(fh, size))
+        return sniff_bytes(head)
+
+
+def sniff_bytes(head: bytes) -> Optional[str]:
+    """Classify a file from its first bytes without peeking into zip files."""
+    if head.startswith(ZIP_MAGICS):
+        return "zip"
+    if head.startswith(SEVEN_ZIP_MAGIC):
+        return "7z"
+    if _is_tar_header(head):
+        return "tar"
+    if head.startswith(GZIP_MAGIC):
+        return "tar" if _is_tar_header(_inflate_head(head)) else "gzip"
+    if head.startswith(XZ_MAGIC):
+        return "tar" if _is_tar_header(_unxz_head(head)) else "xz"
+    if head.startswith(ZSTD_MAGIC):
+        return "tar" if _is_tar_header(_unzstd_head(head)) else "zstd"
+    if head.startswith(BZIP2_MAGIC) and head[3:4].isdigit():
+        return "bzip2"
+    return None
+
+
+def classify_zip_names(names: List[str]) -> str:
+    """Return the package kind implied by a zip's member names."""
+    name_set = set(names)
+    tops = {n.split("/", 1)[0] for n in names if "/" in n}
+    if "DataModel" in tops or "Report" in tops or "DataModel" in name_set:
+        return "pbix"
+    if "[Content_Types].xml" in name_set:
+        for prefix, kind in (("word", "docx"), ("xl", "xlsx"), ("ppt", "pptx")):
+            if prefix in tops:
+                return kind
+    if "workbook.xml" in name_set or any(
+        n.endswith(".twb") and "/" not in n for n in names
+    ):
+        return "twbx"
+    if tops & SYNAPSE_FOLDERS or any(
+        n.rsplit("/", 1)[-1] in SYNAPSE_FILES for n in names
+    ):
+        return "synapse"
+    return "zip"
+
+
+def _central_directory_names(fh: BinaryIO, size: int) -> List[str]:
+    tail_size = min(size, _EOCD.size + 0xFFFF)
+    fh.seek(size - tail_size)
+    tail = fh.read(tail_size)
+    pos = tail.rfind(b"PK\x05\x06")
+    if pos < 0 or pos + _EOCD.size > len(tail):
+        return []
+    fields = _EOCD.unpack_from(tail, pos)
+    cd_size, cd_offset = fields[5], fields[6]
+    if cd_offset == 0xFFFFFFFF:
+        # Zip64 archive: the central directory location is in another record.
+        return []
+    fh.seek(cd_offset)
+    data = fh.read(min(cd_size, MAX_CENTRAL_DIRECTORY_BYTES))
+
+    names = []
+    offset = 0
+    while offset + _CENTRAL_HEADER.size <= len(data):
+        header = _CENTRAL_HEADER.unpack_from(data, offset)
+        if header[0] != b"PK\x01\x02":
+            break
+        flags, name_len, extra_len, comment_len = (
+            header[3],
+            header[10],
+            header[11],
+            header[12],
+        )
+        start = offset + _CENTRAL_HEADER.size
+        raw = data[start : start + name_len]
+        if len(raw) < name_len:
+            break
+        names.append(raw.decode("utf-8" if flags & 0x800 else "cp437"))
+        offset = start + name_len + extra_len + comment_len
+    return names
+
+
+def _is_tar_header(block: bytes) -> bool:
+    if len(block) < 512:
+        return False
+    if block[257:262] == b"ustar":
+        return True
+    # Pre-POSIX tar has no magic; validate the header checksum instead.
+    try:
+        stored = int(block[148:156].strip(b"\0 ") or b"-1", 8)
+    except ValueError:
+        return False
+    computed = sum(block[:148]) + sum(block[156:512]) + 8 * ord(" ")
+    return stored == computed
+
+
+def _inflate_head(head: bytes) -> bytes:
+    try:
+        return zlib.decompressobj(31).decompress(head, 512)
+    except zlib.error:
+        return b""
+
+
+def _unxz_head(head: bytes) -> bytes:
+    try:
+        return lzma.LZMADecompressor().decompress(head, max_length=512)
+    except lzma.LZMAError:
+        return b""
+
+
+def _unzstd_head(head: bytes) -> bytes:
+    if zstandard is None:
+        return b""
+    try:
+        reader = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(head))
+        return reader.read(512)
+    except zstandard.ZstdError:
+        return b""
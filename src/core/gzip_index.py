@@ -0,0 +1,389 @@
+from __future__ import annotations
+
+import bisect
+import hashlib
+import io
+import json
+import os
+import tarfile
+import threading
+import uuid
+import zlib
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, List, Optional
+
+try:
+    import indexed_gzip
+except Exception:  # pragma: no cover - optional dependency
+    indexed_gzip = None
+
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def is_gzip(file_path: Path) -> bool:
+    """Return True if ``file_path`` starts with the gzip magic bytes."""
+    with open(file_path, "rb") as fh:
+        return fh.read(2) == GZIP_MAGIC
+
+
+@dataclass
+class TarEntry:
+    """Location of a tar member inside the uncompressed tar stream."""
+
+    name: str
+    size: int
+    offset: int
+    mtime: float
+    is_dir: bool
+    is_file: bool
+
+
+@dataclass
+class _Checkpoint:
+    compressed_offset: int
+    uncompressed_offset: int
+    state: Any  # zlib decompressobj snapshot
+
+
+class _Inflater:
+    """Incremental gzip inflater over a seekable file that can be snapshotted."""
+
+    READ_SIZE = 64 * 1024
+    OUTPUT_LIMIT = 256 * 1024
+
+    def __init__(
+        self, fh: BinaryIO, checkpoint: Optional[_Checkpoint] = None
+    ) -> None:
+        self.fh = fh
+        if checkpoint is None:
+            self.compressed_offset = 0
+            self.uncompressed_offset = 0
+            self._d = zlib.decompressobj(31)
+        else:
+            self.compressed_offset = checkpoint.compressed_offset
+            self.uncompressed_offset = checkpoint.uncompressed_offset
+            self._d = checkpoint.state.copy()
+        self.fh.seek(self.compressed_offset)
+        self._pending = b""
+        self._done = False
+
+    def snapshot(self) -> Optional[_Checkpoint]:
+        """Return a checkpoint if all read input has been consumed."""
+        if self._pending or self._d.eof:
+            return None
+        return _Checkpoint(
+            self.compressed_offset, self.uncompressed_offset, self._d.copy()
+        )
+
+    def next_chunk(self) -> bytes:
+        """Return the next block of uncompressed data, or ``b""`` at the end."""
+        while not self._done:
+            if not self._pending:
+                chunk = self.fh.read(self.READ_SIZE)
+                if not chunk:
+                    self._done = True
+                    break
+                self.compressed_offset += len(chunk)
+                self._pending = chunk
+                if self._d.eof and not self._start_member():
+                    break
+            out = self._d.decompress(self._pending, self.OUTPUT_LIMIT)
+            self._pending = self._d.unconsumed_tail
+            if self._d.eof and self._d.unused_data:
+                self._pending = self._d.unused_data
+                self._start_member()
+            if out:
+                self.uncompressed_offset += len(out)
+                return out
+        return b""
+
+    def _start_member(self) -> bool:
+        # Concatenated gzip members continue the stream; anything else
+        # (typically zero padding) ends it.
+        if not self._pending.startswith(GZIP_MAGIC):
+            self._pending = b""
+            self._done = True
+            return False
+        self._d = zlib.decompressobj(31)
+        return True
+
+
+class _InflateStream(io.RawIOBase):
+    """Readable stream over an ``_Inflater``, optionally recording checkpoints."""
+
+    def __init__(
+        self,
+        inflater: _Inflater,
+        checkpoints: Optional[List[_Checkpoint]] = None,
+        spacing: int = 0,
+    ) -> None:
+        self._inflater = inflater
+        self._buffer = b""
+        self._checkpoints = checkpoints
+        self._spacing = spacing
+        self._next_checkpoint = inflater.uncompressed_offset + spacing
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b: Any) -> int:
+        if not self._buffer:
+            self._maybe_checkpoint()
+            self._buffer = self._inflater.next_chunk()
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+    def skip(self, count: int) -> None:
+        while count > 0:
+            data = self.read(min(count, 1024 * 1024))
+            if not data:
+                break
+            count -= len(data)
+
+    def _maybe_checkpoint(self) -> None:
+        if self._checkpoints is None:
+            return
+        if self._inflater.uncompressed_offset < self._next_checkpoint:
+            return
+        checkpoint = self._inflater.snapshot()
+        if checkpoint is not None:
+            self._checkpoints.append(checkpoint)
+            self._next_checkpoint = checkpoint.uncompressed_offset + self._spacing
+
+
+class _RangeReader(io.RawIOBase):
+    """Read at most ``size`` bytes from ``source`` and close it afterwards."""
+
+    def __init__(self, source: BinaryIO, size: int, owned: BinaryIO) -> None:
+        self._source = source
+        self._remaining = size
+        self._owned = owned
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b: Any) -> int:
+        if self._remaining <= 0:
+            return 0
+        data = self._source.read(min(len(b), self._remaining))
+        n = len(data)
+        b[:n] = data
+        self._remaining -= n
+        return n
+
+    def close(self) -> None:
+        if not self.closed:
+            self._owned.close()
+        super().close()
+
+
+class GzipTarIndex:
+    """Random-access index for tar archives compressed with gzip.
+
+    The first read makes one sequential pass over the archive that records
+    every tar member's offset in the uncompressed stream together with
+    inflate checkpoints every ``spacing`` bytes. Reading a member then resumes
+    inflation from the nearest checkpoint instead of the start of the file.
+
+    Member offsets are persisted as JSON in ``index_dir``. When the optional
+    ``indexed_gzip`` package is installed its seek-point index, including the
+    inflate windows, is persisted next to it. Otherwise checkpoints are zlib
+    ``decompressobj`` snapshots, which cannot be serialized, so they are kept
+    in memory for the life of the process: the first member read in each new
+    process makes a full inflate pass to rebuild them, and only the listing
+    is served from disk.
+    """
+
+    DEFAULT_SPACING = 8 * 1024 * 1024
+    # Loaded indexes (with in-memory checkpoints) kept per process.
+    MAX_LOADED = 8
+
+    _loaded: "OrderedDict[str, GzipTarIndex]" = OrderedDict()
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        file_path: Path,
+        entries: List[TarEntry],
+        seek_index: Optional[Path] = None,
+        checkpoints: Optional[List[_Checkpoint]] = None,
+        spacing: int = DEFAULT_SPACING,
+    ) -> None:
+        self.file_path = file_path
+        self.entries = entries
+        self.seek_index = seek_index
+        self.spacing = spacing
+        self._checkpoints = checkpoints
+        self._by_name = {e.name: e for e in entries}
+
+    @classmethod
+    def load_or_build(
+        cls,
+        file_path: Path,
+        index_dir: Optional[Path],
+        key: str,
+        spacing: int = DEFAULT_SPACING,
+        on_persist: Optional[Callable[[], None]] = None,
+    ) -> "GzipTarIndex":
+        """Return the index for ``file_path``, building it on first use.
+
+        ``key`` identifies the archive content, e.g. an archive digest. With
+        ``index_dir`` set to ``None`` the index is kept in memory only.
+        Loading a persisted index refreshes its mtime for LRU eviction, and
+        ``on_persist`` is called after a new index is written, e.g. to evict
+        old ones.
+        """
+        name = hashlib.sha1(key.encode()).hexdigest()
+        with cls._lock:
+            index = cls._loaded.get(name)
+            if index is not None:
+                cls._loaded.move_to_end(name)
+                if index.file_path == file_path:
+                    return index
+                # Same content at another path: share offsets and checkpoints.
+                return cls(
+                    file_path,
+                    index.entries,
+                    seek_index=index.seek_index,
+                    checkpoints=index._checkpoints,
+                    spacing=index.spacing,
+                )
+
+        if index_dir is None:
+            index = cls.build(file_path, spacing)
+        else:
+            index = cls._load(file_path, index_dir, name, spacing)
+            if index is None:
+                index = cls._persist(file_path, index_dir, name, spacing)
+                if on_persist is not None:
+                    on_persist()
+
+        with cls._lock:
+            cls._loaded[name] = index
+            while len(cls._loaded) > cls.MAX_LOADED:
+                cls._loaded.popitem(last=False)
+        return index
+
+    @classmethod
+    def _load(
+        cls, file_path: Path, index_dir: Path, name: str, spacing: int
+    ) -> Optional["GzipTarIndex"]:
+        entries_file = index_dir / f"{name}.json"
+        seek_file = index_dir / f"{name}.gzidx"
+        try:
+            data = json.loads(entries_file.read_text())
+            entries = [TarEntry(**e) for e in data["entries"]]
+            os.utime(entries_file)
+            has_seek = seek_file.exists()
+            if has_seek:
+                os.utime(seek_file)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return cls(
+            file_path,
+            entries,
+            seek_index=seek_file if has_seek else None,
+            spacing=data.get("spacing", spacing),
+        )
+
+    @classmethod
+    def _persist(
+        cls, file_path: Path, index_dir: Path, name: str, spacing: int
+    ) -> "GzipTarIndex":
+        index = cls.build(file_path, spacing, index_dir / f"{name}.gzidx")
+        index_dir.mkdir(parents=True, exist_ok=True)
+        _atomic_write(
+            index_dir / f"{name}.json",
+            json.dumps(
+                {"spacing": spacing, "entries": [asdict(e) for e in index.entries]}
+            ),
+        )
+        return index
+
+    @classmethod
+    def build(
+        cls, file_path: Path, spacing: int, seek_file: Optional[Path] = None
+    ) -> "GzipTarIndex":
+        """Scan ``file_path`` once, recording member offsets and checkpoints."""
+        if indexed_gzip is not None and seek_file is not None:
+            with indexed_gzip.IndexedGzipFile(str(file_path), spacing=spacing) as igz:
+                entries = _scan_tar(igz, "r:")
+                igz.build_full_index()
+                seek_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp = seek_file.with_name(f"{seek_file.name}.{uuid.uuid4().hex}.tmp")
+                igz.export_index(str(tmp))
+                os.replace(tmp, seek_file)
+            return cls(file_path, entries, seek_index=seek_file, spacing=spacing)
+
+        checkpoints: List[_Checkpoint] = []
+        with open(file_path, "rb") as fh:
+            inflater = _Inflater(fh)
+            checkpoints.append(inflater.snapshot())
+            stream = _InflateStream(inflater, checkpoints, spacing)
+            entries = _scan_tar(io.BufferedReader(stream), "r|")
+        return cls(file_path, entries, checkpoints=checkpoints, spacing=spacing)
+
+    def names(self) -> List[str]:
+        return [e.name for e in self.entries]
+
+    def open_member(self, name: str) -> BinaryIO:
+        """Return a reader for member ``name`` positioned at its first byte."""
+        entry = self._by_name.get(name)
+        if entry is None or not entry.is_file:
+            raise KeyError(name)
+        return self.open_range(entry.offset, entry.size)
+
+    def open_range(self, offset: int, size: int) -> BinaryIO:
+        """Return a reader for ``size`` bytes at ``offset`` of the tar stream."""
+        if self.seek_index is not None and indexed_gzip is not None:
+            igz = indexed_gzip.IndexedGzipFile(
+                str(self.file_path), index_file=str(self.seek_index)
+            )
+            igz.seek(offset)
+            return io.BufferedReader(_RangeReader(igz, size, igz))
+
+        if self._checkpoints is None:
+            # Persisted offsets without in-memory checkpoints: rebuild them.
+            self._checkpoints = GzipTarIndex.build(
+                self.file_path, self.spacing
+            )._checkpoints
+        positions = [c.uncompressed_offset for c in self._checkpoints]
+        checkpoint = self._checkpoints[bisect.bisect_right(positions, offset) - 1]
+        fh = open(self.file_path, "rb")
+        stream = _InflateStream(_Inflater(fh, checkpoint))
+        stream.skip(offset - checkpoint.uncompressed_offset)
+        return io.BufferedReader(_RangeReader(stream, size, fh))
+
+    @classmethod
+    def clear_loaded(cls) -> None:
+        """Drop indexes (and their in-memory checkpoints) held by this process."""
+        with cls._lock:
+            cls._loaded.clear()
+
+
+def _scan_tar(fileobj: BinaryIO, mode: str) -> List[TarEntry]:
+    entries: List[TarEntry] = []
+    with tarfile.open(fileobj=fileobj, mode=mode) as t:
+        for info in t:
+            entries.append(
+                TarEntry(
+                    name=info.name,
+                    size=info.size,
+                    offset=info.offset_data,
+                    mtime=float(info.mtime),
+                    is_dir=info.isdir(),
+                    is_file=info.isfile(),
+                )
+            )
+    return entries
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
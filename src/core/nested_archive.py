@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import io
+import shutil
+import tempfile
+from contextlib import closing, contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Iterable, Iterator, List, Optional
+
+from src.core.extraction_guard import (
+    ExtractionBudget,
+    ExtractionGuard,
+    ExtractionLimitExceeded,
+)
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle at runtime
+    from src.core.archive_handler import ArchiveHandler, ArchiveMember
+
+
+@dataclass
+class NestedBudget:
+    """Limits applied across a whole nested archive tree.
+
+    ``max_depth`` is the number of nested archive levels expanded below the
+    outer archive; deeper archives are reported as plain files. ``None``
+    disables the member and byte limits.
+    """
+
+    max_depth: int = 3
+    max_members: Optional[int] = None
+    max_total_bytes: Optional[int] = None
+
+
+@dataclass
+class NestedMember:
+    """A member of a nested archive tree addressed by its virtual path.
+
+    Inner archives that are expanded have ``is_archive`` set and act as
+    directories: their members' paths are prefixed with the archive's path.
+    """
+
+    path: str
+    depth: int
+    member: ArchiveMember = field(repr=False)
+    is_archive: bool = False
+    guard: Optional[ExtractionGuard] = field(default=None, repr=False)
+
+    @property
+    def size(self) -> int:
+        return self.member.size
+
+    @property
+    def is_dir(self) -> bool:
+        return self.member.is_dir or self.is_archive
+
+    def open(self) -> BinaryIO:
+        """Return a reader whose output counts toward the tree budget."""
+        reader = self.member.open()
+        if self.guard is None:
+            return reader
+        return io.BufferedReader(self.guard.wrap(reader, self.member))
+
+
+class _Traversal:
+    """Budget bookkeeping for one pass over a nested archive tree."""
+
+    def __init__(self, budget: NestedBudget, archive_size: int) -> None:
+        self.budget = budget
+        self.guard = ExtractionGuard(
+            ExtractionBudget(max_total_bytes=budget.max_total_bytes), archive_size
+        )
+        self.members = 0
+
+    def count(self) -> None:
+        self.members += 1
+        limit = self.budget.max_members
+        if limit is not None and self.members > limit:
+            raise ExtractionLimitExceeded(f"Nested archive exceeds {limit} members")
+
+
+class NestedArchive:
+    """Traverse archives nested inside an archive as virtual directories.
+
+    Inner archives are only opened when traversal reaches them. Tar-based
+    inner archives are streamed straight from their parent member's reader;
+    zip and 7z need random access, so they are spooled into memory (or a
+    temporary file above ``SPOOL_BYTES``) rather than extracted to disk.
+    Bytes decompressed at every level count toward ``max_total_bytes``.
+    """
+
+    SPOOL_BYTES = 32 * 1024 * 1024
+
+    def __init__(
+        self,
+        handler: ArchiveHandler,
+        file_path: Path,
+        budget: Optional[NestedBudget] = None,
+    ) -> None:
+        self.handler = handler
+        self.file_path = file_path
+        self.budget = budget or NestedBudget()
+
+    def walk(self) -> Iterator[NestedMember]:
+        """Yield every member of the tree in depth-first archive order.
+
+        Members are read sequentially, so a member's reader must be consumed
+        before advancing to the next member.
+        """
+        traversal = self._traversal()
+        members = self.handler.iter_members(self.file_path, stream=True)
+        yield from self._walk(members, "", 0, traversal)
+
+    def list_paths(self) -> List[str]:
+        """Return virtual paths of all files in the tree."""
+        return [m.path for m in self.walk() if not m.is_dir]
+
+    @contextmanager
+    def open(self, path: str) -> Iterator[BinaryIO]:
+        """Open the file at virtual ``path``, expanding only its parents."""
+        traversal = self._traversal()
+        members = self.handler.iter_members(self.file_path, stream=True)
+        with closing(self._locate(members, path, 0, traversal)) as found:
+            member = next(found, None)
+            if member is None:
+                raise KeyError(path)
+            with member.open() as fh:
+                yield fh
+
+    def _traversal(self) -> _Traversal:
+        return _Traversal(self.budget, self.file_path.stat().st_size)
+
+    def _inner_type(self, member: ArchiveMember, depth: int) -> Optional[str]:
+        if member.is_dir or depth >= self.budget.max_depth:
+            return None
+        return self.handler.archive_type_for_name(member.name)
+
+    def _walk(
+        self,
+        members: Iterable[ArchiveMember],
+        prefix: str,
+        depth: int,
+        traversal: _Traversal,
+    ) -> Iterator[NestedMember]:
+        guard = traversal.guard
+        with closing(iter(members)) as it:
+            for member in it:
+                traversal.count()
+                path = prefix + member.name
+                inner_type = self._inner_type(member, depth)
+                if inner_type is None:
+                    # Leaves are only listed; their bytes count once opened.
+                    yield NestedMember(path, depth, member, guard=guard)
+                    continue
+                yield NestedMember(path, depth, member, is_archive=True, guard=guard)
+                inner = self._inner_members(member, inner_type, guard)
+                yield from self._walk(inner, path + "/", depth + 1, traversal)
+
+    def _locate(
+        self,
+        members: Iterable[ArchiveMember],
+        path: str,
+        depth: int,
+        traversal: _Traversal,
+    ) -> Iterator[NestedMember]:
+        guard = traversal.guard
+        with closing(iter(members)) as it:
+            for member in it:
+                traversal.count()
+                if member.is_dir:
+                    continue
+                if member.name == path:
+                    guard.check_declared(member)
+                    yield NestedMember(path, depth, member, guard=guard)
+                    return
+                inner_type = self._inner_type(member, depth)
+                if inner_type is not None and path.startswith(member.name + "/"):
+                    inner = self._inner_members(member, inner_type, guard)
+                    rest = path[len(member.name) + 1 :]
+                    yield from self._locate(inner, rest, depth + 1, traversal)
+                    return
+
+    def _inner_members(
+        self, member: ArchiveMember, archive_type: str, guard: ExtractionGuard
+    ) -> Iterator[ArchiveMember]:
+        with io.BufferedReader(guard.wrap(member.open(), member)) as raw:
+            if archive_type == "tar":
+                yield from self.handler.iter_stream_members(raw, "tar", stream=True)
+                return
+            with tempfile.SpooledTemporaryFile(max_size=self.SPOOL_BYTES) as spool:
+                shutil.copyfileobj(raw, spool)
+                spool.seek(0)
+                yield from self.handler.iter_stream_members(spool, archive_type)
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import hashlib
+import posixpath
+import zipfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
+
+from lxml import etree
+
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+P_NS = "http://schemas.openxmlformats.org/presentationml/2006/main"
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+CONTENT_TYPES_PART = "[Content_Types].xml"
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class ImageRef:
+    """An embedded image described without extracting it."""
+
+    part: str
+    content_type: str
+    size: int
+    sha256: str
+
+
+def relationships(
+    zf: zipfile.ZipFile, part: str, names: Optional[Set[str]] = None
+) -> Dict[str, Tuple[str, str]]:
+    """Return ``{rId: (target part, relationship type)}`` for ``part``.
+
+    Pass ``""`` for the package-level relationships. External targets
+    (hyperlinks, linked images) are skipped.
+    """
+    names = names if names is not None else set(zf.namelist())
+    folder, name = posixpath.split(part)
+    rels_name = posixpath.join(folder, "_rels", f"{name}.rels")
+    if rels_name not in names:
+        return {}
+    with zf.open(rels_name) as fh:
+        root = etree.parse(fh).getroot()
+    rels = {}
+    for rel in root.iter(f"{{{PKG_REL_NS}}}Relationship"):
+        if rel.get("TargetMode") == "External":
+            continue
+        target = rel.get("Target")
+        if target.startswith("/"):
+            target = target.lstrip("/")
+        else:
+            target = posixpath.normpath(posixpath.join(folder, target))
+        rels[rel.get("Id")] = (target, rel.get("Type"))
+    return rels
+
+
+def main_part(zf: zipfile.ZipFile, names: Set[str], default: str) -> str:
+    """Return the package's main document part, e.g. ``word/document.xml``."""
+    for target, rel_type in relationships(zf, "", names).values():
+        if rel_type.endswith("/officeDocument"):
+            return target
+    return default
+
+
+def presentation_slides(zf: zipfile.ZipFile, names: Set[str]) -> List[str]:
+    """Return a presentation's slide parts in slide order."""
+    part = main_part(zf, names, "ppt/presentation.xml")
+    if part not in names:
+        raise ValueError(f"Missing package part: {part}")
+    rels = relationships(zf, part, names)
+    with zf.open(part) as fh:
+        root = etree.parse(fh).getroot()
+    slides = []
+    for slide_id in root.iter(f"{{{P_NS}}}sldId"):
+        target = rels.get(slide_id.get(f"{{{R_NS}}}id"))
+        if target is not None and target[0] in names:
+            slides.append(target[0])
+    return slides
+
+
+def content_types(zf: zipfile.ZipFile) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Return the (extension defaults, part overrides) content type maps."""
+    defaults: Dict[str, str] = {}
+    overrides: Dict[str, str] = {}
+    with zf.open(CONTENT_TYPES_PART) as fh:
+        for elem in etree.parse(fh).getroot():
+            tag = etree.QName(elem).localname
+            if tag == "Default":
+                defaults[elem.get("Extension").lower()] = elem.get("ContentType")
+            elif tag == "Override":
+                overrides[elem.get("PartName").lstrip("/")] = elem.get("ContentType")
+    return defaults, overrides
+
+
+def list_images(file_path: Path) -> List[ImageRef]:
+    """Describe every image a part of the package relates to.
+
+    Images are found through ``image`` relationships, so thumbnails and
+    unreferenced media are left out. Each image is hashed while it is
+    streamed from the archive; nothing is written to disk.
+    """
+    try:
+        zf = zipfile.ZipFile(file_path)
+    except zipfile.BadZipFile as exc:
+        raise ValueError(f"Failed to open package: {exc}") from exc
+    with zf:
+        names = set(zf.namelist())
+        defaults, overrides = content_types(zf)
+        targets: Dict[str, None] = {}
+        for rels_name in sorted(names):
+            if not rels_name.endswith(".rels"):
+                continue
+            folder, _, base = rels_name.rpartition("_rels/")
+            source = folder + base[: -len(".rels")]
+            for target, rel_type in relationships(zf, source, names).values():
+                if rel_type.endswith("/image") and target in names:
+                    targets[target] = None
+        images = []
+        for part in targets:
+            ext = posixpath.splitext(part)[1].lstrip(".").lower()
+            content_type = overrides.get(part) or defaults.get(ext, "")
+            digest = hashlib.sha256()
+            with zf.open(part) as fh:
+                for chunk in iter(lambda: fh.read(HASH_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+            size = zf.getinfo(part).file_size
+            images.append(ImageRef(part, content_type, size, digest.hexdigest()))
+        return images
+
+
+@contextmanager
+def open_image(file_path: Path, part: str) -> Iterator[BinaryIO]:
+    """Open one image part for streaming reads.
+
+    ``part`` is an :attr:`ImageRef.part` from :func:`list_images`.
+    """
+    with zipfile.ZipFile(file_path) as zf:
+        try:
+            fh = zf.open(part)
+        except KeyError as exc:
+            raise ValueError(f"No such image part: {part}") from exc
+        with fh:
+            yield fh
@@ -1,32 +1,268 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional
-
-from tempfile import TemporaryDirectory
+from typing import (
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 from docx import Document
+from lxml import etree
 from openpyxl import load_workbook
 from pptx import Presentation
 
+from src.core.office_package import (
+    ImageRef,
+    list_images,
+    main_part,
+    open_image,
+    presentation_slides,
+)
+from src.core.office_text import docx_text, pptx_slide, pptx_text
+from src.core.parse_cache import ParseCache, cached_parse
+from src.core.sheet_profile import profile_sheet, to_columnar
+from src.core.xlsx_reader import XlsxReader
+from src.utils.partition import partition_by_weight
+
+# Representations of sheet data ``parse_xlsx`` can return.
+XLSX_OUTPUTS = ("rows", "columns", "profile")
+# Parse levels for ``parse_docx`` and ``parse_pptx``.
+PARSE_LEVELS = ("full", "text")
+
+
+# Package parts holding document properties, and the elements read from
+# them mapped to OfficeMetadata fields.
+CORE_PROPERTIES_PART = "docProps/core.xml"
+APP_PROPERTIES_PART = "docProps/app.xml"
+CORE_FIELDS = {"creator": "author", "title": "title", "created": "created"}
+APP_FIELDS = {"Pages": "pages", "Words": "words", "Slides": "slides"}
+
 
 @dataclass
 class OfficeMetadata:
     author: Optional[str] = None
     title: Optional[str] = None
     created: Optional[str] = None
+    pages: Optional[int] = None
+    words: Optional[int] = None
+    slides: Optional[int] = None
 
 
-class OfficeParser:
-    """Parse Microsoft Office documents for text and metadata."""
+def read_office_metadata(file_path: Path) -> OfficeMetadata:
+    """Read metadata from ``docProps/core.xml`` and ``docProps/app.xml``.
+
+    Only the two small property parts are decompressed and streamed, so no
+    document, presentation or workbook is loaded. Works for any Office Open
+    XML package. A missing author or title is ``""``, as python-docx and
+    python-pptx report it; other missing fields are ``None``.
+
+    ``created`` is formatted as the python-docx, python-pptx and openpyxl
+    loaders report it: with its UTC offset for Word documents, and as naive
+    UTC for presentations and workbooks.
+    """
+    metadata = OfficeMetadata(author="", title="")
+    try:
+        with zipfile.ZipFile(file_path) as zf:
+            names = set(zf.namelist())
+            aware = main_part(zf, names, "").startswith("word/")
+            for part, fields in (
+                (CORE_PROPERTIES_PART, CORE_FIELDS),
+                (APP_PROPERTIES_PART, APP_FIELDS),
+            ):
+                if part in names:
+                    with zf.open(part) as fh:
+                        _read_properties(fh, fields, metadata, aware)
+    except (zipfile.BadZipFile, etree.XMLSyntaxError) as exc:
+        raise ValueError(f"Failed to read Office properties: {exc}") from exc
+    return metadata
+
+
+def _read_properties(
+    fh: BinaryIO, fields: Dict[str, str], metadata: OfficeMetadata, aware: bool
+) -> None:
+    for _, elem in etree.iterparse(fh, events=("end",)):
+        name = etree.QName(elem).localname
+        attr = fields.get(name)
+        if attr is not None:
+            text = (elem.text or "").strip()
+            if attr == "created":
+                setattr(metadata, attr, _w3cdtf(text, aware) if text else None)
+            elif attr in ("pages", "words", "slides"):
+                setattr(metadata, attr, int(text) if text.isdigit() else None)
+            else:
+                setattr(metadata, attr, text)
+        elem.clear()
+
+
+def _w3cdtf(text: str, aware: bool) -> str:
+    """Format a W3CDTF timestamp the way ``str(datetime)`` would.
+
+    Unless ``aware`` is set the time is converted to UTC and its offset
+    dropped, as openpyxl and python-pptx do.
+    """
+    try:
+        value = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        return text
+    if not aware and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return str(value)
+
+
+@dataclass
+class SheetPage:
+    """A run of consecutive rows from one worksheet."""
+
+    sheet: str
+    first_row: int
+    rows: List[Tuple[object, ...]] = field(default_factory=list)
+
+
+class OfficeSession:
+    """An Office package loaded once and shared by every extraction step.
 
-    def parse_docx(self, file_path: Path) -> Dict[str, object]:
-        """Parse a Word document and return structured information."""
+    Text, tables and :meth:`extract_images` use the same loaded
+    ``Document``, ``Presentation`` or workbook instead of reopening the file
+    for each. :meth:`metadata` and :meth:`image_references` read their
+    package parts straight from the zip instead, which is cheaper than
+    walking the loaded object. ``read_only`` applies to workbooks only;
+    read-only workbooks expose no images to :meth:`extract_images`.
+    """
+
+    KINDS = ("docx", "xlsx", "pptx")
+
+    def __init__(self, file_path: Path, kind: str, read_only: bool = False) -> None:
+        if kind not in self.KINDS:
+            raise ValueError(f"Unsupported Office document type: {kind}")
+        self.file_path = file_path
+        self.kind = kind
+        self.read_only = read_only
         try:
-            doc = Document(file_path)
+            self.package = self._load()
         except Exception as exc:  # pragma: no cover - depends on external file
-            raise ValueError(f"Failed to open docx: {exc}") from exc
+            raise ValueError(f"Failed to open {kind}: {exc}") from exc
+
+    @classmethod
+    def kind_for_path(cls, file_path: Path) -> Optional[str]:
+        kind = file_path.suffix.lower().lstrip(".")
+        return kind if kind in cls.KINDS else None
+
+    def _load(self):
+        if self.kind == "docx":
+            return Document(self.file_path)
+        if self.kind == "pptx":
+            return Presentation(self.file_path)
+        return load_workbook(self.file_path, read_only=self.read_only, data_only=True)
+
+    def close(self) -> None:
+        if self.kind == "xlsx" and self.read_only:
+            self.package.close()
+
+    def __enter__(self) -> "OfficeSession":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def metadata(self) -> OfficeMetadata:
+        return read_office_metadata(self.file_path)
+
+    def image_references(self) -> List[ImageRef]:
+        return list_images(self.file_path)
+
+    def extract_images(self, output_dir: Path) -> List[Path]:
+        """Write embedded images to ``output_dir`` and return their paths."""
+        output_dir.mkdir(parents=True, exist_ok=True)
+        images: List[Path] = []
+
+        if self.kind == "pptx":
+            for slide in self.package.slides:
+                for shape in slide.shapes:
+                    if getattr(shape, "shape_type", None) == 13:  # picture
+                        image = shape.image
+                        fname = output_dir / image.filename
+                        with open(fname, "wb") as f:
+                            f.write(image.blob)
+                        images.append(fname)
+
+        elif self.kind == "docx":
+            rels = self.package.part._rels
+            for rel in rels.values():
+                if "image" in rel.reltype:
+                    fname = output_dir / Path(rel.target_ref).name
+                    with open(fname, "wb") as f:
+                        f.write(rel.target_part.blob)
+                    images.append(fname)
+
+        else:
+            for sheet in self.package.worksheets:
+                for img in getattr(sheet, "_images", []):
+                    fname = output_dir / Path(img.path).name
+                    with open(fname, "wb") as f:
+                        f.write(img._data())
+                    images.append(fname)
+
+        return images
+
+
+class OfficeParser:
+    """Parse Microsoft Office documents for text and metadata."""
+
+    # Bump when a result format changes so cached results are not reused.
+    PARSER_VERSION = "1"
+
+    def __init__(self, cache: Optional[ParseCache] = None) -> None:
+        self.cache = cache
+
+    def open_session(
+        self, file_path: Path, kind: Optional[str] = None, read_only: bool = False
+    ) -> OfficeSession:
+        """Open ``file_path`` once for reuse across extraction steps.
+
+        ``kind`` defaults to the file extension. Raises ``ValueError`` when the
+        package cannot be opened.
+        """
+        kind = kind or OfficeSession.kind_for_path(file_path) or ""
+        return OfficeSession(file_path, kind, read_only=read_only)
+
+    def parse_docx(self, file_path: Path, level: str = "full") -> Dict[str, object]:
+        """Parse a Word document and return structured information.
+
+        ``level="text"`` streams the document XML and returns only
+        ``paragraphs`` (text and ``heading_level``), ``headings`` and
+        ``metadata``, without building python-docx objects; see
+        :func:`docx_text`.
+        """
+        self._text_level(level)
+        return self._cached(
+            file_path,
+            "docx",
+            {"level": level},
+            lambda: self._parse_docx_file(file_path, level),
+        )
+
+    def _parse_docx_file(self, file_path: Path, level: str) -> Dict[str, object]:
+        if self._text_level(level):
+            result = docx_text(file_path)
+            result["metadata"] = self.get_document_metadata(file_path).__dict__
+            return result
+        with self.open_session(file_path, "docx") as session:
+            return self._parse_docx(session)
+
+    def _parse_docx(self, session: OfficeSession) -> Dict[str, object]:
+        doc = session.package
 
         paragraphs = []
         headings: List[str] = []
@@ -50,10 +286,9 @@ class OfficeParser:
                 rows.append([cell.text for cell in row.cells])
             tables.append(rows)
 
-        with TemporaryDirectory() as tmpdir:
-            images = [str(p) for p in self.extract_images(file_path, Path(tmpdir))]
+        images = [asdict(ref) for ref in session.image_references()]
 
-        metadata = self.get_document_metadata(file_path)
+        metadata = session.metadata()
         return {
             "paragraphs": paragraphs,
             "headings": headings,
@@ -62,134 +297,436 @@ class OfficeParser:
             "metadata": metadata.__dict__,
         }
 
-    def parse_xlsx(self, file_path: Path) -> Dict[str, object]:
-        """Parse an Excel workbook and return structured information."""
-        try:
-            wb = load_workbook(file_path, data_only=True)
-        except Exception as exc:  # pragma: no cover - external
-            raise ValueError(f"Failed to open xlsx: {exc}") from exc
-
-        sheets: Dict[str, Dict[str, object]] = {}
-        for sheet in wb.worksheets:
-            data_rows: List[List[object]] = []
-            formula_rows: List[List[Optional[str]]] = []
-            comments: List[Dict[str, str]] = []
-            for row in sheet.iter_rows(values_only=False):
-                data_rows.append([cell.value for cell in row])
-                formula_rows.append([cell.value if isinstance(cell.value, str) and cell.value.startswith("=") else None for cell in row])
-                for cell in row:
-                    if cell.comment:
-                        comments.append({"cell": cell.coordinate, "text": cell.comment.text})
-            sheets[sheet.title] = {
-                "data": data_rows,
-                "formulas": formula_rows,
-                "comments": comments,
-            }
+    def parse_xlsx(
+        self,
+        file_path: Path,
+        read_only: bool = False,
+        sheets: Optional[Iterable[str]] = None,
+        max_sheets: Optional[int] = None,
+        max_rows: Optional[int] = None,
+        max_cols: Optional[int] = None,
+        include_formulas: bool = False,
+        output: str = "rows",
+        workers: int = 1,
+    ) -> Dict[str, object]:
+        """Parse an Excel workbook and return structured information.
+
+        ``read_only`` loads the workbook in openpyxl's streaming mode, which
+        keeps memory flat for large sheets but cannot read comments.
+        ``sheets``, ``max_sheets``, ``max_rows`` and ``max_cols`` limit what
+        is read. Use :meth:`iter_xlsx_rows` or :meth:`iter_xlsx_pages` to
+        process rows without holding a whole sheet.
+
+        The workbook is loaded with cached values, so ``formulas`` only holds
+        strings that look like formulas. ``include_formulas`` instead reads
+        the sheet XML with :class:`XlsxReader`, returning each cell's cached
+        value and its formula from a single pass; date-formatted cells are
+        converted to ``datetime`` as openpyxl does.
+
+        ``output="columns"`` replaces each sheet's ``data`` rows with a
+        ``columns`` :class:`ColumnarSheet` of typed numpy arrays, taking the
+        first row as the header; ``output="profile"`` replaces them with a
+        per-column ``profile`` (type, null count, min/max, distinct count and
+        top values). Both require numpy.
+
+        ``workers`` above 1 parses sheets in that many processes, each
+        opening the workbook read-only (so comments are only returned with
+        ``include_formulas``); sheets are balanced by compressed size and
+        results keep workbook order.
+        """
+        if output not in XLSX_OUTPUTS:
+            raise ValueError(f"Unsupported xlsx output: {output}")
+        sheets = list(sheets) if sheets is not None else None
+        options = {
+            "read_only": read_only,
+            "sheets": sheets,
+            "max_sheets": max_sheets,
+            "max_rows": max_rows,
+            "max_cols": max_cols,
+            "include_formulas": include_formulas,
+            "output": output,
+            # Any number of workers gives the same result, but not one worker.
+            "parallel": workers > 1,
+        }
+        return self._cached(
+            file_path,
+            "xlsx",
+            options,
+            lambda: self._parse_xlsx_file(
+                file_path,
+                read_only,
+                (sheets, max_sheets, max_rows, max_cols),
+                include_formulas,
+                output,
+                workers,
+            ),
+        )
+
+    def _parse_xlsx_file(
+        self,
+        file_path: Path,
+        read_only: bool,
+        limits: Tuple[Optional[List[str]], Optional[int], Optional[int], Optional[int]],
+        include_formulas: bool,
+        output: str,
+        workers: int,
+    ) -> Dict[str, object]:
+        if workers > 1:
+            result = self._parse_xlsx_parallel(
+                file_path, include_formulas, workers, *limits
+            )
+        elif include_formulas:
+            result = self._parse_xlsx_xml(file_path, *limits)
+        else:
+            with self.open_session(file_path, "xlsx", read_only=read_only) as session:
+                result = self._parse_xlsx(session, *limits)
+        if output != "rows":
+            for entry in result["sheets"].values():
+                columns = to_columnar(entry.pop("data"))
+                if output == "columns":
+                    entry["columns"] = columns
+                else:
+                    entry["profile"] = profile_sheet(columns)
+        return result
+
+    def iter_xlsx_rows(
+        self,
+        file_path: Path,
+        sheets: Optional[Iterable[str]] = None,
+        max_sheets: Optional[int] = None,
+        max_rows: Optional[int] = None,
+        max_cols: Optional[int] = None,
+    ) -> Iterator[Tuple[str, Tuple[object, ...]]]:
+        """Yield ``(sheet title, row values)`` lazily from a read-only workbook.
+
+        The workbook is closed when the generator is exhausted or closed.
+        """
+        with self.open_session(file_path, "xlsx", read_only=True) as session:
+            wb = session.package
+            for title in _select_sheets(_worksheet_titles(wb), sheets, max_sheets):
+                sheet = wb[title]
+                for row in sheet.iter_rows(
+                    max_row=max_rows, max_col=max_cols, values_only=True
+                ):
+                    yield sheet.title, row
+
+    def iter_xlsx_pages(
+        self, file_path: Path, page_size: int = 1000, **limits: object
+    ) -> Iterator[SheetPage]:
+        """Yield rows in pages of at most ``page_size`` rows per sheet.
+
+        ``limits`` are passed to :meth:`iter_xlsx_rows`.
+        """
+        page: Optional[SheetPage] = None
+        for title, row in self.iter_xlsx_rows(file_path, **limits):
+            if page is not None and page.sheet == title:
+                if len(page.rows) < page_size:
+                    page.rows.append(row)
+                    continue
+                yield page
+                page = SheetPage(title, page.first_row + page_size, [row])
+                continue
+            if page is not None:
+                yield page
+            page = SheetPage(title, 1, [row])
+        if page is not None:
+            yield page
+
+    def _parse_xlsx(
+        self,
+        session: OfficeSession,
+        sheets: Optional[Iterable[str]] = None,
+        max_sheets: Optional[int] = None,
+        max_rows: Optional[int] = None,
+        max_cols: Optional[int] = None,
+    ) -> Dict[str, object]:
+        wb = session.package
+
+        parsed: Dict[str, Dict[str, object]] = {}
+        for title in _select_sheets(_worksheet_titles(wb), sheets, max_sheets):
+            parsed[title] = _sheet_entry(
+                wb[title], session.read_only, max_rows, max_cols
+            )
 
         named_ranges = list(wb.defined_names.keys())
+        metadata = session.metadata()
+        return {
+            "sheets": parsed,
+            "named_ranges": named_ranges,
+            "metadata": metadata.__dict__,
+        }
+
+    def _parse_xlsx_xml(
+        self,
+        file_path: Path,
+        sheets: Optional[Iterable[str]],
+        max_sheets: Optional[int],
+        max_rows: Optional[int],
+        max_cols: Optional[int],
+    ) -> Dict[str, object]:
+        parsed: Dict[str, Dict[str, object]] = {}
+        with XlsxReader(file_path) as reader:
+            for title in _select_sheets(reader.sheet_names, sheets, max_sheets):
+                parsed[title] = _xml_sheet_entry(reader, title, max_rows, max_cols)
+            named_ranges = reader.defined_names
         metadata = self.get_document_metadata(file_path)
         return {
-            "sheets": sheets,
+            "sheets": parsed,
             "named_ranges": named_ranges,
             "metadata": metadata.__dict__,
         }
 
-    def parse_pptx(self, file_path: Path) -> Dict[str, object]:
-        """Parse a PowerPoint presentation."""
-        try:
-            pres = Presentation(file_path)
-        except Exception as exc:  # pragma: no cover - external
-            raise ValueError(f"Failed to open pptx: {exc}") from exc
+    def _parse_xlsx_parallel(
+        self,
+        file_path: Path,
+        include_formulas: bool,
+        workers: int,
+        sheets: Optional[Iterable[str]],
+        max_sheets: Optional[int],
+        max_rows: Optional[int],
+        max_cols: Optional[int],
+    ) -> Dict[str, object]:
+        with XlsxReader(file_path) as reader:
+            titles = _select_sheets(reader.sheet_names, sheets, max_sheets)
+            sizes = {title: reader.part_size(title) for title in titles}
+            named_ranges = reader.defined_names
+        parsed: Dict[str, Dict[str, object]] = {}
+        partitions = partition_by_weight(
+            titles, sizes.__getitem__, min(workers, len(titles))
+        )
+        if partitions:
+            with ProcessPoolExecutor(max_workers=len(partitions)) as pool:
+                futures = [
+                    pool.submit(
+                        _parse_sheets,
+                        str(file_path),
+                        part,
+                        include_formulas,
+                        max_rows,
+                        max_cols,
+                    )
+                    for part in partitions
+                ]
+                for future in futures:
+                    parsed.update(future.result())
+        metadata = self.get_document_metadata(file_path)
+        return {
+            "sheets": {title: parsed[title] for title in titles},
+            "named_ranges": named_ranges,
+            "metadata": metadata.__dict__,
+        }
 
-        slides = []
-        for slide in pres.slides:
-            slide_info: Dict[str, object] = {
-                "layout": getattr(slide.slide_layout, "name", "Unknown"),
-                "texts": [],
-                "notes": slide.notes_slide.notes_text_frame.text if slide.has_notes_slide else "",
-            }
-            for shape in slide.shapes:
-                if hasattr(shape, "text") and shape.text:
-                    slide_info["texts"].append(shape.text)
-                if hasattr(shape, "table"):
-                    table_data = []
-                    for row in shape.table.rows:
-                        table_data.append([cell.text for cell in row.cells])
-                    slide_info.setdefault("tables", []).append(table_data)
-            slides.append(slide_info)
-
-        with TemporaryDirectory() as tmpdir:
-            images = [str(p) for p in self.extract_images(file_path, Path(tmpdir))]
+    def parse_pptx(
+        self, file_path: Path, level: str = "full", workers: int = 1
+    ) -> Dict[str, object]:
+        """Parse a PowerPoint presentation.
+
+        ``level="text"`` streams each slide's XML and returns per-slide
+        ``title``, ``texts`` and ``notes`` plus ``metadata``, without
+        building python-pptx objects; see :func:`pptx_text`.
+
+        ``workers`` above 1 splits the slides into that many contiguous
+        ranges parsed in separate processes; each worker reads only its own
+        slide parts (see :func:`pptx_slide`) and slides keep their order.
+        """
+        self._text_level(level)
+        # The slide split does not change the result, so workers are not keyed.
+        return self._cached(
+            file_path,
+            "pptx",
+            {"level": level},
+            lambda: self._parse_pptx_file(file_path, level, workers),
+        )
+
+    def _parse_pptx_file(
+        self, file_path: Path, level: str, workers: int
+    ) -> Dict[str, object]:
+        if self._text_level(level):
+            result = pptx_text(file_path)
+            result["metadata"] = self.get_document_metadata(file_path).__dict__
+            return result
+        if workers > 1:
+            return self._parse_pptx_parallel(file_path, workers)
+        with self.open_session(file_path, "pptx") as session:
+            return self._parse_pptx(session)
+
+    def _parse_pptx(self, session: OfficeSession) -> Dict[str, object]:
+        pres = session.package
+
+        slides = [_slide_info(slide) for slide in pres.slides]
+
+        images = [asdict(ref) for ref in session.image_references()]
 
+        metadata = session.metadata()
+        return {"slides": slides, "images": images, "metadata": metadata.__dict__}
+
+    def _parse_pptx_parallel(self, file_path: Path, workers: int) -> Dict[str, object]:
+        try:
+            with zipfile.ZipFile(file_path) as zf:
+                slide_parts = presentation_slides(zf, set(zf.namelist()))
+        except zipfile.BadZipFile as exc:
+            raise ValueError(f"Failed to open pptx: {exc}") from exc
+        count = len(slide_parts)
+        parts = min(workers, count)
+        slides: List[Dict[str, object]] = []
+        if parts:
+            bounds = [count * i // parts for i in range(parts + 1)]
+            with ProcessPoolExecutor(max_workers=parts) as pool:
+                futures = [
+                    pool.submit(
+                        _parse_slides, str(file_path), slide_parts[start:stop]
+                    )
+                    for start, stop in zip(bounds, bounds[1:])
+                ]
+                for future in futures:
+                    slides.extend(future.result())
+        images = [asdict(ref) for ref in list_images(file_path)]
         metadata = self.get_document_metadata(file_path)
         return {"slides": slides, "images": images, "metadata": metadata.__dict__}
 
+    def _cached(
+        self,
+        file_path: Path,
+        kind: str,
+        options: Dict[str, object],
+        compute: Callable[[], Dict[str, object]],
+    ) -> Dict[str, object]:
+        parser = f"office.{kind}"
+        return cached_parse(
+            self.cache, file_path, parser, self.PARSER_VERSION, options, compute
+        )
+
+    @staticmethod
+    def _text_level(level: str) -> bool:
+        if level not in PARSE_LEVELS:
+            raise ValueError(f"Unsupported parse level: {level}")
+        return level == "text"
+
+    def image_references(self, file_path: Path) -> List[ImageRef]:
+        """Describe embedded images without writing them anywhere.
+
+        Each :class:`ImageRef` gives the part name, content type, size and a
+        SHA-256 computed while streaming the part. Use :meth:`open_image` to
+        read one image on demand.
+        """
+        return list_images(file_path)
+
+    @contextmanager
+    def open_image(self, file_path: Path, part: str) -> Iterator[BinaryIO]:
+        """Stream the image stored at ``part`` in the package."""
+        with open_image(file_path, part) as fh:
+            yield fh
+
     def extract_images(self, file_path: Path, output_dir: Path) -> List[Path]:
-        """Extract embedded images from Office documents."""
-        output_dir.mkdir(parents=True, exist_ok=True)
-        ext = file_path.suffix.lower()
-        images: List[Path] = []
+        """Extract embedded images from Office documents.
 
-        if ext == ".pptx":
-            pres = Presentation(file_path)
-            for slide in pres.slides:
-                for shape in slide.shapes:
-                    if getattr(shape, "shape_type", None) == 13:  # picture
-                        image = shape.image
-                        fname = output_dir / image.filename
-                        with open(fname, "wb") as f:
-                            f.write(image.blob)
-                        images.append(fname)
+        Writes every image to ``output_dir``; prefer
+        :meth:`image_references` when only a description is needed.
+        """
+        if OfficeSession.kind_for_path(file_path) is None:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            return []
+        with self.open_session(file_path) as session:
+            return session.extract_images(output_dir)
 
-        elif ext == ".docx":
-            doc = Document(file_path)
-            rels = doc.part._rels
-            for rel in rels.values():
-                if "image" in rel.reltype:
-                    fname = output_dir / Path(rel.target_ref).name
-                    with open(fname, "wb") as f:
-                        f.write(rel.target_part.blob)
-                    images.append(fname)
+    def get_document_metadata(self, file_path: Path) -> OfficeMetadata:
+        """Extract common metadata from Office documents.
 
-        elif ext == ".xlsx":
-            wb = load_workbook(file_path)
-            for sheet in wb.worksheets:
-                for img in getattr(sheet, "_images", []):
-                    fname = output_dir / Path(img.path).name
-                    with open(fname, "wb") as f:
-                        f.write(img._data())
-                    images.append(fname)
+        Reads only the package's property parts; see
+        :func:`read_office_metadata`.
+        """
+        if OfficeSession.kind_for_path(file_path) is None:
+            return OfficeMetadata()
+        return read_office_metadata(file_path)
 
-        return images
 
-    def get_document_metadata_docx(self, doc: Document) -> OfficeMetadata:
-        props = doc.core_properties
-        return OfficeMetadata(
-            author=props.author,
-            title=props.title,
-            created=str(props.created) if props.created else None,
+def _sheet_entry(
+    sheet, read_only: bool, max_rows: Optional[int], max_cols: Optional[int]
+) -> Dict[str, object]:
+    data_rows: List[List[object]] = []
+    formula_rows: List[List[Optional[str]]] = []
+    comments: List[Dict[str, str]] = []
+    for row in sheet.iter_rows(
+        max_row=max_rows, max_col=max_cols, values_only=read_only
+    ):
+        if read_only:
+            values = list(row)
+        else:
+            values = [cell.value for cell in row]
+            for cell in row:
+                if cell.comment:
+                    comments.append(
+                        {"cell": cell.coordinate, "text": cell.comment.text}
+                    )
+        data_rows.append(values)
+        formula_rows.append(
+            [v if isinstance(v, str) and v.startswith("=") else None for v in values]
         )
+    return {"data": data_rows, "formulas": formula_rows, "comments": comments}
 
-    def get_document_metadata(self, file_path: Path) -> OfficeMetadata:
-        """Extract common metadata from Office documents."""
-        ext = file_path.suffix.lower()
-        if ext == ".docx":
-            doc = Document(file_path)
-            return self.get_document_metadata_docx(doc)
-        if ext == ".xlsx":
-            wb = load_workbook(file_path, read_only=True)
-            props = wb.properties
-            return OfficeMetadata(
-                author=props.creator,
-                title=props.title,
-                created=str(props.created) if props.created else None,
-            )
-        if ext == ".pptx":
-            pres = Presentation(file_path)
-            props = pres.core_properties
-            return OfficeMetadata(
-                author=props.author,
-                title=props.title,
-                created=str(props.created) if props.created else None,
-            )
-        return OfficeMetadata()
+
+def _xml_sheet_entry(
+    reader: XlsxReader, title: str, max_rows: Optional[int], max_cols: Optional[int]
+) -> Dict[str, object]:
+    sheet = reader.read_sheet(title, max_rows, max_cols)
+    return {"data": sheet.data, "formulas": sheet.formulas, "comments": sheet.comments}
+
+
+def _slide_info(slide) -> Dict[str, object]:
+    notes = slide.notes_slide.notes_text_frame.text if slide.has_notes_slide else ""
+    slide_info: Dict[str, object] = {
+        "layout": getattr(slide.slide_layout, "name", "Unknown"),
+        "texts": [],
+        "notes": notes,
+    }
+    for shape in slide.shapes:
+        if hasattr(shape, "text") and shape.text:
+            slide_info["texts"].append(shape.text)
+        if hasattr(shape, "table"):
+            table_data = []
+            for row in shape.table.rows:
+                table_data.append([cell.text for cell in row.cells])
+            slide_info.setdefault("tables", []).append(table_data)
+    return slide_info
+
+
+def _parse_sheets(
+    file_path: str,
+    titles: List[str],
+    include_formulas: bool,
+    max_rows: Optional[int],
+    max_cols: Optional[int],
+) -> Dict[str, Dict[str, object]]:
+    """Worker: parse ``titles`` from a workbook opened read-only."""
+    path = Path(file_path)
+    if include_formulas:
+        with XlsxReader(path) as reader:
+            return {
+                title: _xml_sheet_entry(reader, title, max_rows, max_cols)
+                for title in titles
+            }
+    with OfficeSession(path, "xlsx", read_only=True) as session:
+        return {
+            title: _sheet_entry(session.package[title], True, max_rows, max_cols)
+            for title in titles
+        }
+
+
+def _parse_slides(file_path: str, parts: List[str]) -> List[Dict[str, object]]:
+    """Worker: parse the slide ``parts`` without loading the presentation."""
+    with zipfile.ZipFile(file_path) as zf:
+        names = set(zf.namelist())
+        return [pptx_slide(zf, part, names) for part in parts]
+
+
+def _worksheet_titles(wb) -> List[str]:
+    return [ws.title for ws in wb.worksheets]
+
+
+def _select_sheets(
+    titles: List[str], sheets: Optional[Iterable[str]], max_sheets: Optional[int]
+) -> List[str]:
+    if sheets is not None:
+        wanted = set(sheets)
+        titles = [title for title in titles if title in wanted]
+    return list(islice(titles, max_sheets))
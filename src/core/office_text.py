@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import re
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Set
+
+from lxml import etree
+
+from src.core.office_package import main_part, presentation_slides, relationships
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+A_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+P_NS = "http://schemas.openxmlformats.org/presentationml/2006/main"
+
+# Built-in style names are stored in English whatever the UI language.
+HEADING_STYLE = re.compile(r"^heading (\d)$", re.IGNORECASE)
+TITLE_PLACEHOLDERS = {"title", "ctrTitle"}
+# Shape elements python-pptx lists in a slide's shape collection.
+SHAPE_TAGS = {
+    f"{{{P_NS}}}{tag}"
+    for tag in ("sp", "grpSp", "graphicFrame", "cxnSp", "pic", "contentPart")
+}
+
+
+def _w(tag: str) -> str:
+    return f"{{{W_NS}}}{tag}"
+
+
+def _open(zf: zipfile.ZipFile, part: str) -> BinaryIO:
+    try:
+        return zf.open(part)
+    except KeyError as exc:
+        raise ValueError(f"Missing package part: {part}") from exc
+
+
+def _heading_styles(
+    zf: zipfile.ZipFile, part: str, names: Set[str]
+) -> Dict[str, int]:
+    """Map paragraph style ids to heading levels (``Title`` is level 0)."""
+    styles_part = None
+    for target, rel_type in relationships(zf, part, names).values():
+        if rel_type.endswith("/styles"):
+            styles_part = target
+    if styles_part is None or styles_part not in names:
+        return {}
+    levels: Dict[str, int] = {}
+    with zf.open(styles_part) as fh:
+        for _, style in etree.iterparse(fh, tag=_w("style")):
+            name = style.find(_w("name"))
+            value = name.get(_w("val"), "") if name is not None else ""
+            match = HEADING_STYLE.match(value)
+            if match:
+                levels[style.get(_w("styleId"))] = int(match.group(1))
+            elif value.lower() == "title":
+                levels[style.get(_w("styleId"))] = 0
+            style.clear()
+    return levels
+
+
+def docx_text(file_path: Path) -> Dict[str, object]:
+    """Return paragraph text and heading levels from a Word document.
+
+    ``word/document.xml`` is streamed with ``iterparse`` and each paragraph
+    is cleared once its text is taken, so no document object model is
+    built. Paragraphs inside tables and text boxes are included, in
+    document order. ``heading_level`` is the style's heading number,
+    ``0`` for the Title style and ``None`` for body text.
+    """
+    try:
+        zf = zipfile.ZipFile(file_path)
+    except zipfile.BadZipFile as exc:
+        raise ValueError(f"Failed to open docx: {exc}") from exc
+    paragraphs: List[Dict[str, object]] = []
+    headings: List[str] = []
+    with zf:
+        names = set(zf.namelist())
+        part = main_part(zf, names, "word/document.xml")
+        levels = _heading_styles(zf, part, names)
+        with _open(zf, part) as fh:
+            for _, p in etree.iterparse(fh, tag=_w("p")):
+                text = _paragraph_text(p)
+                if text:
+                    style = p.find(f"{_w('pPr')}/{_w('pStyle')}")
+                    level = None
+                    if style is not None:
+                        level = levels.get(style.get(_w("val")))
+                    paragraphs.append({"text": text, "heading_level": level})
+                    if level is not None:
+                        headings.append(text)
+                p.clear()
+                while p.getprevious() is not None:
+                    del p.getparent()[0]
+    return {"paragraphs": paragraphs, "headings": headings}
+
+
+def _paragraph_text(p) -> str:
+    parts = []
+    for elem in p.iter(_w("t"), _w("tab"), _w("br"), _w("cr")):
+        if elem.tag == _w("t"):
+            parts.append(elem.text or "")
+        elif elem.tag == _w("tab"):
+            parts.append("\t")
+        else:
+            parts.append("\n")
+    return "".join(parts)
+
+
+def pptx_text(file_path: Path) -> Dict[str, object]:
+    """Return per-slide text from a presentation by streaming slide XML.
+
+    Slides follow the presentation's slide order. Each slide lists the text
+    of its shapes (paragraphs joined by newlines, as python-pptx's
+    ``shape.text``), its title placeholder text and its speaker notes.
+    """
+    try:
+        zf = zipfile.ZipFile(file_path)
+    except zipfile.BadZipFile as exc:
+        raise ValueError(f"Failed to open pptx: {exc}") from exc
+    slides: List[Dict[str, object]] = []
+    with zf:
+        names = set(zf.namelist())
+        for part in presentation_slides(zf, names):
+            slides.append(_slide_text(zf, part, names))
+    return {"slides": slides}
+
+
+def _slide_text(zf: zipfile.ZipFile, part: str, names: Set[str]) -> Dict[str, object]:
+    texts: List[str] = []
+    title: Optional[str] = None
+    with zf.open(part) as fh:
+        for _, shape in etree.iterparse(fh, tag=f"{{{P_NS}}}sp"):
+            text = _shape_text(shape)
+            if text:
+                texts.append(text)
+                if title is None and _placeholder(shape) in TITLE_PLACEHOLDERS:
+                    title = text
+            shape.clear()
+    notes = ""
+    for target, rel_type in relationships(zf, part, names).values():
+        if rel_type.endswith("/notesSlide") and target in names:
+            notes = _notes_text(zf, target)
+    return {"title": title, "texts": texts, "notes": notes}
+
+
+def pptx_slide(zf: zipfile.ZipFile, part: str, names: Set[str]) -> Dict[str, object]:
+    """Return the ``parse_pptx`` entry for one slide from its XML alone.
+
+    Only the slide part and its layout and notes parts are read, so a worker
+    can parse a range of slides without loading the whole presentation. The
+    result matches the python-pptx based entry: the layout name, the text of
+    each top-level shape (line breaks as ``\v``), table cell text and the
+    notes placeholder text.
+    """
+    layout = ""
+    notes = ""
+    for target, rel_type in relationships(zf, part, names).values():
+        if target not in names:
+            continue
+        if rel_type.endswith("/slideLayout"):
+            with zf.open(target) as fh:
+                c_sld = etree.parse(fh).getroot().find(_p("cSld"))
+            layout = c_sld.get("name", "") if c_sld is not None else ""
+        elif rel_type.endswith("/notesSlide"):
+            notes = _notes_placeholder_text(zf, target)
+    info: Dict[str, object] = {"layout": layout, "texts": [], "notes": notes}
+    for shape in _shapes(zf, part):
+        if shape.tag == _p("sp"):
+            text = _frame_text(shape.find(_p("txBody")))
+            if text:
+                info["texts"].append(text)
+        elif shape.tag == _p("graphicFrame"):
+            table = shape.find(f"{_a('graphic')}/{_a('graphicData')}/{_a('tbl')}")
+            if table is not None:
+                rows = [
+                    [_frame_text(tc.find(_a("txBody"))) for tc in tr.iter(_a("tc"))]
+                    for tr in table.iter(_a("tr"))
+                ]
+                info.setdefault("tables", []).append(rows)
+    return info
+
+
+def _p(tag: str) -> str:
+    return f"{{{P_NS}}}{tag}"
+
+
+def _a(tag: str) -> str:
+    return f"{{{A_NS}}}{tag}"
+
+
+def _shapes(zf: zipfile.ZipFile, part: str) -> List[etree._Element]:
+    """Return the top-level shape elements of a slide's shape tree."""
+    with _open(zf, part) as fh:
+        tree = etree.parse(fh).getroot().find(f"{_p('cSld')}/{_p('spTree')}")
+    return [] if tree is None else [e for e in tree if e.tag in SHAPE_TAGS]
+
+
+def _frame_text(tx_body) -> str:
+    if tx_body is None:
+        return ""
+    paragraphs = []
+    for p in tx_body.findall(_a("p")):
+        parts = []
+        for child in p:
+            if child.tag == _a("br"):
+                parts.append("\v")
+            elif child.tag in (_a("r"), _a("fld")):
+                t = child.find(_a("t"))
+                parts.append((t.text or "") if t is not None else "")
+        paragraphs.append("".join(parts))
+    return "\n".join(paragraphs)
+
+
+def _notes_placeholder_text(zf: zipfile.ZipFile, part: str) -> str:
+    # python-pptx treats a placeholder without a type as "obj", not "body".
+    for shape in _shapes(zf, part):
+        ph = shape.find(f".//{_p('nvPr')}/{_p('ph')}")
+        if ph is not None and ph.get("type") == "body":
+            return _frame_text(shape.find(_p("txBody")))
+    return ""
+
+
+def _placeholder(shape) -> Optional[str]:
+    ph = shape.find(f".//{{{P_NS}}}nvPr/{{{P_NS}}}ph")
+    return ph.get("type", "body") if ph is not None else None
+
+
+def _shape_text(shape) -> str:
+    paragraphs = []
+    for p in shape.iter(f"{{{A_NS}}}p"):
+        paragraphs.append("".join(t.text or "" for t in p.iter(f"{{{A_NS}}}t")))
+    return "\n".join(paragraphs)
+
+
+def _notes_text(zf: zipfile.ZipFile, part: str) -> str:
+    """Return the body placeholder text of a notes slide."""
+    with zf.open(part) as fh:
+        for _, shape in etree.iterparse(fh, tag=f"{{{P_NS}}}sp"):
+            if _placeholder(shape) == "body":
+                return _shape_text(shape)
+            shape.clear()
+    return ""
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import stat
+import threading
+import uuid
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Optional, Tuple, TypeVar, Union
+
+T = TypeVar("T")
+
+
+class ParseCache:
+    """Two-tier cache of parser results shared by every parser.
+
+    Results are keyed by the input file's content digest together with the
+    parser name, the parser's version and its parse options, so a changed
+    file, a parser upgrade or different options never return a stale entry.
+
+    The memory tier holds pickled results and is evicted least-recently-used
+    once their total size exceeds ``memory_bytes``; keeping the pickle rather
+    than the object means each hit returns a fresh copy that callers may
+    modify. The optional disk tier under ``root`` stores zlib-compressed
+    pickles, one file per key, and is evicted least-recently-used (by file
+    mtime, refreshed on every hit) once it exceeds ``disk_bytes``.
+
+    Unpickling runs code chosen by whoever wrote the file, so ``root`` is
+    created with mode ``0700`` and refused (``ValueError``) when it belongs
+    to another user or is accessible to group or others; entries not owned
+    by the current user are ignored.
+    """
+
+    HASH_CHUNK_SIZE = 1024 * 1024
+    # Content digests remembered per (path, size, mtime).
+    MAX_DIGESTS = 4096
+    MAGIC = b"PCv1"
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        memory_bytes: int = 64 * 1024 * 1024,
+        disk_bytes: int = 0,
+    ) -> None:
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.root = root if disk_bytes > 0 else None
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_total = 0
+        self._digests: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {
+            "hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "disk_evictions": 0,
+        }
+        self._disk_total = 0
+        if self.root is not None:
+            _private_dir(self.root)
+            self._disk_total = sum(size for _, _, size in self._disk_entries())
+
+    def digest(self, file_path: Path) -> str:
+        """Return the content digest of ``file_path``.
+
+        Digests are remembered by (path, size, mtime), so an unchanged file is
+        only hashed once.
+        """
+        st = file_path.stat()
+        fast_key = (str(file_path.resolve()), st.st_size, st.st_mtime_ns)
+        with self._lock:
+            digest = self._digests.get(fast_key)
+            if digest is not None:
+                self._digests.move_to_end(fast_key)
+                return digest
+        hasher = hashlib.blake2b(digest_size=20)
+        with open(file_path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(self.HASH_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+        digest = f"{hasher.hexdigest()}-{st.st_size}"
+        with self._lock:
+            self._digests[fast_key] = digest
+            while len(self._digests) > self.MAX_DIGESTS:
+                self._digests.popitem(last=False)
+        return digest
+
+    def key(
+        self, file_path: Path, parser: str, version: str, options: Dict[str, Any]
+    ) -> str:
+        """Return the cache key for parsing ``file_path`` with ``options``."""
+        # Options are part of the key, so they must serialize deterministically.
+        encoded = json.dumps(options, sort_keys=True, default=repr)
+        material = "\0".join((self.digest(file_path), parser, version, encoded))
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return ``(found, result)`` for ``key``, checking memory then disk."""
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+                self._stats["hits"] += 1
+        if payload is None and self.root is not None:
+            payload = self._read_disk(key)
+            if payload is not None:
+                self._remember(key, payload)
+                with self._lock:
+                    self._stats["hits"] += 1
+                    self._stats["disk_hits"] += 1
+        if payload is None:
+            return False, None
+        return True, pickle.loads(payload)
+
+    def put(self, key: str, result: Any) -> None:
+        """Store ``result`` under ``key``, replacing any existing entry."""
+        payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        self._remember(key, payload)
+        if self.root is not None:
+            self._write_disk(key, payload)
+
+    def get_or_compute(
+        self,
+        file_path: Path,
+        parser: str,
+        version: str,
+        options: Dict[str, Any],
+        compute: Callable[[], T],
+    ) -> T:
+        """Return the cached result for these inputs, computing it on a miss.
+
+        Concurrent misses for the same key may each compute the result; the
+        last one stored wins.
+        """
+        key = self.key(file_path, parser, version, options)
+        found, result = self.get(key)
+        if found:
+            return result
+        self._count("misses")
+        result = compute()
+        self.put(key, result)
+        return result
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers; counters are kept."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_total = 0
+        if self.root is not None:
+            for _, path, _ in self._disk_entries():
+                self._unlink(path)
+            with self._lock:
+                self._disk_total = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters and the bytes held per tier."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_bytes"] = self._memory_total
+            stats["disk_bytes"] = self._disk_total
+            return stats
+
+    def _remember(self, key: str, payload: bytes) -> None:
+        size = len(payload)
+        if size > self.memory_bytes:
+            return
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_total -= len(previous)
+            self._memory[key] = payload
+            self._memory_total += size
+            while self._memory_total > self.memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_total -= len(evicted)
+                self._stats["evictions"] += 1
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.bin"
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as fh:
+                if not _owned(os.fstat(fh.fileno())):
+                    return None
+                data = fh.read()
+            os.utime(path)
+        except OSError:
+            return None
+        if not data.startswith(self.MAGIC):
+            self._unlink(path)
+            return None
+        try:
+            return zlib.decompress(data[len(self.MAGIC) :])
+        except zlib.error:
+            self._unlink(path)
+            return None
+
+    def _write_disk(self, key: str, payload: bytes) -> None:
+        data = self.MAGIC + zlib.compress(payload, 6)
+        if len(data) > self.disk_bytes:
+            return
+        path = self._path(key)
+        path.parent.mkdir(mode=0o700, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp.write_bytes(data)
+        try:
+            replaced = path.stat().st_size
+        except OSError:
+            replaced = 0
+        os.replace(tmp, path)
+        with self._lock:
+            self._disk_total += len(data) - replaced
+            over = self._disk_total > self.disk_bytes
+        if over:
+            self._evict_disk(keep=path)
+
+    def _evict_disk(self, keep: Path) -> None:
+        entries = self._disk_entries()
+        total = sum(size for _, _, size in entries)
+        removed = 0
+        for _, path, size in sorted(entries):
+            if total <= self.disk_bytes:
+                break
+            if path == keep:
+                continue
+            self._unlink(path)
+            total -= size
+            removed += 1
+        with self._lock:
+            # Rescanning corrects for entries overwritten or removed elsewhere.
+            self._disk_total = total
+            self._stats["disk_evictions"] += removed
+
+    def _disk_entries(self):
+        entries = []
+        for path in self.root.glob("*/*.bin"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, path, st.st_size))
+        return entries
+
+    @staticmethod
+    def _unlink(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += amount
+
+
+def _owned(st: os.stat_result) -> bool:
+    if not hasattr(os, "getuid"):  # pragma: no cover - no POSIX ownership
+        return True
+    return st.st_uid == os.getuid()
+
+
+def _private_dir(path: Path) -> None:
+    """Create ``path`` as a private directory or check that it already is one."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.mkdir(mode=0o700, exist_ok=True)
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode) or not _owned(st):
+        raise ValueError(f"Parse cache directory is not owned by this user: {path}")
+    if hasattr(os, "getuid") and st.st_mode & 0o077:
+        raise ValueError(f"Parse cache directory must have mode 0700: {path}")
+
+
+def cached_parse(
+    cache: Optional[ParseCache],
+    file_path: Union[Path, str, BinaryIO],
+    parser: str,
+    version: str,
+    options: Dict[str, Any],
+    compute: Callable[[], T],
+) -> T:
+    """Run ``compute`` through ``cache`` when the input is a file on disk.
+
+    Streams have no stable content digest and are always parsed directly.
+    """
+    if cache is None or not isinstance(file_path, (str, Path)):
+        return compute()
+    return cache.get_or_compute(Path(file_path), parser, version, options, compute)
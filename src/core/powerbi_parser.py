@@ -3,14 +3,32 @@ from __future__ import annotations
 import json
 import zipfile
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, BinaryIO, Dict, List, Optional, Union
+
+from src.core.parse_cache import ParseCache, cached_parse
 
 
 class PowerBIParser:
     """Parse Power BI .pbix files."""
 
-    def parse_pbix(self, file_path: Path) -> Dict[str, Any]:
-        """Extract basic information from a PBIX file."""
+    # Bump when the result format changes so cached results are not reused.
+    PARSER_VERSION = "1"
+
+    def __init__(self, cache: Optional[ParseCache] = None) -> None:
+        self.cache = cache
+
+    def parse_pbix(self, file_path: Union[Path, BinaryIO]) -> Dict[str, Any]:
+        """Extract basic information from a PBIX file or seekable stream."""
+        return cached_parse(
+            self.cache,
+            file_path,
+            "powerbi",
+            self.PARSER_VERSION,
+            {},
+            lambda: self._parse_pbix(file_path),
+        )
+
+    def _parse_pbix(self, file_path: Union[Path, BinaryIO]) -> Dict[str, Any]:
         with zipfile.ZipFile(file_path) as z:
             model_data = {}
             if "DataModel/model.bim" in z.namelist():
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, List, Sequence
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - optional dependency
+    np = None
+
+from src.core.xlsx_reader import column_letter
+
+# Numpy dtype and fill value for null slots, per inferred column type.
+TYPE_DTYPES = {
+    "bool": ("bool", False),
+    "int": ("int64", 0),
+    "float": ("float64", float("nan")),
+    "datetime": ("datetime64[us]", None),
+    "string": ("str", ""),
+}
+
+
+@dataclass
+class Column:
+    """One sheet column as a typed array with a null mask.
+
+    ``values`` is a numpy array of the inferred ``type``; slots where
+    ``mask`` is true were empty cells and hold a placeholder. Columns
+    mixing incompatible types fall back to an object array with type
+    ``"object"``.
+    """
+
+    name: str
+    type: str
+    values: "np.ndarray"
+    mask: "np.ndarray"
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def to_list(self) -> List[object]:
+        """Return the column as Python values with ``None`` for empty cells."""
+        items = self.values.tolist()
+        return [None if null else v for v, null in zip(items, self.mask.tolist())]
+
+
+@dataclass
+class ColumnarSheet:
+    """Sheet data held column by column."""
+
+    columns: List[Column]
+    row_count: int
+
+    def column(self, name: str) -> Column:
+        for column in self.columns:
+            if column.name == name:
+                return column
+        raise KeyError(name)
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ValueError("Columnar sheet output requires the numpy package")
+
+
+def _infer_type(values: "np.ndarray") -> str:
+    if len(values) == 0:
+        return "float"
+    kinds = set(np.frompyfunc(type, 1, 1)(values).tolist())
+    if kinds <= {bool}:
+        return "bool"
+    if kinds <= {int}:
+        return "int"
+    if kinds <= {int, float}:
+        return "float"
+    if kinds <= {datetime, date}:
+        return "datetime"
+    if kinds <= {str}:
+        return "string"
+    return "object"
+
+
+def to_column(name: str, cells: Sequence[object]) -> Column:
+    """Build a typed :class:`Column` from a sequence of cell values."""
+    _require_numpy()
+    raw = np.empty(len(cells), dtype=object)
+    raw[:] = list(cells)
+    mask = np.equal(raw, None)
+    present = raw[~mask]
+    kind = _infer_type(present)
+    if kind == "object":
+        return Column(name, kind, raw, mask)
+    dtype, fill = TYPE_DTYPES[kind]
+    filled = raw.copy()
+    if fill is not None:
+        filled[mask] = fill
+    try:
+        values = filled.astype(dtype)
+    except (OverflowError, ValueError):
+        return Column(name, "object", raw, mask)
+    return Column(name, kind, values, mask)
+
+
+def to_columnar(
+    rows: Sequence[Sequence[object]], header: bool = True
+) -> ColumnarSheet:
+    """Convert row lists, as produced by ``parse_xlsx``, to columns.
+
+    With ``header`` the first row supplies column names; otherwise (and for
+    blank header cells) columns are named by spreadsheet letter.
+    """
+    _require_numpy()
+    rows = list(rows)
+    names: Sequence[object] = rows[0] if header and rows else []
+    body = rows[1:] if header else rows
+    width = max((len(r) for r in rows), default=0)
+    grid = np.empty((len(body), width), dtype=object)
+    for i, row in enumerate(body):
+        grid[i, : len(row)] = row
+    columns = []
+    for j in range(width):
+        label = names[j] if j < len(names) and names[j] is not None else None
+        name = str(label) if label is not None else column_letter(j + 1)
+        columns.append(to_column(name, grid[:, j]))
+    return ColumnarSheet(columns, len(body))
+
+
+def profile_column(column: Column, top: int = 5) -> Dict[str, object]:
+    """Summarize a column with vectorized numpy operations.
+
+    Returns the inferred type, counts of values and nulls, the number of
+    distinct values, minimum and maximum (for orderable types) and the
+    ``top`` most frequent values with their counts.
+    """
+    valid = column.values[~column.mask]
+    profile: Dict[str, object] = {
+        "name": column.name,
+        "type": column.type,
+        "count": int(valid.size),
+        "null_count": int(column.mask.sum()),
+        "distinct_count": 0,
+        "min": None,
+        "max": None,
+        "top_values": [],
+    }
+    if valid.size == 0:
+        return profile
+    if column.type == "object":
+        # Mixed types cannot be sorted together; count by string form.
+        valid = valid.astype(str)
+    elif column.type == "float":
+        valid = valid[~np.isnan(valid)]
+        if valid.size == 0:
+            return profile
+    uniques, counts = np.unique(valid, return_counts=True)
+    order = np.argsort(-counts, kind="stable")[:top]
+    profile["distinct_count"] = int(uniques.size)
+    profile["top_values"] = [
+        {"value": _plain(uniques[i]), "count": int(counts[i])} for i in order
+    ]
+    if column.type != "object":
+        profile["min"] = _plain(uniques[0])
+        profile["max"] = _plain(uniques[-1])
+    return profile
+
+
+def profile_sheet(sheet: ColumnarSheet, top: int = 5) -> Dict[str, object]:
+    """Return ``{"row_count", "columns"}`` with a profile per column."""
+    return {
+        "row_count": sheet.row_count,
+        "columns": [profile_column(c, top) for c in sheet.columns],
+    }
+
+
+def _plain(value: object) -> object:
+    """Convert a numpy scalar to a JSON-friendly Python value."""
+    if isinstance(value, np.datetime64):
+        return str(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
@@ -3,14 +3,32 @@ from __future__ import annotations
 import json
 import zipfile
 from pathlib import Path
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.core.parse_cache import ParseCache, cached_parse
 
 
 class SynapseParser:
     """Parse Azure Synapse package archives."""
 
+    # Bump when the result format changes so cached results are not reused.
+    PARSER_VERSION = "1"
+
+    def __init__(self, cache: Optional[ParseCache] = None) -> None:
+        self.cache = cache
+
     def parse_synapse_package(self, file_path: Path) -> Dict[str, Any]:
         """Categorize files and extract simple metadata."""
+        return cached_parse(
+            self.cache,
+            file_path,
+            "synapse",
+            self.PARSER_VERSION,
+            {},
+            lambda: self._parse_synapse_package(file_path),
+        )
+
+    def _parse_synapse_package(self, file_path: Path) -> Dict[str, Any]:
         contents = []
         with zipfile.ZipFile(file_path) as z:
             for name in z.namelist():
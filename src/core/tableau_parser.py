@@ -3,14 +3,32 @@ from __future__ import annotations
 import zipfile
 import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+from src.core.parse_cache import ParseCache, cached_parse
 
 
 class TableauParser:
     """Parse Tableau .twbx files."""
 
+    # Bump when the result format changes so cached results are not reused.
+    PARSER_VERSION = "1"
+
+    def __init__(self, cache: Optional[ParseCache] = None) -> None:
+        self.cache = cache
+
     def parse_twbx(self, file_path: Path) -> Dict[str, Any]:
         """Extract basic information from a TWBX file."""
+        return cached_parse(
+            self.cache,
+            file_path,
+            "tableau",
+            self.PARSER_VERSION,
+            {},
+            lambda: self._parse_twbx(file_path),
+        )
+
+    def _parse_twbx(self, file_path: Path) -> Dict[str, Any]:
         with zipfile.ZipFile(file_path) as z:
             workbook_xml = None
             if "workbook.xml" in z.namelist():
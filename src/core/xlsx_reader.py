@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from lxml import etree
+from openpyxl.formula.translate import Translator
+from openpyxl.styles.numbers import (
+    builtin_format_code,
+    is_date_format,
+    is_timedelta_format,
+)
+from openpyxl.utils.datetime import (
+    CALENDAR_MAC_1904,
+    WINDOWS_EPOCH,
+    from_excel,
+    from_ISO8601,
+)
+
+from src.core.office_package import relationships
+
+REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+
+@dataclass
+class XlsxCell:
+    """One cell as stored in the sheet XML."""
+
+    row: int
+    column: int
+    value: object = None
+    formula: Optional[str] = None
+
+    @property
+    def coordinate(self) -> str:
+        return f"{column_letter(self.column)}{self.row}"
+
+
+@dataclass
+class XlsxSheet:
+    """Values, formulas and comments of one worksheet read in a single pass."""
+
+    title: str
+    data: List[List[object]] = field(default_factory=list)
+    formulas: List[List[Optional[str]]] = field(default_factory=list)
+    comments: List[Dict[str, str]] = field(default_factory=list)
+
+
+def column_index(letters: str) -> int:
+    """Return the 1-based column number for ``letters`` such as ``"AB"``."""
+    index = 0
+    for char in letters:
+        index = index * 26 + ord(char) - 64
+    return index
+
+
+def column_letter(index: int) -> str:
+    letters = ""
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _split_ref(ref: str) -> Tuple[int, int]:
+    for i, char in enumerate(ref):
+        if char.isdigit():
+            return column_index(ref[:i]), int(ref[i:])
+    raise ValueError(f"Invalid cell reference: {ref}")
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _text(elem) -> str:
+    """Concatenate ``<t>`` runs, skipping phonetic (``rPh``) runs."""
+    parts = []
+    for t in elem.iter("{*}t"):
+        if _local(t.getparent().tag) != "rPh":
+            parts.append(t.text or "")
+    return "".join(parts)
+
+
+def _number(text: str) -> object:
+    if any(c in text for c in ".eE"):
+        return float(text)
+    return int(text)
+
+
+class XlsxReader:
+    """Read xlsx sheet XML directly with ``lxml.etree.iterparse``.
+
+    Each cell's cached value (``<v>``) and formula (``<f>``) are read in the
+    same pass, so formulas are available without a second workbook load.
+    Shared strings are decoded once into a list indexed by position, shared
+    formulas are translated to each dependent cell, and comments are read
+    from the sheet's comments part. Rows are cleared as soon as they have
+    been read, so memory is bounded by the output rather than the XML.
+    As in openpyxl, numbers in cells with a date or duration number format
+    become ``datetime`` or ``timedelta`` values (honouring the 1904 date
+    system); other number formats are not applied.
+    """
+
+    def __init__(self, file_path: Path) -> None:
+        self.file_path = file_path
+        try:
+            self._zip = zipfile.ZipFile(file_path)
+            self._names = set(self._zip.namelist())
+            workbook = self._parse("xl/workbook.xml")
+        except (zipfile.BadZipFile, KeyError, etree.XMLSyntaxError) as exc:
+            raise ValueError(f"Failed to open xlsx: {exc}") from exc
+        rels = self._rels("xl/workbook.xml")
+        self.sheet_parts: Dict[str, str] = {}
+        for sheet in workbook.iter("{*}sheet"):
+            target = rels.get(sheet.get(f"{{{REL_NS}}}id"))
+            # Chartsheets and dialog sheets have no cells.
+            if target is not None and target[1].endswith("/worksheet"):
+                self.sheet_parts[sheet.get("name")] = target[0]
+        pr = workbook.find("{*}workbookPr")
+        date1904 = pr is not None and pr.get("date1904") in ("1", "true")
+        self.epoch = CALENDAR_MAC_1904 if date1904 else WINDOWS_EPOCH
+        self._styles_part = next(
+            (t for t, kind in rels.values() if kind.endswith("/styles")),
+            "xl/styles.xml",
+        )
+        self._date_styles: Optional[Dict[int, bool]] = None
+        # Sheet-scoped names belong to their sheet, as in openpyxl.
+        self.defined_names = [
+            d.get("name")
+            for d in workbook.iter("{*}definedName")
+            if d.get("localSheetId") is None
+        ]
+        self._shared_strings: Optional[List[str]] = None
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def __enter__(self) -> "XlsxReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def sheet_names(self) -> List[str]:
+        return list(self.sheet_parts)
+
+    @property
+    def shared_strings(self) -> List[str]:
+        if self._shared_strings is None:
+            strings: List[str] = []
+            if "xl/sharedStrings.xml" in self._names:
+                with self._zip.open("xl/sharedStrings.xml") as fh:
+                    for _, si in etree.iterparse(fh, tag="{*}si"):
+                        strings.append(_text(si))
+                        si.clear()
+            self._shared_strings = strings
+        return self._shared_strings
+
+    @property
+    def date_styles(self) -> Dict[int, bool]:
+        """Map cell style indexes with a date format to whether it is a duration."""
+        if self._date_styles is None:
+            styles: Dict[int, bool] = {}
+            if self._styles_part in self._names:
+                root = self._parse(self._styles_part)
+                custom = {
+                    int(fmt.get("numFmtId")): fmt.get("formatCode")
+                    for fmt in root.iterfind("{*}numFmts/{*}numFmt")
+                }
+                for idx, xf in enumerate(root.iterfind("{*}cellXfs/{*}xf")):
+                    fmt_id = int(xf.get("numFmtId", 0))
+                    fmt = custom.get(fmt_id) or builtin_format_code(fmt_id)
+                    if fmt and is_date_format(fmt):
+                        styles[idx] = is_timedelta_format(fmt)
+            self._date_styles = styles
+        return self._date_styles
+
+    def iter_cells(
+        self,
+        title: str,
+        max_rows: Optional[int] = None,
+        max_cols: Optional[int] = None,
+    ) -> Iterator[XlsxCell]:
+        """Yield the non-empty cells of sheet ``title`` in row order."""
+        part = self.sheet_parts[title]
+        shared: Dict[str, Tuple[str, str]] = {}
+        row_number = 0
+        with self._zip.open(part) as fh:
+            for _, row in etree.iterparse(fh, tag="{*}row"):
+                row_number = int(row.get("r") or row_number + 1)
+                if max_rows is not None and row_number > max_rows:
+                    break
+                column = 0
+                for c in row.iterchildren("{*}c"):
+                    ref = c.get("r")
+                    column = _split_ref(ref)[0] if ref else column + 1
+                    if max_cols is not None and column > max_cols:
+                        break
+                    cell = self._cell(c, row_number, column, shared)
+                    if cell.value is not None or cell.formula is not None:
+                        yield cell
+                row.clear()
+                while row.getprevious() is not None:
+                    del row.getparent()[0]
+
+    def read_sheet(
+        self,
+        title: str,
+        max_rows: Optional[int] = None,
+        max_cols: Optional[int] = None,
+    ) -> XlsxSheet:
+        """Return dense value and formula rows plus comments for ``title``.
+
+        Rows start at row 1 and are padded to the widest row, matching
+        openpyxl's ``iter_rows`` layout.
+        """
+        sheet = XlsxSheet(title)
+        width = 0
+        for cell in self.iter_cells(title, max_rows, max_cols):
+            while len(sheet.data) < cell.row:
+                sheet.data.append([])
+                sheet.formulas.append([])
+            values = sheet.data[cell.row - 1]
+            formulas = sheet.formulas[cell.row - 1]
+            if len(values) < cell.column:
+                values.extend([None] * (cell.column - len(values)))
+                formulas.extend([None] * (cell.column - len(formulas)))
+            values[cell.column - 1] = cell.value
+            formulas[cell.column - 1] = cell.formula
+            width = max(width, cell.column)
+        for values, formulas in zip(sheet.data, sheet.formulas):
+            values.extend([None] * (width - len(values)))
+            formulas.extend([None] * (width - len(formulas)))
+        sheet.comments = self.comments(title)
+        return sheet
+
+    def comments(self, title: str) -> List[Dict[str, str]]:
+        """Return ``{"cell", "text"}`` for each comment on sheet ``title``."""
+        part = self.sheet_parts[title]
+        comments: List[Dict[str, str]] = []
+        for target, rel_type in self._rels(part).values():
+            if not rel_type.endswith("/comments") or target not in self._names:
+                continue
+            with self._zip.open(target) as fh:
+                for _, comment in etree.iterparse(fh, tag="{*}comment"):
+                    comments.append(
+                        {"cell": comment.get("ref"), "text": _text(comment)}
+                    )
+                    comment.clear()
+        return comments
+
+    def _cell(
+        self, c, row: int, column: int, shared: Dict[str, Tuple[str, str]]
+    ) -> XlsxCell:
+        cell = XlsxCell(row, column)
+        cell_type = c.get("t", "n")
+        v = c.find("{*}v")
+        f = c.find("{*}f")
+        if cell_type == "inlineStr":
+            inline = c.find("{*}is")
+            cell.value = _text(inline) if inline is not None else None
+        elif v is not None and v.text is not None:
+            text = v.text
+            if cell_type == "s":
+                cell.value = self.shared_strings[int(text)]
+            elif cell_type == "b":
+                cell.value = text == "1"
+            elif cell_type in ("str", "e"):
+                cell.value = text
+            elif cell_type == "d":
+                cell.value = from_ISO8601(text)
+            else:
+                cell.value = self._numeric(text, int(c.get("s", 0)))
+        if f is not None:
+            cell.formula = self._formula(f, cell.coordinate, shared)
+        return cell
+
+    def _numeric(self, text: str, style: int) -> object:
+        value = _number(text)
+        duration = self.date_styles.get(style)
+        if duration is None:
+            return value
+        try:
+            return from_excel(value, self.epoch, timedelta=duration)
+        except (OverflowError, ValueError):
+            # openpyxl reports serials outside the date range as errors.
+            return "#VALUE!"
+
+    @staticmethod
+    def _formula(
+        f, coordinate: str, shared: Dict[str, Tuple[str, str]]
+    ) -> Optional[str]:
+        text = f.text or ""
+        if f.get("t") == "shared":
+            index = f.get("si")
+            if text:
+                shared[index] = (f"={text}", coordinate)
+            elif index in shared:
+                master, origin = shared[index]
+                return Translator(master, origin=origin).translate_formula(coordinate)
+        # A shared formula whose master was not seen leaves only the value.
+        return f"={text}" if text else None
+
+    def part_size(self, title: str) -> int:
+        """Return the compressed size of sheet ``title``'s XML part."""
+        return self._zip.getinfo(self.sheet_parts[title]).compress_size
+
+    def _parse(self, name: str):
+        with self._zip.open(name) as fh:
+            return etree.parse(fh).getroot()
+
+    def _rels(self, part: str) -> Dict[str, Tuple[str, str]]:
+        return relationships(self._zip, part, self._names)
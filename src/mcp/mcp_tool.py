@@ -2,20 +2,22 @@ from __future__ import annotations
 
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, List, Optional, Sequence
 import errno
 import tarfile
 import zipfile
 
 import py7zr
 
-from src.core.archive_handler import ArchiveHandler
+from src.core.archive_handler import ArchiveHandler, MemberFilter
 from src.core.office_parser import OfficeParser
 from src.core.relevance_engine import RelevanceEngine
 from src.utils.config import load_config
 
 
 ALLOWED_MODES = {"basic", "detailed", "content", "smart"}
+# Modes answered from the archive listing index without extraction.
+LISTING_MODES = {"basic", "detailed"}
 
 
 def _file_info(path: Path) -> Dict[str, object]:
@@ -28,13 +30,33 @@ def _file_info(path: Path) -> Dict[str, object]:
     }
 
 
+def _index_info(record: Dict[str, object]) -> Dict[str, object]:
+    name = str(record["name"])
+    return {
+        "path": name,
+        "size": record["size"],
+        "compressed_size": record["compressed_size"],
+        "crc": record["crc"],
+        "type": Path(name).suffix.lstrip("."),
+        "modified": record["modified"],
+    }
+
+
 def extract_archive_tool(
     file_path: str,
     extraction_mode: str = "basic",
     include_metadata: bool = True,
     max_files: int = 1000,
+    include_patterns: Optional[Sequence[str]] = None,
+    exclude_patterns: Optional[Sequence[str]] = None,
 ) -> Dict[str, object]:
-    """Basic MCP tool for extracting archives."""
+    """Basic MCP tool for extracting archives.
+
+    ``max_files`` and the glob patterns are pushed down into the handler so
+    members that would be discarded are never decompressed. The ``basic`` and
+    ``detailed`` modes list archive member paths from the archive index and do
+    not extract anything.
+    """
 
     path = Path(file_path)
     if not path.exists() or not path.is_file():
@@ -56,10 +78,22 @@ def extract_archive_tool(
         return {"status": "error", "message": "Unsupported archive type"}
 
     start = datetime.now(UTC)
+    member_filter = MemberFilter(
+        include=include_patterns or (),
+        exclude=exclude_patterns or (),
+        limit=max_files,
+    )
+    extracted_files: List[Path] = []
+    records: List[Dict[str, object]] = []
     try:
-        extracted_files: List[Path] = handler.extract_archive(
-            path, max_members=cfg.max_archive_files
-        )
+        total = sum(1 for r in handler.list_index(path) if r["type"] == "file")
+        if extraction_mode in LISTING_MODES:
+            index = handler.list_index(path, member_filter)
+            records = [r for r in index if r["type"] == "file"]
+        else:
+            extracted_files = handler.extract_archive(
+                path, max_members=cfg.max_archive_files, member_filter=member_filter
+            )
     except PermissionError:
         return {
             "status": "error",
@@ -85,15 +119,17 @@ def extract_archive_tool(
         return {"status": "error", "message": str(exc)}
 
     if extraction_mode == "basic":
-        files = [str(p) for p in extracted_files[:max_files]]
+        files = [r["name"] for r in records]
+    elif extraction_mode == "detailed":
+        files = [_index_info(r) for r in records]
     else:
-        files = [_file_info(p) for p in extracted_files[:max_files]]
+        files = [_file_info(p) for p in extracted_files]
 
     content_data: Dict[str, Iterable[str]] | None = None
     if extraction_mode in {"content", "smart"}:
         parser = OfficeParser()
         contents: Dict[str, Iterable[str]] = {}
-        for p in extracted_files[:max_files]:
+        for p in extracted_files:
             if p.suffix.lower() == ".txt":
                 contents[str(p)] = p.read_text(errors="ignore").splitlines()
             elif p.suffix.lower() == ".docx":
@@ -110,7 +146,8 @@ def extract_archive_tool(
     archive_info = {
         "type": archive_type,
         "size": path.stat().st_size,
-        "file_count": len(extracted_files),
+        "file_count": total,
+        "returned_count": len(files),
     }
     metadata = {
         "extraction_time": datetime.now(UTC).isoformat(),
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from functools import partial
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def get_executor(max_workers: int = 8) -> ThreadPoolExecutor:
+    """Return the process-wide executor for blocking archive work.
+
+    The executor is created with ``max_workers`` threads on first use and
+    shared afterwards, so the number of concurrent decompressions stays
+    bounded however many coroutines are waiting.
+    """
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="archive-async"
+            )
+        return _executor
+
+
+async def run_blocking(
+    executor: ThreadPoolExecutor, func: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """Run ``func`` on ``executor`` without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+
+
+async def run_cancellable(
+    executor: ThreadPoolExecutor, func: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """Run ``func(*args, cancel=event, **kwargs)`` on ``executor``.
+
+    If the awaiting task is cancelled, ``event`` is set and the call is
+    awaited until it returns, so any cleanup it does on cancellation has
+    finished before ``CancelledError`` propagates.
+    """
+    cancel = threading.Event()
+    future = executor.submit(partial(func, *args, cancel=cancel, **kwargs))
+    waiter = asyncio.wrap_future(future)
+    try:
+        return await asyncio.shield(waiter)
+    except asyncio.CancelledError:
+        cancel.set()
+        if not future.cancel():
+            with suppress(Exception):
+                await waiter
+        raise
@@ -1,39 +1,262 @@
 from __future__ import annotations
 
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Iterable
+from typing import BinaryIO, Callable, Dict, Iterable, List, Optional, TypeVar
 
 try:
-    from azure.storage.blob import BlobServiceClient
+    from azure.storage.blob import BlobBlock, BlobServiceClient
 except Exception:  # pragma: no cover - optional dependency
     BlobServiceClient = None
+    BlobBlock = None
 
+try:
+    import requests
+    from azure.core.exceptions import (
+        HttpResponseError,
+        ServiceRequestError,
+        ServiceResponseError,
+    )
+    from azure.core.pipeline.transport import RequestsTransport
+except Exception:  # pragma: no cover - optional dependency
+    requests = None
+    RequestsTransport = None
+    HttpResponseError = ServiceRequestError = ServiceResponseError = None
+
+
+from .storage import TEMP_PREFIX, StorageClient
+
+T = TypeVar("T")
 
-from .storage import StorageClient
+# Status codes worth retrying: timeouts, throttling and server errors.
+RETRY_STATUS = {408, 429, 500, 502, 503, 504}
 
 
 class AzureStorageClient(StorageClient):
     """Storage client using Azure Blob Storage."""
 
-    def __init__(self, account_name: str, account_key: str, container: str) -> None:
+    # Size of each staged block when streaming; also the memory held per
+    # stream being uploaded.
+    BLOCK_SIZE = 4 * 1024 * 1024
+    # Maximum number of sub-requests the blob batch API accepts.
+    DELETE_BATCH_SIZE = 256
+
+    def __init__(
+        self,
+        account_name: str,
+        account_key: str,
+        container: str,
+        max_concurrency: int = 8,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+    ) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._stats: List[Dict[str, object]] = []
+        self._stats_lock = threading.Lock()
         if BlobServiceClient is None:  # pragma: no cover - offline testing
             self._client = None
             self._container = None
             return
         url = f"https://{account_name}.blob.core.windows.net"
-        self._client = BlobServiceClient(account_url=url, credential=account_key)
+        kwargs = {}
+        transport = _pooled_transport(self.max_concurrency)
+        if transport is not None:  # pragma: no cover - requires azure-core
+            kwargs["transport"] = transport
+        self._client = BlobServiceClient(
+            account_url=url, credential=account_key, **kwargs
+        )
         self._container = self._client.get_container_client(container)
         self.container = container
 
-    def upload_files(self, files: Iterable[Path]) -> None:
+    def upload_files(
+        self,
+        files: Iterable[Path],
+        prefix: str = "",
+        base_dir: Optional[Path] = None,
+    ) -> None:
+        """Upload ``files`` concurrently, ``max_concurrency`` at a time.
+
+        Files larger than ``BLOCK_SIZE`` are staged block by block. Every
+        request is retried with exponential backoff on transient errors.
+        """
         if self._container is None:  # pragma: no cover - offline testing
             return
-        for path in files:
-            with open(path, "rb") as fh:
-                self._container.upload_blob(name=path.name, data=fh, overwrite=True)
+        jobs = [(path, self.blob_name(path, prefix, base_dir)) for path in files]
+        if len(jobs) <= 1 or self.max_concurrency == 1:
+            for path, name in jobs:
+                self._upload_file(path, name)
+            return
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_concurrency, len(jobs)),
+            thread_name_prefix="blob-upload",
+        ) as pool:
+            futures = [pool.submit(self._upload_file, p, n) for p, n in jobs]
+            for future in futures:
+                future.result()
+
+    def get_upload_stats(self) -> List[Dict[str, object]]:
+        """Return timing and throughput for each completed upload."""
+        with self._stats_lock:
+            return list(self._stats)
 
-    def cleanup_temp_blobs(self, prefix: str = "tmp/") -> None:
+    def _upload_file(self, path: Path, name: str) -> None:
+        attempts = [0]
+
+        def call(func: Callable[..., T], *args, **kwargs) -> T:
+            return self._with_retry(attempts, func, *args, **kwargs)
+
+        size = path.stat().st_size
+        start = time.perf_counter()
+        with open(path, "rb") as fh:
+            if size <= self.BLOCK_SIZE:
+                data = fh.read()
+                call(
+                    self._container.upload_blob, name=name, data=data, overwrite=True
+                )
+            else:
+                self._stage_blocks(name, fh, _read_block(fh, self.BLOCK_SIZE), call)
+        elapsed = time.perf_counter() - start
+        with self._stats_lock:
+            self._stats.append(
+                {
+                    "name": name,
+                    "bytes": size,
+                    "seconds": elapsed,
+                    "throughput_mb_s": (
+                        size / (1024 * 1024) / elapsed if elapsed else 0.0
+                    ),
+                    "attempts": attempts[0],
+                }
+            )
+
+    def _with_retry(
+        self, attempts: List[int], func: Callable[..., T], *args, **kwargs
+    ) -> T:
+        delay = self.retry_backoff
+        for attempt in range(self.max_retries + 1):
+            attempts[0] += 1
+            try:
+                return func(*args, **kwargs)
+            except Exception as exc:
+                if attempt == self.max_retries or not _is_transient(exc):
+                    raise
+            # Full jitter keeps concurrent workers from retrying in lockstep.
+            time.sleep(random.uniform(0, delay))
+            delay *= 2
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def upload_stream(
+        self, name: str, reader: BinaryIO, length: Optional[int] = None
+    ) -> None:
+        """Upload ``reader`` as block blob ``name`` one block at a time."""
         if self._container is None:  # pragma: no cover - offline testing
             return
+        attempts = [0]
+
+        def call(func: Callable[..., T], *args, **kwargs) -> T:
+            return self._with_retry(attempts, func, *args, **kwargs)
+
+        chunk = _read_block(reader, self.BLOCK_SIZE)
+        if len(chunk) < self.BLOCK_SIZE:
+            call(self._container.upload_blob, name=name, data=chunk, overwrite=True)
+            return
+        self._stage_blocks(name, reader, chunk, call)
+
+    def _stage_blocks(
+        self, name: str, reader: BinaryIO, chunk: bytes, call: Callable
+    ) -> None:
+        blob = self._container.get_blob_client(name)
+        blocks = []
+        while chunk:
+            # Block ids must have equal length; the SDK base64-encodes them.
+            block_id = f"{len(blocks):08d}"
+            call(blob.stage_block, block_id=block_id, data=chunk)
+            blocks.append(BlobBlock(block_id=block_id))
+            chunk = _read_block(reader, self.BLOCK_SIZE)
+        call(blob.commit_block_list, blocks)
+
+    def cleanup_temp_blobs(self, prefix: str = TEMP_PREFIX) -> None:
+        """Delete blobs starting with ``prefix`` using batch requests."""
+        if self._container is None:  # pragma: no cover - offline testing
+            return
+        names = [b.name for b in self._container.list_blobs(name_starts_with=prefix)]
+        self._delete_blobs(names)
+
+    def delete_blobs(self, names: Iterable[str]) -> None:
+        """Delete the named blobs using batch requests."""
+        if self._container is None:  # pragma: no cover - offline testing
+            return
+        self._delete_blobs(list(names))
+
+    def expire_temp_prefixes(
+        self, max_age_seconds: float, prefix: str = TEMP_PREFIX
+    ) -> List[str]:
+        if self._container is None:  # pragma: no cover - offline testing
+            return []
+        jobs: Dict[str, List[str]] = {}
+        newest: Dict[str, datetime] = {}
         for blob in self._container.list_blobs(name_starts_with=prefix):
-            self._container.delete_blob(blob.name)
+            job = blob.name[len(prefix) :].split("/", 1)[0]
+            jobs.setdefault(job, []).append(blob.name)
+            if job not in newest or blob.last_modified > newest[job]:
+                newest[job] = blob.last_modified
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=max_age_seconds)
+        stale = [job for job in jobs if newest[job] < cutoff]
+        self._delete_blobs([name for job in stale for name in jobs[job]])
+        return [f"{prefix}{job}/" for job in stale]
+
+    def _delete_blobs(self, names: List[str]) -> None:
+        attempts = [0]
+        for start in range(0, len(names), self.DELETE_BATCH_SIZE):
+            batch = names[start : start + self.DELETE_BATCH_SIZE]
+            # Blobs already deleted by another worker are not an error.
+            self._with_retry(
+                attempts,
+                self._container.delete_blobs,
+                *batch,
+                raise_on_any_failure=False,
+            )
+
+
+def _pooled_transport(pool_size: int):  # pragma: no cover - requires azure-core
+    """Return a transport whose connection pool fits ``pool_size`` workers.
+
+    The default transport keeps ten connections per host, so additional
+    upload threads would open and discard connections on every request.
+    """
+    if RequestsTransport is None:
+        return None
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    return RequestsTransport(session=session)
+
+
+def _is_transient(exc: Exception) -> bool:
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    if ServiceRequestError is not None and isinstance(
+        exc, (ServiceRequestError, ServiceResponseError)
+    ):
+        return True
+    if HttpResponseError is not None and isinstance(exc, HttpResponseError):
+        return exc.status_code in RETRY_STATUS
+    return False
+
+
+def _read_block(reader: BinaryIO, size: int) -> bytes:
+    parts = []
+    remaining = size
+    while remaining:
+        data = reader.read(remaining)
+        if not data:
+            break
+        parts.append(data)
+        remaining -= len(data)
+    return b"".join(parts)
@@ -33,6 +33,18 @@ class AppConfig:
     agent_version: str = "1.0.0"
     agent_auth_token: Optional[str] = None
     max_archive_files: int = 1000
+    extraction_workers: int = 1
+    extraction_cache_mb: int = 0
+    parse_cache_memory_mb: int = 64
+    parse_cache_mb: int = 0
+    max_extracted_mb: int = 10240
+    max_member_mb: int = 0
+    max_compression_ratio: float = 0.0
+    max_nested_depth: int = 3
+    decompression_threads: int = 0
+    async_workers: int = 8
+    upload_concurrency: int = 4
+    temp_blob_ttl_seconds: int = 0
 
 
 REQUIRED_VARS: Sequence[str] = ("APP_ENV", "LOG_LEVEL")
@@ -91,6 +103,18 @@ def load_config() -> AppConfig:
         agent_version=os.getenv("AGENT_VERSION", "1.0.0"),
         agent_auth_token=os.getenv("AGENT_AUTH_TOKEN"),
         max_archive_files=int(os.getenv("MAX_ARCHIVE_FILES", "1000")),
+        extraction_workers=int(os.getenv("EXTRACTION_WORKERS", "1")),
+        extraction_cache_mb=int(os.getenv("EXTRACTION_CACHE_MB", "0")),
+        parse_cache_memory_mb=int(os.getenv("PARSE_CACHE_MEMORY_MB", "64")),
+        parse_cache_mb=int(os.getenv("PARSE_CACHE_MB", "0")),
+        max_extracted_mb=int(os.getenv("MAX_EXTRACTED_MB", "10240")),
+        max_member_mb=int(os.getenv("MAX_MEMBER_MB", "0")),
+        max_compression_ratio=float(os.getenv("MAX_COMPRESSION_RATIO", "0")),
+        max_nested_depth=int(os.getenv("MAX_NESTED_DEPTH", "3")),
+        decompression_threads=int(os.getenv("DECOMPRESSION_THREADS", "0")),
+        async_workers=int(os.getenv("ASYNC_WORKERS", "8")),
+        upload_concurrency=int(os.getenv("UPLOAD_CONCURRENCY", "4")),
+        temp_blob_ttl_seconds=int(os.getenv("TEMP_BLOB_TTL_SECONDS", "0")),
     )
 
 
@@ -1,27 +1,233 @@
 from __future__ import annotations
 
+import os
 import shutil
+import sys
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable
+from typing import BinaryIO, Dict, Iterable, List, Optional
 
-from .storage import StorageClient
+from .storage import TEMP_PREFIX, StorageClient
+
+try:
+    import fcntl
+except Exception:  # pragma: no cover - optional dependency
+    fcntl = None
+
+# ioctl(dest_fd, FICLONE, src_fd) shares extents on btrfs, XFS and others.
+FICLONE = 0x40049409
 
 
 class LocalStorageClient(StorageClient):
-    """Store extracted files on the local filesystem."""
+    """Store extracted files on the local filesystem.
+
+    Files are transferred without copying data where the filesystem allows:
+    ``move_files`` renames within a filesystem, and copies try a reflink, then
+    a hardlink (when ``link_files`` is set), then ``copy_file_range`` before
+    falling back to ``shutil.copy2``. Hardlinks share the source inode, so
+    only enable them when sources are not modified afterwards.
+    """
+
+    COPY_CHUNK_SIZE = 64 * 1024 * 1024
+    STREAM_CHUNK_SIZE = 1024 * 1024
+    # Threads used to unlink files during cleanup.
+    DELETE_WORKERS = 8
 
-    def __init__(self, base_path: Path) -> None:
+    def __init__(self, base_path: Path, link_files: bool = False) -> None:
         self.base_path = base_path
         self.base_path.mkdir(parents=True, exist_ok=True)
+        self.link_files = link_files
+        self._transfers: Counter = Counter()
 
-    def upload_files(self, files: Iterable[Path]) -> None:
+    def upload_files(
+        self,
+        files: Iterable[Path],
+        prefix: str = "",
+        base_dir: Optional[Path] = None,
+    ) -> None:
         for path in files:
-            dest = self.base_path / path.name
-            shutil.copy2(path, dest)
+            dest = self._dest(self.blob_name(path, prefix, base_dir))
+            self._transfer(path, dest, move=False)
+
+    def move_files(
+        self,
+        files: Iterable[Path],
+        prefix: str = "",
+        base_dir: Optional[Path] = None,
+    ) -> None:
+        for path in files:
+            # Renaming a directory entry would take its files along before
+            # they are moved themselves; directories are created as needed.
+            if path.is_dir():
+                continue
+            dest = self._dest(self.blob_name(path, prefix, base_dir))
+            self._transfer(path, dest, move=True)
+
+    def upload_stream(
+        self, name: str, reader: BinaryIO, length: Optional[int] = None
+    ) -> None:
+        dest = self._dest(name)
+        partial = dest.with_name(f".{dest.name}.{uuid.uuid4().hex}.part")
+        try:
+            with open(partial, "wb") as fh:
+                shutil.copyfileobj(reader, fh, self.STREAM_CHUNK_SIZE)
+            os.replace(partial, dest)
+        finally:
+            partial.unlink(missing_ok=True)
+
+    def local_root(self) -> Optional[Path]:
+        return self.base_path
+
+    def cleanup_temp_blobs(self, prefix: str = TEMP_PREFIX) -> None:
+        """Delete files whose storage name starts with ``prefix``.
+
+        Files are unlinked in parallel, then emptied directories removed. A
+        prefix ending in ``/`` names a directory, which is removed as well.
+        """
+        if prefix.endswith("/"):
+            root = self._resolve(prefix)
+            self._delete_trees([root] if root.exists() else [])
+            return
+        self._delete_trees(list(self.base_path.glob(f"{prefix}*")))
+
+    def delete_blobs(self, names: Iterable[str]) -> None:
+        """Delete the named files, then directories they leave empty."""
+        paths = [self._resolve(name) for name in names]
+        self._delete_trees(paths)
+        for parent in sorted({p.parent for p in paths}, key=lambda p: -len(p.parts)):
+            _remove_empty_dirs(parent, self.base_path)
+
+    def expire_temp_prefixes(
+        self, max_age_seconds: float, prefix: str = TEMP_PREFIX
+    ) -> List[str]:
+        root = self.base_path / prefix
+        if not root.is_dir():
+            return []
+        cutoff = time.time() - max_age_seconds
+        stale = [
+            job
+            for job in root.iterdir()
+            if job.is_dir() and _newest_mtime(job) < cutoff
+        ]
+        self._delete_trees(stale)
+        return [f"{prefix}{job.name}/" for job in stale]
+
+    def get_transfer_stats(self) -> Dict[str, int]:
+        """Return the number of files transferred by each method."""
+        return dict(self._transfers)
+
+    def _delete_trees(self, paths: List[Path]) -> None:
+        files = []
+        dirs = []
+        for path in paths:
+            if path.is_dir() and not path.is_symlink():
+                dirs.append(path)
+                files.extend(p for p in path.rglob("*") if not p.is_dir())
+            else:
+                files.append(path)
+        if len(files) > 1:
+            with ThreadPoolExecutor(max_workers=self.DELETE_WORKERS) as pool:
+                list(pool.map(_unlink, files))
+        else:
+            for path in files:
+                _unlink(path)
+        for path in dirs:
+            shutil.rmtree(path, ignore_errors=True)
 
-    def cleanup_temp_blobs(self, prefix: str = "tmp/") -> None:
-        for file in self.base_path.glob(f"{prefix}*"):
+    def _resolve(self, name: str) -> Path:
+        path = self.base_path / name
+        if not str(path.resolve()).startswith(str(self.base_path.resolve())):
+            raise ValueError(f"Attempted Path Traversal in blob name {name}")
+        return path
+
+    def _dest(self, name: str) -> Path:
+        dest = self._resolve(name)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        return dest
+
+    def _transfer(self, src: Path, dest: Path, move: bool) -> None:
+        if move:
             try:
-                file.unlink()
-            except Exception:
+                os.replace(src, dest)
+                self._transfers["rename"] += 1
+                return
+            except OSError:
                 pass
+        method = self._copy(src, dest)
+        self._transfers[method] += 1
+        if move:
+            src.unlink()
+
+    def _copy(self, src: Path, dest: Path) -> str:
+        if dest.exists():
+            dest.unlink()
+        if self._reflink(src, dest):
+            shutil.copystat(src, dest)
+            return "reflink"
+        if self.link_files:
+            try:
+                os.link(src, dest)
+                return "hardlink"
+            except OSError:
+                pass
+        if self._copy_file_range(src, dest):
+            shutil.copystat(src, dest)
+            return "copy_file_range"
+        shutil.copy2(src, dest)
+        return "copy"
+
+    @staticmethod
+    def _reflink(src: Path, dest: Path) -> bool:
+        if fcntl is None or not sys.platform.startswith("linux"):
+            return False
+        try:
+            with open(src, "rb") as fin, open(dest, "wb") as fout:
+                fcntl.ioctl(fout.fileno(), FICLONE, fin.fileno())
+            return True
+        except OSError:
+            dest.unlink(missing_ok=True)
+            return False
+
+    def _copy_file_range(self, src: Path, dest: Path) -> bool:
+        if not hasattr(os, "copy_file_range"):
+            return False
+        try:
+            with open(src, "rb") as fin, open(dest, "wb") as fout:
+                while os.copy_file_range(
+                    fin.fileno(), fout.fileno(), self.COPY_CHUNK_SIZE
+                ):
+                    pass
+            return True
+        except OSError:
+            dest.unlink(missing_ok=True)
+            return False
+
+
+def _unlink(path: Path) -> None:
+    try:
+        path.unlink()
+    except Exception:
+        pass
+
+
+def _remove_empty_dirs(path: Path, root: Path) -> None:
+    """Remove ``path`` and its parents below ``root`` while they are empty."""
+    while path != root and root in path.parents:
+        try:
+            path.rmdir()
+        except OSError:
+            return
+        path = path.parent
+
+
+def _newest_mtime(root: Path) -> float:
+    newest = root.stat().st_mtime
+    for path in root.rglob("*"):
+        try:
+            newest = max(newest, path.stat().st_mtime)
+        except OSError:
+            pass
+    return newest
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from typing import Callable, List, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+def partition_by_weight(
+    items: Sequence[T], weight: Callable[[T], int], parts: int
+) -> List[List[T]]:
+    """Greedily balance ``items`` across ``parts`` bins by ``weight``.
+
+    Items are placed heaviest first into the least-loaded bin, so each bin
+    keeps the items' relative weight order rather than their input order.
+    Empty bins are dropped.
+    """
+    bins: List[List[T]] = [[] for _ in range(parts)]
+    loads = [0] * parts
+    for item in sorted(items, key=weight, reverse=True):
+        idx = loads.index(min(loads))
+        bins[idx].append(item)
+        loads[idx] += weight(item)
+    return [b for b in bins if b]
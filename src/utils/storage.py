@@ -1,19 +1,152 @@
 from __future__ import annotations
 
+import threading
+import uuid
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Iterable
+from typing import BinaryIO, Iterable, List, Optional
+
+# Temporary uploads live under TEMP_PREFIX + "<job id>/".
+TEMP_PREFIX = "tmp/"
 
 
 class StorageClient(ABC):
     """Abstract storage interface for uploading and cleanup."""
 
+    _reaper: Optional["TempBlobReaper"] = None
+
+    @abstractmethod
+    def upload_files(
+        self,
+        files: Iterable[Path],
+        prefix: str = "",
+        base_dir: Optional[Path] = None,
+    ) -> None:
+        """Upload iterable of files to the storage backend.
+
+        Files are stored under ``prefix`` + their path relative to
+        ``base_dir``, or + their file name when ``base_dir`` is not given.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def cleanup_temp_blobs(self, prefix: str = TEMP_PREFIX) -> None:
+        """Remove temporary files from the storage backend.
+
+        Pass a job prefix from :meth:`new_job_prefix` to remove only that
+        job's files.
+        """
+        raise NotImplementedError
+
     @abstractmethod
-    def upload_files(self, files: Iterable[Path]) -> None:
-        """Upload iterable of files to the storage backend."""
+    def delete_blobs(self, names: Iterable[str]) -> None:
+        """Delete the named files; names that do not exist are ignored."""
         raise NotImplementedError
 
     @abstractmethod
-    def cleanup_temp_blobs(self, prefix: str = "tmp/") -> None:
-        """Remove temporary files from the storage backend."""
+    def expire_temp_prefixes(
+        self, max_age_seconds: float, prefix: str = TEMP_PREFIX
+    ) -> List[str]:
+        """Remove job prefixes under ``prefix`` not written to for
+        ``max_age_seconds`` and return the removed prefixes."""
+        raise NotImplementedError
+
+    @staticmethod
+    def new_job_prefix(prefix: str = TEMP_PREFIX) -> str:
+        """Return a unique prefix for one job's temporary files."""
+        return f"{prefix}{uuid.uuid4().hex}/"
+
+    def start_temp_reaper(
+        self, max_age_seconds: float, interval_seconds: Optional[float] = None
+    ) -> "TempBlobReaper":
+        """Start expiring stale job prefixes in a background thread.
+
+        The reaper is started once per client; later calls return it.
+        """
+        if self._reaper is None:
+            self._reaper = TempBlobReaper(self, max_age_seconds, interval_seconds)
+            self._reaper.start()
+        return self._reaper
+
+    @abstractmethod
+    def upload_stream(
+        self, name: str, reader: BinaryIO, length: Optional[int] = None
+    ) -> None:
+        """Store ``reader``'s content as ``name`` without a local copy.
+
+        Implementations read ``reader`` in bounded chunks so memory use does
+        not grow with ``length``.
+        """
         raise NotImplementedError
+
+    def move_files(
+        self,
+        files: Iterable[Path],
+        prefix: str = "",
+        base_dir: Optional[Path] = None,
+    ) -> None:
+        """Upload files and remove the local copies; directories are skipped."""
+        files = [path for path in files if not path.is_dir()]
+        self.upload_files(files, prefix, base_dir)
+        for path in files:
+            try:
+                path.unlink()
+            except Exception:
+                pass
+
+    @staticmethod
+    def blob_name(
+        path: Path, prefix: str = "", base_dir: Optional[Path] = None
+    ) -> str:
+        """Return the storage name for ``path`` as used by ``upload_files``."""
+        if base_dir is None:
+            return prefix + path.name
+        return prefix + path.relative_to(base_dir).as_posix()
+
+    def local_root(self) -> Optional[Path]:
+        """Return a directory files can be written into directly, if any."""
+        return None
+
+
+class TempBlobReaper:
+    """Daemon thread calling ``expire_temp_prefixes`` periodically.
+
+    Jobs normally clean up their own prefix; the reaper catches prefixes
+    left behind by crashed or killed workers.
+    """
+
+    def __init__(
+        self,
+        client: StorageClient,
+        max_age_seconds: float,
+        interval_seconds: Optional[float] = None,
+    ) -> None:
+        self.client = client
+        self.max_age_seconds = max_age_seconds
+        self.interval_seconds = interval_seconds or max(max_age_seconds / 4, 1.0)
+        self.expired: List[str] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="temp-blob-reaper", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def run_once(self) -> List[str]:
+        """Expire stale prefixes now and return them."""
+        expired = self.client.expire_temp_prefixes(self.max_age_seconds)
+        self.expired.extend(expired)
+        return expired
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.run_once()
+            except Exception:
+                # Storage may be briefly unavailable; retry next interval.
+                pass
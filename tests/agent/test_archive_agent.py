@@ -17,3 +17,30 @@ def test_context_tracking():
     agent.process_request(str(DATA_DIR / "mock_word.docx"), "summarize")
     agent.process_request(str(DATA_DIR / "mock_excel.xlsx"), "extract")
     assert len(agent.context) == 2
+
+
+def test_process_request_async():
+    import asyncio
+
+    agent = ArchiveAgent()
+    result = asyncio.run(
+        agent.process_request_async(str(DATA_DIR / "mock_word.docx"), "extract text")
+    )
+    assert "paragraphs" in result["content"]
+    assert len(agent.context) == 1
+
+
+def test_synapse_strategy_from_content_or_file_name(tmp_path):
+    import zipfile
+
+    agent = ArchiveAgent()
+    plain = tmp_path / "upload.zip"
+    with zipfile.ZipFile(plain, "w") as z:
+        z.writestr("pipeline/etl.json", "{}")
+    assert agent.determine_processing_strategy(plain, {})["type"] == "synapse"
+    named = DATA_DIR / "mock_synapse.zip"
+    assert agent.determine_processing_strategy(named, {})["type"] == "synapse"
+    other = tmp_path / "other.zip"
+    with zipfile.ZipFile(other, "w") as z:
+        z.writestr("README.md", "x")
+    assert agent.determine_processing_strategy(other, {})["type"] == "zip"
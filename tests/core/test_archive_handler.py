@@ -36,3 +36,78 @@ def test_detect_type_unknown(tmp_path):
     unknown = tmp_path / "file.xyz"
     unknown.write_text("data")
     assert handler.detect_archive_type(unknown) is None
+
+
+def test_iter_members_zip_without_disk(tmp_path):
+    handler = ArchiveHandler()
+    members = {
+        m.name: m.read() for m in handler.iter_members(DATA_DIR / "mock_archive.zip")
+    }
+    assert members == {"file.txt": b"hello"}
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_iter_members_tar_stream_mode():
+    handler = ArchiveHandler()
+    members = [
+        (m.name, m.read())
+        for m in handler.iter_members(DATA_DIR / "mock_source.tar.gz", stream=True)
+        if not m.is_dir
+    ]
+    assert members == [("src/main.py", b"print()")]
+
+
+def test_iter_members_7z(tmp_path):
+    import py7zr
+
+    archive = tmp_path / "data.7z"
+    with py7zr.SevenZipFile(archive, "w") as z:
+        z.writestr("one", "a/1.txt")
+        z.writestr("two", "b/2.txt")
+    handler = ArchiveHandler()
+    members = {m.name: m.read() for m in handler.iter_members(archive) if not m.is_dir}
+    assert members == {"a/1.txt": b"one", "b/2.txt": b"two"}
+
+
+def test_iter_members_feeds_parser(tmp_path):
+    import zipfile
+    from src.core.powerbi_parser import PowerBIParser
+
+    archive = tmp_path / "reports.zip"
+    with zipfile.ZipFile(archive, "w") as z:
+        z.write(DATA_DIR / "mock_powerbi.pbix", arcname="report.pbix")
+    handler = ArchiveHandler()
+    for member in handler.iter_members(archive):
+        with member.open() as fh:
+            result = PowerBIParser().parse_pbix(fh)
+    assert result["dax_measures"] == []
+
+
+def test_parallel_zip_extraction(tmp_path):
+    import zipfile
+
+    archive = tmp_path / "parallel.zip"
+    with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        for i in range(6):
+            z.writestr(f"dir/file_{i}.txt", f"{i}" * (1000 * (i + 1)))
+    handler = ArchiveHandler()
+    files = handler.extract_archive(archive, tmp_path / "out", workers=3)
+    assert [f.name for f in files] == [f"file_{i}.txt" for i in range(6)]
+    assert (tmp_path / "out" / "dir" / "file_5.txt").read_text() == "5" * 6000
+    stats = handler.get_extraction_stats()
+    assert len(stats) == 3
+    assert sum(s["files"] for s in stats) == 6
+    assert all("throughput_mb_s" in s for s in stats)
+
+
+def test_partition_by_weight_balances_load():
+    from src.core.archive_handler import ArchiveMember
+    from src.utils.partition import partition_by_weight
+
+    members = [
+        ArchiveMember(name=str(size), size=size, compressed_size=size)
+        for size in (10, 8, 6, 4, 2)
+    ]
+    parts = partition_by_weight(members, lambda m: m.compressed_size, 2)
+    loads = sorted(sum(m.size for m in part) for part in parts)
+    assert loads == [14, 16]
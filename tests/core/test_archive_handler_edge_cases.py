@@ -1,7 +1,8 @@
+import io
 import zipfile
 import tarfile
 from pathlib import Path
-from src.core.archive_handler import ArchiveHandler
+from src.core.archive_handler import ArchiveHandler, MemberFilter
 
 
 def test_extract_empty_zip(tmp_path):
@@ -33,3 +34,101 @@ def test_list_nested_archive(tmp_path):
     handler = ArchiveHandler()
     contents = handler.list_contents(outer_zip)
     assert "inner.zip" in contents
+
+
+def test_extract_with_member_filter(tmp_path):
+    archive = tmp_path / "mixed.zip"
+    with zipfile.ZipFile(archive, "w") as z:
+        z.writestr("sql/a.sql", "select 1")
+        z.writestr("sql/big.sql", "x" * 100)
+        z.writestr("docs/readme.md", "hi")
+    handler = ArchiveHandler()
+    extracted = handler.extract_archive(
+        archive,
+        tmp_path / "out",
+        member_filter=MemberFilter(include=["*.sql"], max_size=50),
+    )
+    assert [p.name for p in extracted] == ["a.sql"]
+    assert not (tmp_path / "out" / "docs").exists()
+
+
+def test_extract_tar_with_limit_and_predicate(tmp_path):
+    archive = tmp_path / "data.tar"
+    with tarfile.open(archive, "w") as t:
+        for name in ("a.txt", "b.log", "c.txt", "d.txt"):
+            info = tarfile.TarInfo(name)
+            info.size = 1
+            t.addfile(info, io.BytesIO(b"x"))
+    handler = ArchiveHandler()
+    member_filter = MemberFilter(
+        exclude=["c.*"], predicate=lambda m: m.name.endswith(".txt"), limit=2
+    )
+    extracted = handler.extract_archive(
+        archive, tmp_path / "out", member_filter=member_filter
+    )
+    assert [p.name for p in extracted] == ["a.txt", "d.txt"]
+
+
+def test_extract_7z_with_member_filter(tmp_path):
+    import py7zr
+
+    archive = tmp_path / "data.7z"
+    with py7zr.SevenZipFile(archive, "w") as z:
+        z.writestr("one", "a/1.sql")
+        z.writestr("two", "b/2.txt")
+    out = tmp_path / "out"
+    out.mkdir()
+    (out / "unrelated.sql").write_text("keep")
+    handler = ArchiveHandler()
+    extracted = handler.extract_archive(
+        archive, out, member_filter=MemberFilter(include=["*.sql"])
+    )
+    assert extracted == [out / "a" / "1.sql"]
+    assert (out / "a" / "1.sql").read_text() == "one"
+    assert not (out / "b").exists()
+
+
+def test_list_contents_with_member_filter(tmp_path):
+    archive = tmp_path / "list.zip"
+    with zipfile.ZipFile(archive, "w") as z:
+        z.writestr("a.sql", "1")
+        z.writestr("b.txt", "2")
+    handler = ArchiveHandler()
+    assert handler.list_contents(archive, MemberFilter(include=["*.sql"])) == ["a.sql"]
+
+
+def test_extract_7z_ignores_prepopulated_target(tmp_path):
+    import py7zr
+
+    archive = tmp_path / "full.7z"
+    with py7zr.SevenZipFile(archive, "w") as z:
+        z.writestr("one", "a/1.txt")
+        z.writestr("two", "2.txt")
+    out = tmp_path / "out"
+    out.mkdir()
+    (out / "stale.txt").write_text("old")
+    handler = ArchiveHandler()
+    extracted = handler.extract_archive(archive, out)
+    assert extracted == [out / "a" / "1.txt", out / "2.txt"]
+
+
+def test_iter_members_7z_decodes_solid_block_once(tmp_path, monkeypatch):
+    import py7zr
+    from src.core import archive_handler
+
+    archive = tmp_path / "solid.7z"
+    with py7zr.SevenZipFile(archive, "w") as z:
+        for i in range(4):
+            z.writestr(str(i) * 10, f"f{i}.txt")
+    calls = []
+    original = archive_handler._read_7z
+
+    def counting(z, targets):
+        calls.append(list(targets))
+        return original(z, targets)
+
+    monkeypatch.setattr(archive_handler, "_read_7z", counting)
+    handler = ArchiveHandler()
+    data = {m.name: m.read() for m in handler.iter_members(archive)}
+    assert data["f3.txt"] == b"3" * 10
+    assert len(calls) == 1
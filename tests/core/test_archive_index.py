@@ -0,0 +1,60 @@
+import zipfile
+from pathlib import Path
+
+from src.core.archive_handler import ArchiveHandler, ArchiveMember, MemberFilter
+from src.core.archive_index import ArchiveIndex, ArchiveIndexCache
+
+DATA_DIR = Path(__file__).resolve().parents[2] / "mock_data"
+
+
+def test_index_from_zip_central_directory(tmp_path):
+    archive = tmp_path / "meta.zip"
+    with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        z.writestr("dir/", "")
+        z.writestr("dir/a.txt", "a" * 100)
+    index = ArchiveHandler().list_index(archive)
+    assert len(index) == 2
+    assert index.files() == ["dir/a.txt"]
+    record = index.record(1)
+    assert record["size"] == 100
+    assert record["compressed_size"] < 100
+    assert record["crc"] == zipfile.ZipFile(archive).getinfo("dir/a.txt").CRC
+    assert record["type"] == "file"
+    assert index.record(0)["type"] == "dir"
+
+
+def test_index_from_tar_headers():
+    index = ArchiveHandler().list_index(DATA_DIR / "mock_source.tar.gz")
+    record = index.record(0)
+    assert record["name"] == "src/main.py"
+    assert record["compressed_size"] is None
+    assert record["modified"] is not None
+
+
+def test_index_is_cached_per_digest(tmp_path, monkeypatch):
+    archive = tmp_path / "cached.zip"
+    with zipfile.ZipFile(archive, "w") as z:
+        z.writestr("a.txt", "1")
+    handler = ArchiveHandler()
+    first = handler.list_index(archive)
+    monkeypatch.setattr(ArchiveHandler, "iter_members", lambda *a, **k: iter(()))
+    assert handler.list_index(archive) is first
+
+
+def test_index_filter_and_cache_eviction():
+    members = [ArchiveMember(name=f"{i}.sql", size=i) for i in range(5)]
+    index = ArchiveIndex.from_members(members)
+    assert index.total_size == 10
+
+    cache = ArchiveIndexCache(max_entries=1)
+    cache.put("a", index)
+    cache.put("b", ArchiveIndex())
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+
+    filtered = ArchiveIndex.from_members(
+        MemberFilter(min_size=3).select(
+            ArchiveMember(**index.member_fields(i)) for i in range(len(index))
+        )
+    )
+    assert filtered.files() == ["3.sql", "4.sql"]
@@ -0,0 +1,62 @@
+import asyncio
+import threading
+import time
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from src.core.archive_handler import ArchiveHandler, MemberFilter
+from src.utils.async_executor import run_blocking
+
+DATA_DIR = Path(__file__).resolve().parents[2] / "mock_data"
+
+
+def test_extract_archive_async(tmp_path):
+    handler = ArchiveHandler()
+    files = asyncio.run(
+        handler.extract_archive_async(DATA_DIR / "mock_archive.zip", tmp_path)
+    )
+    assert [f.name for f in files] == ["file.txt"]
+
+
+def test_iter_members_async_reads_without_blocking():
+    handler = ArchiveHandler()
+
+    async def collect():
+        contents = {}
+        async for member in handler.iter_members_async(DATA_DIR / "mock_archive.zip"):
+            contents[member.name] = await run_blocking(handler.executor, member.read)
+        return contents
+
+    assert asyncio.run(collect()) == {"file.txt": b"hello"}
+
+
+def test_cancel_removes_partial_output(tmp_path):
+    archive = tmp_path / "many.zip"
+    with zipfile.ZipFile(archive, "w") as z:
+        for i in range(20):
+            z.writestr(f"f{i}.txt", "x")
+    out = tmp_path / "out"
+    started = threading.Event()
+
+    def slow(member):
+        started.set()
+        time.sleep(0.05)
+        return True
+
+    async def run():
+        handler = ArchiveHandler()
+        task = asyncio.create_task(
+            handler.extract_archive_async(
+                archive, out, member_filter=MemberFilter(predicate=slow)
+            )
+        )
+        await asyncio.to_thread(started.wait)
+        await asyncio.sleep(0.1)
+        task.cancel()
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(run())
+    assert not any(p.is_file() for p in out.rglob("*"))
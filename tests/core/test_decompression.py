@@ -0,0 +1,108 @@
+import bz2
+import io
+import lzma
+import tarfile
+import zipfile
+
+import pytest
+
+from src.core.archive_handler import ArchiveHandler
+from src.core.decompression import ParallelDecompressor
+from src.utils.config import AppConfig
+
+zstandard = pytest.importorskip("zstandard")
+
+
+def _tar_bytes(count=6, size=20000):
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w") as t:
+        for i in range(count):
+            info = tarfile.TarInfo(f"dir/file_{i}.txt")
+            info.size = size
+            t.addfile(info, io.BytesIO(str(i).encode() * size))
+    return buf.getvalue()
+
+
+def _chunks(data, parts):
+    step = len(data) // parts + 1
+    return [data[i : i + step] for i in range(0, len(data), step)]
+
+
+@pytest.fixture
+def handler():
+    return ArchiveHandler(config=AppConfig(decompression_threads=4))
+
+
+def test_multi_stream_tar_xz_decodes_in_parallel(tmp_path, handler):
+    archive = tmp_path / "data.tar.xz"
+    archive.write_bytes(b"".join(lzma.compress(c) for c in _chunks(_tar_bytes(), 4)))
+    files = handler.extract_archive(archive, tmp_path / "out")
+    assert [f.name for f in files] == [f"file_{i}.txt" for i in range(6)]
+    assert (tmp_path / "out" / "dir" / "file_3.txt").read_bytes() == b"3" * 20000
+    stats = handler.get_decompression_stats()[-1]
+    assert stats["codec"] == "xz"
+    assert stats["backend"] == "parallel"
+    assert stats["units"] == 4
+    assert stats["bytes"] > 0 and "throughput_mb_s" in stats
+
+
+def test_multi_frame_tar_zst(tmp_path, handler):
+    cctx = zstandard.ZstdCompressor()
+    archive = tmp_path / "data.tar.zst"
+    archive.write_bytes(b"".join(cctx.compress(c) for c in _chunks(_tar_bytes(), 3)))
+    assert handler.detect_archive_type(archive) == "tar"
+    assert "dir/file_5.txt" in handler.list_contents(archive)
+    assert handler.read_member(archive, "dir/file_1.txt") == b"1" * 20000
+    assert handler.get_decompression_stats()[-1]["backend"] == "parallel"
+
+
+def test_read_ahead_is_bounded_by_bytes(tmp_path, handler, monkeypatch):
+    from src.core import decompression
+
+    data = _tar_bytes()
+    chunks = _chunks(data, 6)
+    limit = 2 * len(chunks[0])
+    monkeypatch.setattr(ParallelDecompressor, "MAX_INFLIGHT_BYTES", limit)
+    peaks = []
+    fill = decompression._ParallelReader._fill
+
+    def recording_fill(self):
+        fill(self)
+        peaks.append(self._in_flight)
+
+    monkeypatch.setattr(decompression._ParallelReader, "_fill", recording_fill)
+    archive = tmp_path / "data.tar.xz"
+    archive.write_bytes(b"".join(lzma.compress(c) for c in chunks))
+    with handler._decompressor.open(archive) as fh:
+        assert fh.read() == data
+    assert max(peaks) <= limit
+
+
+def test_single_frame_falls_back_to_stream(tmp_path):
+    archive = tmp_path / "data.tar.zst"
+    archive.write_bytes(zstandard.ZstdCompressor().compress(_tar_bytes()))
+    decompressor = ParallelDecompressor(threads=4)
+    with decompressor.open(archive) as fh:
+        assert fh.read() == _tar_bytes()
+    assert decompressor.get_stats()[0]["backend"] == "serial"
+
+
+def test_tar_bz2_and_member_limit(tmp_path, handler):
+    archive = tmp_path / "data.tar.bz2"
+    archive.write_bytes(bz2.compress(_tar_bytes(count=2)))
+    assert handler.detect_archive_type(archive) == "tar"
+    assert len(handler.extract_archive(archive, tmp_path / "bz")) == 2
+
+    xz = tmp_path / "many.tar.xz"
+    xz.write_bytes(lzma.compress(_tar_bytes(count=5, size=10)))
+    with pytest.raises(ValueError):
+        handler.extract_archive(xz, tmp_path / "out", max_members=3)
+    assert not any(p.is_file() for p in (tmp_path / "out").rglob("*"))
+
+
+def test_nested_tar_zst_streams_from_parent(tmp_path, handler):
+    archive = tmp_path / "outer.zip"
+    with zipfile.ZipFile(archive, "w") as z:
+        z.writestr("inner.tar.zst", zstandard.ZstdCompressor().compress(_tar_bytes(2)))
+    paths = handler.open_nested(archive).list_paths()
+    assert paths == ["inner.tar.zst/dir/file_0.txt", "inner.tar.zst/dir/file_1.txt"]
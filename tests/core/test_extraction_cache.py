@@ -0,0 +1,148 @@
+import os
+import zipfile
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from src.core.archive_handler import ArchiveHandler, MemberFilter
+from src.core.extraction_cache import ExtractionCache
+from src.core.extraction_guard import ExtractionBudget, ExtractionLimitExceeded
+from src.utils.config import load_config
+
+
+def _make_zip(path: Path, files) -> Path:
+    with zipfile.ZipFile(path, "w") as z:
+        for name, content in files.items():
+            z.writestr(name, content)
+    return path
+
+
+def _extract_into(archive: Path):
+    def extract(dest: Path):
+        with zipfile.ZipFile(archive) as z:
+            z.extractall(dest)
+            return [dest / n for n in z.namelist()]
+
+    return extract
+
+
+def test_digest_uses_fast_key(tmp_path):
+    cache = ExtractionCache(tmp_path / "cache", max_bytes=1024)
+    archive = _make_zip(tmp_path / "a.zip", {"a.txt": "data"})
+    first = cache.digest(archive)
+    assert cache.digest(archive) == first
+    assert cache.get_stats()["full_hashes"] == 1
+
+
+def test_get_or_populate_hits_after_miss(tmp_path):
+    cache = ExtractionCache(tmp_path / "cache", max_bytes=1024 * 1024)
+    archive = _make_zip(tmp_path / "a.zip", {"dir/a.txt": "data", "b.txt": "x"})
+    tree = cache.get_or_populate(archive, _extract_into(archive))
+    assert [p.read_text() for p in tree.paths] == ["data", "x"]
+
+    again = cache.get_or_populate(archive, lambda dest: [])
+    assert again.paths == tree.paths
+    assert cache.get_stats()["hits"] == 1
+    assert cache.get_stats()["misses"] == 1
+
+
+def test_lru_eviction_respects_leases(tmp_path):
+    cache = ExtractionCache(tmp_path / "cache", max_bytes=15)
+    one = _make_zip(tmp_path / "one.zip", {"a.txt": "x" * 10})
+    two = _make_zip(tmp_path / "two.zip", {"b.txt": "y" * 10})
+    three = _make_zip(tmp_path / "three.zip", {"c.txt": "z" * 10})
+
+    first = cache.get_or_populate(one, _extract_into(one))
+    with cache.lease(first.digest):
+        cache.get_or_populate(two, _extract_into(two))
+        assert cache.lookup(first.digest) is not None
+    cache.get_or_populate(three, _extract_into(three))
+    assert cache.lookup(first.digest) is None
+    assert cache.get_stats()["evictions"] == 2
+
+
+def test_handler_reuses_cached_tree(tmp_path):
+    config = replace(
+        load_config(), extraction_cache_mb=1, temp_storage_path=str(tmp_path / "tmp")
+    )
+    archive = _make_zip(tmp_path / "data.zip", {"a.sql": "1", "b.txt": "2"})
+    handler = ArchiveHandler(config=config)
+
+    first = handler.extract_archive(archive)
+    second = handler.extract_archive(
+        archive, member_filter=MemberFilter(include=["*.sql"])
+    )
+    assert [p.name for p in first] == ["a.sql", "b.txt"]
+    assert [p.read_text() for p in second] == ["1"]
+    assert handler.extraction_cache.get_stats()["misses"] == 1
+
+    with handler.temp_extract(archive) as files:
+        assert [p.name for p in files] == ["a.sql", "b.txt"]
+        assert handler.extraction_cache.root in files[0].parents
+    assert first[0].exists()
+
+
+def test_returned_files_survive_eviction(tmp_path):
+    config = replace(
+        load_config(), extraction_cache_mb=1, temp_storage_path=str(tmp_path / "tmp")
+    )
+    archive = _make_zip(tmp_path / "data.zip", {"a.txt": "kept"})
+    handler = ArchiveHandler(config=config)
+    files = handler.extract_archive(archive)
+    cache = handler.extraction_cache
+    assert cache.root not in files[0].parents
+
+    cache.max_bytes = 0
+    assert cache.evict() == 1
+    assert files[0].read_text() == "kept"
+    assert not list((cache.root / ".keys").iterdir())
+
+
+def test_open_removes_abandoned_scratch(tmp_path):
+    root = tmp_path / "cache"
+    ExtractionCache(root, max_bytes=1024)
+    trash = root / ".trash-old"
+    stale = root / ".tmp-old"
+    live = root / ".tmp-live"
+    for path in (trash, stale, live):
+        (path / "files").mkdir(parents=True)
+    os.utime(stale, (0, 0))
+    ExtractionCache(root, max_bytes=1024)
+    assert not trash.exists() and not stale.exists()
+    assert live.exists()
+
+
+def test_handler_bypasses_cache_for_explicit_budget(tmp_path):
+    config = replace(
+        load_config(), extraction_cache_mb=1, temp_storage_path=str(tmp_path / "tmp")
+    )
+    archive = _make_zip(tmp_path / "data.zip", {"a.txt": "x" * 1000})
+    handler = ArchiveHandler(config=config)
+    handler.extract_archive(archive)
+    with pytest.raises(ExtractionLimitExceeded):
+        handler.extract_archive(
+            archive, budget=ExtractionBudget(max_member_bytes=10)
+        )
+    assert handler.extraction_cache.get_stats()["hits"] == 0
+
+
+def test_cached_filter_sees_header_metadata(tmp_path):
+    config = replace(
+        load_config(), extraction_cache_mb=1, temp_storage_path=str(tmp_path / "tmp")
+    )
+    archive = _make_zip(tmp_path / "data.zip", {"a.sql": "1", "b.txt": "2"})
+    handler = ArchiveHandler(config=config)
+    crc = zipfile.ZipFile(archive).getinfo("b.txt").CRC
+    member_filter = MemberFilter(
+        predicate=lambda m: m.crc == crc and m.compressed_size is not None
+    )
+
+    uncached = handler.extract_archive(archive, member_filter=member_filter)
+    assert [p.name for p in uncached] == ["b.txt"]
+    assert handler.extraction_cache.get_stats()["misses"] == 0
+
+    handler.extract_archive(archive)
+    cached = handler.extract_archive(archive, member_filter=member_filter)
+    assert [p.name for p in cached] == ["b.txt"]
+    assert handler.extraction_cache.get_stats()["hits"] == 1
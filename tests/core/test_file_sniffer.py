@@ -0,0 +1,81 @@
+import io
+import lzma
+import tarfile
+import zipfile
+from pathlib import Path
+
+from src.agent.archive_agent import ArchiveAgent
+from src.core import file_sniffer
+from src.core.archive_handler import ArchiveHandler
+from src.core.file_sniffer import sniff_file
+
+DATA_DIR = Path(__file__).resolve().parents[2] / "mock_data"
+
+
+def test_sniff_mock_packages():
+    assert sniff_file(DATA_DIR / "mock_word.docx") == "docx"
+    assert sniff_file(DATA_DIR / "mock_excel.xlsx") == "xlsx"
+    assert sniff_file(DATA_DIR / "mock_powerpoint.pptx") == "pptx"
+    assert sniff_file(DATA_DIR / "mock_powerbi.pbix") == "pbix"
+    assert sniff_file(DATA_DIR / "mock_tableau.twbx") == "twbx"
+    assert sniff_file(DATA_DIR / "mock_archive.zip") == "zip"
+    assert sniff_file(DATA_DIR / "mock_source.tar.gz") == "tar"
+
+
+def test_sniff_ignores_extension(tmp_path):
+    pbix = tmp_path / "report.zip"
+    with zipfile.ZipFile(pbix, "w") as z:
+        z.writestr("Report/Layout", "{}")
+    synapse = tmp_path / "upload"
+    with zipfile.ZipFile(synapse, "w") as z:
+        z.writestr("pipeline/load.json", "{}")
+    assert sniff_file(pbix) == "pbix"
+    assert sniff_file(synapse) == "synapse"
+    assert ArchiveHandler().detect_archive_type(synapse) == "zip"
+
+
+def test_sniff_compressed_streams(tmp_path):
+    tar_bytes = io.BytesIO()
+    with tarfile.open(fileobj=tar_bytes, mode="w") as t:
+        info = tarfile.TarInfo("a.txt")
+        info.size = 1
+        t.addfile(info, io.BytesIO(b"a"))
+    tar_xz = tmp_path / "data.bin"
+    tar_xz.write_bytes(lzma.compress(tar_bytes.getvalue()))
+    plain_xz = tmp_path / "notes.xz"
+    plain_xz.write_bytes(lzma.compress(b"hello" * 200))
+    zst = tmp_path / "data.zst"
+    zst.write_bytes(b"\x28\xb5\x2f\xfd" + b"\0" * 16)
+    assert sniff_file(tar_xz) == "tar"
+    assert sniff_file(plain_xz) == "xz"
+    assert sniff_file(zst) == "zstd"
+
+
+def test_sniff_memoized_until_file_changes(tmp_path, monkeypatch):
+    path = tmp_path / "a.zip"
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr("a.txt", "a")
+    file_sniffer.clear_cache()
+    assert sniff_file(path) == "zip"
+    calls = []
+    original = file_sniffer._central_directory_names
+    monkeypatch.setattr(
+        file_sniffer,
+        "_central_directory_names",
+        lambda *a: calls.append(a) or original(*a),
+    )
+    assert sniff_file(path) == "zip"
+    assert calls == []
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr("word/document.xml", "<w/>")
+        z.writestr("[Content_Types].xml", "<Types/>")
+        z.writestr("padding.txt", "x" * 100)
+    assert sniff_file(path) == "docx"
+    assert len(calls) == 1
+
+
+def test_agent_strategy_uses_content(tmp_path):
+    renamed = tmp_path / "dashboard.zip"
+    renamed.write_bytes((DATA_DIR / "mock_powerbi.pbix").read_bytes())
+    agent = ArchiveAgent()
+    assert agent.determine_processing_strategy(renamed, {})["type"] == "powerbi"
@@ -0,0 +1,106 @@
+import io
+import os
+import tarfile
+from dataclasses import replace
+
+import pytest
+
+from src.core import gzip_index
+from src.core.archive_handler import ArchiveHandler
+from src.core.extraction_cache import ExtractionCache
+from src.core.gzip_index import GzipTarIndex
+from src.utils.config import load_config
+
+
+def _make_tgz(path, count=20, size=200_000):
+    with tarfile.open(path, "w:gz") as t:
+        for i in range(count):
+            data = os.urandom(size // 2) + bytes([i]) * (size // 2)
+            info = tarfile.TarInfo(f"dir/member_{i}.bin")
+            info.size = len(data)
+            t.addfile(info, io.BytesIO(data))
+    with tarfile.open(path) as t:
+        return {m.name: t.extractfile(m).read() for m in t.getmembers()}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_index_state():
+    GzipTarIndex.clear_loaded()
+    yield
+    GzipTarIndex.clear_loaded()
+
+
+@pytest.mark.parametrize("use_indexed_gzip", [False, True])
+def test_random_access_matches_tarfile(tmp_path, monkeypatch, use_indexed_gzip):
+    if use_indexed_gzip and gzip_index.indexed_gzip is None:
+        pytest.skip("indexed_gzip not installed")
+    if not use_indexed_gzip:
+        monkeypatch.setattr(gzip_index, "indexed_gzip", None)
+    archive = tmp_path / "data.tgz"
+    expected = _make_tgz(archive)
+
+    index = GzipTarIndex.load_or_build(
+        archive, tmp_path / "idx", key="data", spacing=256 * 1024
+    )
+    assert index.names() == list(expected)
+    for name in ("dir/member_17.bin", "dir/member_3.bin"):
+        with index.open_member(name) as fh:
+            assert fh.read() == expected[name]
+
+
+def test_fallback_records_checkpoints(tmp_path, monkeypatch):
+    monkeypatch.setattr(gzip_index, "indexed_gzip", None)
+    archive = tmp_path / "data.tgz"
+    _make_tgz(archive)
+    index = GzipTarIndex.build(archive, spacing=256 * 1024)
+    assert len(index._checkpoints) > 5
+
+
+def test_offsets_persist_across_processes(tmp_path, monkeypatch):
+    archive = tmp_path / "data.tgz"
+    expected = _make_tgz(archive, count=3, size=1000)
+    GzipTarIndex.load_or_build(archive, tmp_path / "idx", key="k")
+    GzipTarIndex.clear_loaded()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("index should be loaded from disk")
+
+    monkeypatch.setattr(GzipTarIndex, "build", fail)
+    index = GzipTarIndex.load_or_build(archive, tmp_path / "idx", key="k")
+    assert index.names() == list(expected)
+
+
+def test_handler_reads_single_tgz_member(tmp_path):
+    archive = tmp_path / "dump.tar.gz"
+    expected = _make_tgz(archive, count=5, size=5000)
+    config = replace(
+        load_config(), extraction_cache_mb=1, temp_storage_path=str(tmp_path / "tmp")
+    )
+    handler = ArchiveHandler(config=config)
+    assert handler.list_contents(archive) == list(expected)
+    name = "dir/member_4.bin"
+    assert handler.read_member(archive, name) == expected[name]
+    assert list(handler.extraction_cache.index_dir.glob("*.json"))
+
+
+def test_handler_without_cache_keeps_index_in_memory(tmp_path):
+    archive = tmp_path / "dump.tar.gz"
+    expected = _make_tgz(archive, count=2, size=100)
+    config = replace(load_config(), temp_storage_path=str(tmp_path / "tmp"))
+    handler = ArchiveHandler(config=config)
+    assert handler.read_member(archive, "dir/member_1.bin") == expected[
+        "dir/member_1.bin"
+    ]
+    assert not (tmp_path / "tmp").exists()
+
+
+def test_persisted_indexes_are_evicted_with_cache(tmp_path):
+    cache = ExtractionCache(tmp_path / "cache", max_bytes=1)
+    for i in range(2):
+        archive = tmp_path / f"dump{i}.tar.gz"
+        _make_tgz(archive, count=2, size=100)
+        GzipTarIndex.load_or_build(
+            archive, cache.index_dir, key=str(i), on_persist=cache.evict
+        )
+    assert not list(cache.index_dir.iterdir())
+    assert cache.get_stats()["evictions"] == 2
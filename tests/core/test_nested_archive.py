@@ -0,0 +1,111 @@
+import io
+import tarfile
+import zipfile
+
+from dataclasses import replace
+
+import pytest
+
+from src.agent.archive_agent import ArchiveAgent
+from src.core.archive_handler import ArchiveHandler
+from src.core.extraction_guard import ExtractionLimitExceeded
+from src.core.nested_archive import NestedBudget
+from src.utils.config import load_config
+
+
+def _tgz_bytes(files):
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as t:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            t.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+def _zip_bytes(files):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        for name, data in files.items():
+            z.writestr(name, data)
+    return buf.getvalue()
+
+
+@pytest.fixture
+def nested_zip(tmp_path):
+    inner_zip = _zip_bytes({"deep.txt": b"deep"})
+    tgz = _tgz_bytes({"report.xlsx": b"sheet", "inner.zip": inner_zip})
+    archive = tmp_path / "outer.zip"
+    with zipfile.ZipFile(archive, "w") as z:
+        z.writestr("readme.txt", "top")
+        z.writestr("data/bundle.tgz", tgz)
+    return archive
+
+
+def test_walk_expands_inner_archives(nested_zip):
+    nested = ArchiveHandler().open_nested(nested_zip)
+    assert nested.list_paths() == [
+        "readme.txt",
+        "data/bundle.tgz/report.xlsx",
+        "data/bundle.tgz/inner.zip/deep.txt",
+    ]
+    archives = [m.path for m in nested.walk() if m.is_archive]
+    assert archives == ["data/bundle.tgz", "data/bundle.tgz/inner.zip"]
+
+
+def test_open_reads_nested_member(nested_zip):
+    nested = ArchiveHandler().open_nested(nested_zip)
+    with nested.open("data/bundle.tgz/inner.zip/deep.txt") as fh:
+        assert fh.read() == b"deep"
+    with pytest.raises(KeyError):
+        with nested.open("data/bundle.tgz/missing.txt"):
+            pass
+
+
+def test_depth_budget_stops_expansion(nested_zip):
+    handler = ArchiveHandler()
+    nested = handler.open_nested(nested_zip, NestedBudget(max_depth=1))
+    assert nested.list_paths() == [
+        "readme.txt",
+        "data/bundle.tgz/report.xlsx",
+        "data/bundle.tgz/inner.zip",
+    ]
+
+
+def test_member_and_byte_budgets(nested_zip):
+    handler = ArchiveHandler()
+    with pytest.raises(ExtractionLimitExceeded):
+        handler.open_nested(nested_zip, NestedBudget(max_members=3)).list_paths()
+    with pytest.raises(ExtractionLimitExceeded):
+        handler.open_nested(nested_zip, NestedBudget(max_total_bytes=100)).list_paths()
+
+
+def test_agent_lists_nested_files(nested_zip):
+    agent = ArchiveAgent()
+    result = agent.route_to_appropriate_parser(nested_zip, "zip", {})
+    assert "data/bundle.tgz/report.xlsx" in result["nested_files"]
+
+
+def test_listing_does_not_spend_byte_budget_on_leaves(tmp_path):
+    archive = tmp_path / "big.zip"
+    with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        z.writestr("big.bin", b"\0" * 100_000)
+    nested = ArchiveHandler().open_nested(archive, NestedBudget(max_total_bytes=100))
+    assert nested.list_paths() == ["big.bin"]
+
+
+def test_agent_reports_truncated_nested_listing(tmp_path):
+    inner = _zip_bytes({f"inner{i}.txt": b"x" for i in range(15)})
+    archive = tmp_path / "outer.zip"
+    with zipfile.ZipFile(archive, "w") as z:
+        for i in range(9):
+            z.writestr(f"file{i}.txt", "x")
+        z.writestr("inner.zip", inner)
+    agent = ArchiveAgent()
+    agent.archive_handler = ArchiveHandler(
+        config=replace(load_config(), max_archive_files=20)
+    )
+    result = agent.route_to_appropriate_parser(archive, "zip", {})
+    assert len(result["files"]) == 10
+    assert result["nested_truncated"] is True
+    assert 0 < len(result["nested_files"]) < 24
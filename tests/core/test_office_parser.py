@@ -2,7 +2,7 @@ from pathlib import Path
 
 import pytest
 
-from src.core.office_parser import OfficeParser
+from src.core.office_parser import OfficeParser, OfficeSession
 
 DATA_DIR = Path(__file__).resolve().parents[2] / "mock_data"
 
@@ -52,3 +52,297 @@ def test_parse_corrupted_pptx(tmp_path):
     parser = OfficeParser()
     with pytest.raises(ValueError):
         parser.parse_pptx(bad)
+
+
+@pytest.mark.parametrize(
+    "loader, method, name",
+    [
+        ("Document", "parse_docx", "mock_word.docx"),
+        ("Presentation", "parse_pptx", "mock_powerpoint.pptx"),
+        ("load_workbook", "parse_xlsx", "mock_excel.xlsx"),
+    ],
+)
+def test_parse_opens_package_once(monkeypatch, loader, method, name):
+    from src.core import office_parser
+
+    calls = []
+    original = getattr(office_parser, loader)
+    monkeypatch.setattr(
+        office_parser, loader, lambda *a, **kw: calls.append(a) or original(*a, **kw)
+    )
+    result = getattr(OfficeParser(), method)(DATA_DIR / name)
+    assert len(calls) == 1
+    assert "metadata" in result
+
+
+def test_session_shared_across_steps(tmp_path):
+    parser = OfficeParser()
+    with parser.open_session(DATA_DIR / "mock_word.docx") as session:
+        assert session.kind == "docx"
+        assert session.metadata().author == "tester"
+        assert session.extract_images(tmp_path / "img") == []
+    with pytest.raises(ValueError):
+        parser.open_session(DATA_DIR / "mock_archive.zip")
+
+
+def _workbook(path, rows=25):
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    wb.active.title = "First"
+    for i in range(rows):
+        wb.active.append([i, f"r{i}", i * 2])
+    wb.create_sheet("Second").append(["only"])
+    wb.save(path)
+    return path
+
+
+def test_parse_xlsx_read_only_with_limits(tmp_path):
+    path = _workbook(tmp_path / "big.xlsx")
+    result = OfficeParser().parse_xlsx(
+        path, read_only=True, max_sheets=1, max_rows=3, max_cols=2
+    )
+    assert list(result["sheets"]) == ["First"]
+    assert result["sheets"]["First"]["data"] == [[0, "r0"], [1, "r1"], [2, "r2"]]
+    assert result["sheets"]["First"]["comments"] == []
+
+
+def test_iter_xlsx_rows_and_pages(tmp_path):
+    path = _workbook(tmp_path / "big.xlsx")
+    parser = OfficeParser()
+    rows = parser.iter_xlsx_rows(path, sheets=["Second"])
+    assert next(rows) == ("Second", ("only",))
+    rows.close()
+
+    pages = list(parser.iter_xlsx_pages(path, page_size=10))
+    assert [(p.sheet, p.first_row, len(p.rows)) for p in pages] == [
+        ("First", 1, 10),
+        ("First", 11, 10),
+        ("First", 21, 5),
+        ("Second", 1, 1),
+    ]
+    assert pages[1].rows[0] == (10, "r10", 20)
+
+
+def test_parse_xlsx_formulas_values_and_comments_in_one_pass(tmp_path):
+    import zipfile
+
+    from openpyxl import Workbook
+    from openpyxl.comments import Comment
+
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["name", "qty", "total"])
+    ws.append(["a", 2, "=B2*2"])
+    ws["A1"].comment = Comment("header note", "auditor")
+    path = tmp_path / "calc.xlsx"
+    wb.save(path)
+    # openpyxl writes no cached values; add them and a shared formula the
+    # way Excel does.
+    with zipfile.ZipFile(path) as z:
+        parts = {n: z.read(n) for n in z.namelist()}
+    sheet = parts["xl/worksheets/sheet1.xml"].decode()
+    sheet = sheet.replace("<f>B2*2</f><v></v>", "<f>B2*2</f><v>4</v>")
+    sheet = sheet.replace(
+        "</sheetData>",
+        '<row r="3"><c r="B3"><v>5</v></c>'
+        '<c r="C3"><f t="shared" ref="C3:C4" si="0">B3*2</f><v>10</v></c></row>'
+        '<row r="4"><c r="B4"><v>1.5</v></c>'
+        '<c r="C4"><f t="shared" si="0"/><v>3</v></c></row>'
+        # A dependent whose master formula was never seen.
+        '<row r="5"><c r="C5"><f t="shared" si="7"/><v>8</v></c></row>'
+        "</sheetData>",
+    )
+    parts["xl/worksheets/sheet1.xml"] = sheet.encode()
+    with zipfile.ZipFile(path, "w") as z:
+        for name, data in parts.items():
+            z.writestr(name, data)
+
+    result = OfficeParser().parse_xlsx(path, include_formulas=True)
+    sheet = result["sheets"]["Sheet"]
+    assert sheet["data"] == [
+        ["name", "qty", "total"],
+        ["a", 2, 4],
+        [None, 5, 10],
+        [None, 1.5, 3],
+        [None, None, 8],
+    ]
+    assert [row[2] for row in sheet["formulas"]] == [
+        None,
+        "=B2*2",
+        "=B3*2",
+        "=B4*2",
+        None,
+    ]
+    assert sheet["comments"] == [{"cell": "A1", "text": "header note"}]
+
+
+def test_xlsx_xml_reader_converts_dates_like_openpyxl(tmp_path):
+    import zipfile
+    from datetime import datetime, time
+
+    from openpyxl import Workbook, load_workbook
+
+    path = tmp_path / "dates.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.append([datetime(2020, 1, 1), 43831, time(6, 30)])
+    ws["D1"] = "=A1+1"
+    ws["D1"].number_format = "yyyy-mm-dd"
+    wb.save(path)
+    # Give the formula a cached value, as Excel would.
+    with zipfile.ZipFile(path) as z:
+        parts = {n: z.read(n) for n in z.namelist()}
+    sheet = "xl/worksheets/sheet1.xml"
+    parts[sheet] = parts[sheet].replace(b"<v></v>", b"<v>43832</v>")
+    with zipfile.ZipFile(path, "w") as z:
+        for name, data in parts.items():
+            z.writestr(name, data)
+
+    result = OfficeParser().parse_xlsx(path, include_formulas=True)
+    row = result["sheets"]["Sheet"]["data"][0]
+    reference = load_workbook(path, data_only=True).active
+    assert row == [c.value for c in next(reference.rows)]
+    assert row[:2] == [datetime(2020, 1, 1), 43831]
+    assert row[3] == datetime(2020, 1, 2)
+
+
+def test_metadata_reads_property_parts_only(monkeypatch):
+    from src.core import office_parser
+
+    def no_load(*args, **kwargs):
+        raise AssertionError("package loaded for metadata")
+
+    for loader in ("Document", "Presentation", "load_workbook"):
+        monkeypatch.setattr(office_parser, loader, no_load)
+    parser = OfficeParser()
+    word = parser.get_document_metadata(DATA_DIR / "mock_word.docx")
+    assert (word.author, word.title, word.pages) == ("tester", "mock", 1)
+    assert word.created.startswith("2013-12-23 23:15:00")
+    deck = parser.get_document_metadata(DATA_DIR / "mock_powerpoint.pptx")
+    assert deck.slides == 0
+    assert deck.created == "2013-01-27 09:14:16"
+    book = parser.get_document_metadata(DATA_DIR / "mock_excel.xlsx")
+    assert (book.author, book.title) == ("openpyxl", "")
+    assert "+" not in book.created
+
+
+# 1x1 transparent PNG.
+PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6300010000050001"
+    "0d0a2db40000000049454e44ae426082"
+)
+
+
+def test_image_references_without_writing(tmp_path, monkeypatch):
+    import hashlib
+    import io
+
+    from pptx import Presentation
+    from pptx.util import Inches
+
+    pres = Presentation()
+    slide = pres.slides.add_slide(pres.slide_layouts[6])
+    slide.shapes.add_picture(io.BytesIO(PNG), Inches(1), Inches(1))
+    path = tmp_path / "deck.pptx"
+    pres.save(path)
+
+    monkeypatch.setattr(
+        OfficeSession, "extract_images", lambda *a: pytest.fail("wrote images")
+    )
+    parser = OfficeParser()
+    images = parser.parse_pptx(path)["images"]
+    assert len(images) == 1
+    ref = images[0]
+    assert ref["part"].startswith("ppt/media/")
+    assert ref["content_type"] == "image/png"
+    assert ref["size"] == len(PNG)
+    assert ref["sha256"] == hashlib.sha256(PNG).hexdigest()
+    with parser.open_image(path, ref["part"]) as fh:
+        assert fh.read() == PNG
+    with pytest.raises(ValueError):
+        with parser.open_image(path, "ppt/media/missing.png"):
+            pass
+
+
+def test_text_level_streams_xml(monkeypatch):
+    from src.core import office_parser
+
+    def no_load(*args, **kwargs):
+        raise AssertionError("object model built")
+
+    monkeypatch.setattr(office_parser, "Document", no_load)
+    monkeypatch.setattr(office_parser, "Presentation", no_load)
+    parser = OfficeParser()
+
+    doc = parser.parse_docx(DATA_DIR / "mock_word.docx", level="text")
+    assert doc["paragraphs"] == [
+        {"text": "Test Document", "heading_level": 1},
+        {"text": "This is a test paragraph.", "heading_level": None},
+    ]
+    assert doc["headings"] == ["Test Document"]
+    assert doc["metadata"]["author"] == "tester"
+
+    deck = parser.parse_pptx(DATA_DIR / "mock_powerpoint.pptx", level="text")
+    assert deck["slides"][0]["title"] == "Title"
+    assert "Title" in deck["slides"][0]["texts"][0]
+    with pytest.raises(ValueError):
+        parser.parse_docx(DATA_DIR / "mock_word.docx", level="outline")
+
+
+def test_text_level_matches_full_parse(tmp_path):
+    from pptx import Presentation
+
+    pres = Presentation()
+    for i in range(3):
+        slide = pres.slides.add_slide(pres.slide_layouts[1])
+        slide.shapes.title.text = f"Slide {i}"
+        slide.placeholders[1].text = f"first {i}\nsecond {i}"
+        slide.notes_slide.notes_text_frame.text = f"note {i}"
+    path = tmp_path / "deck.pptx"
+    pres.save(path)
+
+    parser = OfficeParser()
+    full = parser.parse_pptx(path)["slides"]
+    text = parser.parse_pptx(path, level="text")["slides"]
+    assert [s["texts"] for s in text] == [s["texts"] for s in full]
+    assert [s["notes"] for s in text] == [s["notes"] for s in full]
+    assert [s["title"] for s in text] == ["Slide 0", "Slide 1", "Slide 2"]
+
+
+def test_parallel_sheets_and_slides_keep_order(tmp_path):
+    from openpyxl import Workbook
+    from pptx import Presentation
+
+    wb = Workbook()
+    wb.active.title = "S0"
+    for i in range(5):
+        ws = wb.active if i == 0 else wb.create_sheet(f"S{i}")
+        for r in range(i * 10 + 1):
+            ws.append([r, f"=A{r + 1}*2", f"sheet {i}"])
+    book = tmp_path / "book.xlsx"
+    wb.save(book)
+
+    pres = Presentation()
+    for i in range(7):
+        slide = pres.slides.add_slide(pres.slide_layouts[1 if i % 2 else 5])
+        slide.shapes.title.text = f"Slide {i}\nline two"
+        if i % 3 == 0:
+            slide.notes_slide.notes_text_frame.text = f"notes {i}"
+        if i == 2:
+            box = slide.shapes.add_textbox(0, 0, 100, 100).text_frame
+            box.paragraphs[0].add_line_break()
+            table = slide.shapes.add_table(2, 2, 0, 0, 100, 100).table
+            table.cell(1, 1).text = "cell"
+    deck = tmp_path / "deck.pptx"
+    pres.save(deck)
+
+    parser = OfficeParser()
+    serial = parser.parse_xlsx(book, read_only=True, max_sheets=4)
+    parallel = parser.parse_xlsx(book, read_only=True, max_sheets=4, workers=3)
+    assert list(parallel["sheets"]) == ["S0", "S1", "S2", "S3"]
+    assert parallel == serial
+    xml = parser.parse_xlsx(book, include_formulas=True, workers=2)
+    assert xml == parser.parse_xlsx(book, include_formulas=True)
+    assert parser.parse_pptx(deck, workers=3) == parser.parse_pptx(deck)
@@ -0,0 +1,165 @@
+import json
+import os
+import zipfile
+from pathlib import Path
+
+import pytest
+from docx import Document
+
+from src.core.office_parser import OfficeParser
+from src.core.parse_cache import ParseCache
+from src.core.powerbi_parser import PowerBIParser
+from src.core.tableau_parser import TableauParser
+
+
+def _make_pbix(path: Path, measure: str) -> Path:
+    model = {"tables": [{"measures": [{"expression": measure}]}]}
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr("DataModel/model.bim", json.dumps(model))
+    return path
+
+
+def _counting(result):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return result
+
+    return compute, calls
+
+
+def _fail(*args):
+    pytest.fail("parser ran despite a cached result")
+
+
+def test_hit_returns_fresh_copy(tmp_path):
+    cache = ParseCache()
+    source = tmp_path / "a.bin"
+    source.write_bytes(b"data")
+    compute, calls = _counting({"rows": [1, 2]})
+    first = cache.get_or_compute(source, "p", "1", {}, compute)
+    first["rows"].append(3)
+    second = cache.get_or_compute(source, "p", "1", {}, compute)
+    assert second == {"rows": [1, 2]}
+    assert len(calls) == 1
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_key_covers_parser_version_options_and_content(tmp_path):
+    cache = ParseCache()
+    source = tmp_path / "a.bin"
+    source.write_bytes(b"data")
+    compute, calls = _counting("x")
+    cache.get_or_compute(source, "p", "1", {"level": "full"}, compute)
+    cache.get_or_compute(source, "p", "1", {"level": "text"}, compute)
+    cache.get_or_compute(source, "q", "1", {"level": "full"}, compute)
+    cache.get_or_compute(source, "p", "2", {"level": "full"}, compute)
+    source.write_bytes(b"changed")
+    os.utime(source, ns=(0, 0))
+    cache.get_or_compute(source, "p", "1", {"level": "full"}, compute)
+    assert len(calls) == 5
+    assert cache.get_stats()["hits"] == 0
+
+
+def test_memory_tier_evicts_least_recently_used(tmp_path):
+    cache = ParseCache(memory_bytes=1500)
+    sources = []
+    for i in range(3):
+        path = tmp_path / f"{i}.bin"
+        path.write_bytes(bytes([i]))
+        sources.append(path)
+    for path in sources[:2]:
+        cache.get_or_compute(path, "p", "1", {}, lambda: "x" * 600)
+    cache.get_or_compute(sources[0], "p", "1", {}, lambda: "unused")
+    cache.get_or_compute(sources[2], "p", "1", {}, lambda: "x" * 600)
+    assert cache.get_stats()["evictions"] == 1
+    compute, calls = _counting("recomputed")
+    cache.get_or_compute(sources[1], "p", "1", {}, compute)
+    cache.get_or_compute(sources[0], "p", "1", {}, compute)
+    assert len(calls) == 1
+
+
+def test_disk_tier_survives_new_instance_and_evicts(tmp_path):
+    root = tmp_path / "cache"
+    source = tmp_path / "a.bin"
+    source.write_bytes(b"data")
+    cache = ParseCache(root, memory_bytes=0, disk_bytes=1024 * 1024)
+    cache.get_or_compute(source, "p", "1", {}, lambda: list(range(1000)))
+
+    reopened = ParseCache(root, memory_bytes=1024 * 1024, disk_bytes=1024 * 1024)
+    compute, calls = _counting(None)
+    assert reopened.get_or_compute(source, "p", "1", {}, compute) == list(range(1000))
+    assert not calls
+    assert reopened.get_stats()["disk_hits"] == 1
+
+    size = reopened.get_stats()["disk_bytes"]
+    small = ParseCache(root, memory_bytes=0, disk_bytes=size * 3 // 2)
+    other = tmp_path / "b.bin"
+    other.write_bytes(b"other")
+    small.get_or_compute(other, "p", "1", {}, lambda: list(range(1000, 2000)))
+    assert small.get_stats()["disk_evictions"] == 1
+    assert len(list(root.glob("*/*.bin"))) == 1
+
+
+def test_overwriting_disk_entry_keeps_byte_total(tmp_path):
+    root = tmp_path / "cache"
+    cache = ParseCache(root, memory_bytes=0, disk_bytes=1024 * 1024)
+    cache.put("k" * 64, list(range(1000)))
+    cache.put("k" * 64, "small")
+    (entry,) = root.glob("*/*.bin")
+    assert cache.get_stats()["disk_bytes"] == entry.stat().st_size
+
+
+def test_corrupt_disk_entry_is_a_miss(tmp_path):
+    root = tmp_path / "cache"
+    source = tmp_path / "a.bin"
+    source.write_bytes(b"data")
+    cache = ParseCache(root, memory_bytes=0, disk_bytes=1024 * 1024)
+    cache.get_or_compute(source, "p", "1", {}, lambda: "x")
+    for entry in root.glob("*/*.bin"):
+        entry.write_bytes(b"garbage")
+    compute, calls = _counting("y")
+    assert cache.get_or_compute(source, "p", "1", {}, compute) == "y"
+    assert len(calls) == 1
+
+
+def test_parsers_share_cache(tmp_path, monkeypatch):
+    cache = ParseCache()
+    pbix = _make_pbix(tmp_path / "a.pbix", "SUM(x)")
+    powerbi = PowerBIParser(cache)
+    assert powerbi.parse_pbix(pbix)["dax_measures"] == ["SUM(x)"]
+    # Streams have no content digest and bypass the cache.
+    with open(pbix, "rb") as stream:
+        powerbi.parse_pbix(stream)
+    monkeypatch.setattr(PowerBIParser, "_parse_pbix", _fail)
+    assert PowerBIParser(cache).parse_pbix(pbix)["dax_measures"] == ["SUM(x)"]
+    # Another parser on the same file gets its own entry.
+    TableauParser(cache).parse_twbx(pbix)
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+
+def test_office_parse_options_are_keyed(tmp_path):
+    path = tmp_path / "a.docx"
+    document = Document()
+    document.add_heading("Title", level=1)
+    document.add_paragraph("Body")
+    document.save(path)
+    cache = ParseCache()
+    parser = OfficeParser(cache)
+    full = parser.parse_docx(path)
+    text = parser.parse_docx(path, level="text")
+    assert "tables" in full and "tables" not in text
+    assert parser.parse_docx(path) == full
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_disk_tier_requires_private_directory(tmp_path):
+    root = tmp_path / "cache"
+    ParseCache(root, disk_bytes=1024)
+    assert root.stat().st_mode & 0o777 == 0o700
+    root.chmod(0o777)
+    with pytest.raises(ValueError):
+        ParseCache(root, disk_bytes=1024)
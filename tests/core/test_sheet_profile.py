@@ -0,0 +1,66 @@
+from datetime import datetime
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.core.office_parser import OfficeParser
+from src.core.sheet_profile import profile_sheet, to_columnar
+
+
+ROWS = [
+    ["id", "price", "city", "when", None],
+    [1, 2.5, "Oslo", datetime(2024, 1, 2), "x"],
+    [2, None, "Rome", datetime(2024, 3, 4), 5],
+    [3, 4, "Oslo", None, None],
+]
+
+
+def test_to_columnar_types_and_masks():
+    sheet = to_columnar(ROWS)
+    assert sheet.row_count == 3
+    assert [c.type for c in sheet.columns] == [
+        "int",
+        "float",
+        "string",
+        "datetime",
+        "object",
+    ]
+    ids = sheet.column("id")
+    assert ids.values.dtype == np.int64
+    price = sheet.column("price")
+    assert price.mask.tolist() == [False, True, False]
+    assert price.to_list() == [2.5, None, 4.0]
+    assert sheet.columns[4].name == "E"
+
+
+def test_profile_sheet():
+    profile = profile_sheet(to_columnar(ROWS), top=1)
+    columns = {c["name"]: c for c in profile["columns"]}
+    assert profile["row_count"] == 3
+    assert columns["city"]["distinct_count"] == 2
+    assert columns["city"]["top_values"] == [{"value": "Oslo", "count": 2}]
+    assert (columns["price"]["min"], columns["price"]["max"]) == (2.5, 4.0)
+    assert columns["price"]["null_count"] == 1
+    assert columns["when"]["min"].startswith("2024-01-02")
+    assert columns["E"]["min"] is None and columns["E"]["count"] == 2
+
+
+def test_parse_xlsx_profile_output(tmp_path):
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    for row in ROWS:
+        wb.active.append(row)
+    path = tmp_path / "data.xlsx"
+    wb.save(path)
+
+    parser = OfficeParser()
+    result = parser.parse_xlsx(path, read_only=True, output="profile")
+    sheet = result["sheets"]["Sheet"]
+    assert "data" not in sheet
+    assert sheet["profile"]["columns"][0]["max"] == 3
+    columns = parser.parse_xlsx(path, output="columns")["sheets"]["Sheet"]["columns"]
+    assert columns.column("city").to_list() == ["Oslo", "Rome", "Oslo"]
+    with pytest.raises(ValueError):
+        parser.parse_xlsx(path, output="json")
@@ -15,8 +15,8 @@ class FakeContainer:
     def list_blobs(self, name_starts_with=None):
         return [types.SimpleNamespace(name="tmp/file1.txt"), types.SimpleNamespace(name="tmp/file2.txt")]
 
-    def delete_blob(self, name):
-        self.deleted.append(name)
+    def delete_blobs(self, *names, raise_on_any_failure=True):
+        self.deleted.extend(names)
 
 
 class FakeService:
@@ -38,7 +38,7 @@ def test_upload_and_cleanup(monkeypatch, tmp_path: Path):
     file2.write_text("more")
 
     client.upload_files([file1, file2])
-    assert fake.container.uploaded == ["a.txt", "b.txt"]
+    assert sorted(fake.container.uploaded) == ["a.txt", "b.txt"]
 
     client.cleanup_temp_blobs(prefix="tmp/")
     assert fake.container.deleted == ["tmp/file1.txt", "tmp/file2.txt"]
@@ -65,3 +65,141 @@ def test_extract_uses_azure_storage(monkeypatch, tmp_path: Path):
 
     handler.extract_archive(archive)
     assert fake.container.uploaded == ["file.txt"]
+
+
+class FakeBlob:
+    def __init__(self, container, name):
+        self.container = container
+        self.name = name
+
+    def stage_block(self, block_id, data):
+        self.container.staged.setdefault(self.name, []).append((block_id, data))
+
+    def commit_block_list(self, blocks):
+        self.container.committed[self.name] = [b.block_id for b in blocks]
+
+
+def test_upload_stream_stages_blocks(monkeypatch):
+    import io
+
+    fake = FakeService()
+    fake.container.staged = {}
+    fake.container.committed = {}
+    fake.container.get_blob_client = lambda name: FakeBlob(fake.container, name)
+    monkeypatch.setattr(
+        "src.utils.azure_storage.BlobServiceClient",
+        lambda account_url, credential: fake,
+    )
+    monkeypatch.setattr(
+        "src.utils.azure_storage.BlobBlock", types.SimpleNamespace
+    )
+    client = AzureStorageClient("acct", "key", "container")
+    client.BLOCK_SIZE = 4
+
+    client.upload_stream("big.bin", io.BytesIO(b"0123456789"))
+    client.upload_stream("small.bin", io.BytesIO(b"ab"))
+    staged = fake.container.staged["big.bin"]
+    assert [data for _, data in staged] == [b"0123", b"4567", b"89"]
+    assert fake.container.committed["big.bin"] == [i for i, _ in staged]
+    assert fake.container.uploaded == ["small.bin"]
+
+
+def test_upload_files_retries_and_keeps_paths(monkeypatch, tmp_path: Path):
+    fake = FakeService()
+    fake.container.staged = {}
+    fake.container.committed = {}
+    fake.container.get_blob_client = lambda name: FakeBlob(fake.container, name)
+    failures = []
+    upload = fake.container.upload_blob
+
+    def flaky_upload(name, data, overwrite=False):
+        if name not in failures:
+            failures.append(name)
+            raise ConnectionError("reset by peer")
+        upload(name, data, overwrite)
+
+    fake.container.upload_blob = flaky_upload
+    monkeypatch.setattr(
+        "src.utils.azure_storage.BlobServiceClient",
+        lambda account_url, credential: fake,
+    )
+    monkeypatch.setattr(
+        "src.utils.azure_storage.BlobBlock", types.SimpleNamespace
+    )
+    client = AzureStorageClient("acct", "key", "container", retry_backoff=0)
+    client.BLOCK_SIZE = 4
+    for folder in ("a", "b"):
+        (tmp_path / folder).mkdir()
+        (tmp_path / folder / "same.txt").write_text("x")
+    (tmp_path / "big.bin").write_bytes(b"0123456789")
+
+    files = [tmp_path / "a" / "same.txt", tmp_path / "b" / "same.txt"]
+    files.append(tmp_path / "big.bin")
+    client.upload_files(files, prefix="job1/", base_dir=tmp_path)
+    assert sorted(fake.container.uploaded) == ["job1/a/same.txt", "job1/b/same.txt"]
+    assert len(fake.container.committed["job1/big.bin"]) == 3
+    stats = {s["name"]: s for s in client.get_upload_stats()}
+    assert stats["job1/a/same.txt"]["attempts"] == 2
+    assert stats["job1/big.bin"]["bytes"] == 10
+    assert "throughput_mb_s" in stats["job1/big.bin"]
+
+
+def test_upload_files_gives_up_on_permanent_error(monkeypatch, tmp_path: Path):
+    import pytest
+
+    fake = FakeService()
+    calls = []
+
+    def denied(name, data, overwrite=False):
+        calls.append(name)
+        raise PermissionError("denied")
+
+    fake.container.upload_blob = denied
+    monkeypatch.setattr(
+        "src.utils.azure_storage.BlobServiceClient",
+        lambda account_url, credential: fake,
+    )
+    client = AzureStorageClient("acct", "key", "container", retry_backoff=0)
+    path = tmp_path / "a.txt"
+    path.write_text("a")
+    with pytest.raises(PermissionError):
+        client.upload_files([path])
+    assert calls == ["a.txt"]
+
+
+def test_cleanup_batches_and_expires_stale_jobs(monkeypatch):
+    from datetime import datetime, timedelta, timezone
+
+    now = datetime.now(timezone.utc)
+
+    def blob(name, hours):
+        return types.SimpleNamespace(
+            name=name, last_modified=now - timedelta(hours=hours)
+        )
+
+    blobs = [
+        blob("tmp/old/a.txt", 2),
+        blob("tmp/old/b.txt", 3),
+        blob("tmp/new/a.txt", 3),
+        blob("tmp/new/b.txt", 0),
+    ]
+    fake = FakeService()
+    batches = []
+    fake.container.list_blobs = lambda name_starts_with=None: [
+        b for b in blobs if b.name.startswith(name_starts_with)
+    ]
+    fake.container.delete_blobs = lambda *names, **kw: batches.append(names)
+    monkeypatch.setattr(
+        "src.utils.azure_storage.BlobServiceClient",
+        lambda account_url, credential: fake,
+    )
+    client = AzureStorageClient("acct", "key", "container")
+    client.DELETE_BATCH_SIZE = 1
+
+    assert client.expire_temp_prefixes(3600) == ["tmp/old/"]
+    assert batches == [("tmp/old/a.txt",), ("tmp/old/b.txt",)]
+
+    batches.clear()
+    client.DELETE_BATCH_SIZE = 256
+    client.cleanup_temp_blobs("tmp/new/")
+    assert batches == [("tmp/new/a.txt", "tmp/new/b.txt")]
@@ -2,8 +2,11 @@ from pathlib import Path
 import os
 import zipfile
 
+import pytest
+
 from src.utils.local_storage import LocalStorageClient
 from src.core.archive_handler import ArchiveHandler
+from src.core.extraction_guard import ExtractionBudget, ExtractionLimitExceeded
 
 
 def test_local_upload_and_cleanup(tmp_path: Path):
@@ -34,3 +37,141 @@ def test_extract_uses_local_storage(tmp_path: Path):
     handler = ArchiveHandler(storage_client=client)
     handler.extract_archive(archive)
     assert (store / "file.txt").exists()
+
+
+def test_move_renames_and_copy_keeps_source(tmp_path: Path):
+    client = LocalStorageClient(tmp_path / "store")
+    moved = tmp_path / "moved.txt"
+    moved.write_text("m")
+    kept = tmp_path / "kept.txt"
+    kept.write_text("k")
+
+    client.move_files([moved])
+    client.upload_files([kept])
+    assert not moved.exists()
+    assert kept.exists()
+    assert (tmp_path / "store" / "kept.txt").read_text() == "k"
+    stats = client.get_transfer_stats()
+    assert stats["rename"] == 1
+    assert sum(stats.values()) == 2
+
+
+def test_link_files_shares_inode(tmp_path: Path):
+    client = LocalStorageClient(tmp_path / "store", link_files=True)
+    src = tmp_path / "a.txt"
+    src.write_text("data")
+    client.upload_files([src])
+    stored = tmp_path / "store" / "a.txt"
+    assert stored.read_text() == "data"
+    if client.get_transfer_stats().get("hardlink"):
+        assert stored.stat().st_ino == src.stat().st_ino
+
+
+def test_extract_directly_into_local_storage(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("STORAGE_PROVIDER", "local")
+    archive = tmp_path / "demo.zip"
+    with zipfile.ZipFile(archive, "w") as z:
+        z.writestr("docs/file.txt", "content")
+
+    client = LocalStorageClient(tmp_path / "store")
+    handler = ArchiveHandler(storage_client=client)
+    files = handler.extract_archive(archive)
+    assert files == [tmp_path / "store" / "docs" / "file.txt"]
+    assert files[0].read_text() == "content"
+    assert client.get_transfer_stats() == {}
+
+
+def test_stream_to_storage_without_staging(tmp_path: Path, monkeypatch):
+    import tempfile
+
+    archive = tmp_path / "demo.zip"
+    with zipfile.ZipFile(archive, "w") as z:
+        for i in range(6):
+            z.writestr(f"dir{i % 2}/file{i}.txt", f"content {i}")
+
+    def no_temp(*args, **kwargs):
+        raise AssertionError("staged on local disk")
+
+    monkeypatch.setattr(tempfile, "mkdtemp", no_temp)
+    client = LocalStorageClient(tmp_path / "store")
+    handler = ArchiveHandler(storage_client=client)
+    names = handler.stream_to_storage(archive, prefix="job1/", concurrency=3)
+    assert sorted(names) == sorted(f"job1/dir{i % 2}/file{i}.txt" for i in range(6))
+    assert (tmp_path / "store" / "job1" / "dir1" / "file5.txt").read_text() == (
+        "content 5"
+    )
+
+
+def test_temp_extract_cleans_only_its_job_prefix(tmp_path: Path):
+    archive = tmp_path / "demo.zip"
+    with zipfile.ZipFile(archive, "w") as z:
+        z.writestr("docs/a.txt", "a")
+    store = tmp_path / "store"
+    client = LocalStorageClient(store)
+    other = store / "tmp" / "otherjob" / "b.txt"
+    other.parent.mkdir(parents=True)
+    other.write_text("b")
+
+    handler = ArchiveHandler(storage_client=client)
+    with handler.temp_extract(archive):
+        uploaded = list((store / "tmp").glob("*/docs/a.txt"))
+        assert len(uploaded) == 1
+    assert not uploaded[0].exists()
+    assert list((store / "tmp").iterdir()) == [other.parent]
+    assert other.exists()
+
+
+def test_temp_extract_with_directory_entries(tmp_path: Path):
+    archive = tmp_path / "dirs.zip"
+    with zipfile.ZipFile(archive, "w") as z:
+        z.writestr("docs/", "")
+        z.writestr("docs/sub/", "")
+        z.writestr("docs/sub/a.txt", "a")
+        z.writestr("docs/b.txt", "b")
+    store = tmp_path / "store"
+    handler = ArchiveHandler(storage_client=LocalStorageClient(store))
+    with handler.temp_extract(archive):
+        (job,) = (store / "tmp").iterdir()
+        assert (job / "docs" / "sub" / "a.txt").read_text() == "a"
+        assert (job / "docs" / "b.txt").read_text() == "b"
+    assert not list((store / "tmp").iterdir())
+
+
+def test_expire_temp_prefixes_by_age(tmp_path: Path):
+    import time
+
+    client = LocalStorageClient(tmp_path / "store")
+    for job in ("old", "new"):
+        path = tmp_path / "store" / "tmp" / job / "nested" / "f.txt"
+        path.parent.mkdir(parents=True)
+        path.write_text(job)
+    stale = time.time() - 3600
+    for path in (tmp_path / "store" / "tmp" / "old").rglob("*"):
+        os.utime(path, (stale, stale))
+    os.utime(tmp_path / "store" / "tmp" / "old", (stale, stale))
+
+    reaper = client.start_temp_reaper(max_age_seconds=60, interval_seconds=3600)
+    assert client.start_temp_reaper(60) is reaper
+    assert reaper.run_once() == ["tmp/old/"]
+    reaper.stop()
+    assert not (tmp_path / "store" / "tmp" / "old").exists()
+    assert (tmp_path / "store" / "tmp" / "new" / "nested" / "f.txt").exists()
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_stream_to_storage_removes_uploads_on_limit(tmp_path: Path, concurrency):
+    archive = tmp_path / "bomb.zip"
+    with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        for i in range(6):
+            z.writestr(f"ok{i}.bin", os.urandom(1024))
+        z.writestr("bomb.bin", b"\0" * (4 * 1024 * 1024))
+    store = tmp_path / "store"
+    handler = ArchiveHandler(storage_client=LocalStorageClient(store))
+    with pytest.raises(ExtractionLimitExceeded):
+        handler.stream_to_storage(
+            archive,
+            prefix="job/",
+            budget=ExtractionBudget(max_member_ratio=10),
+            concurrency=concurrency,
+        )
+    assert list(store.iterdir()) == []
@@ -58,3 +58,35 @@ def test_output_structure():
 def test_all_mock_archives(fname):
     res = extract_archive_tool(str(DATA_DIR / fname))
     assert res["status"] == "success"
+
+
+def test_max_files_pushed_down(tmp_path):
+    import zipfile
+
+    archive = tmp_path / "many.zip"
+    with zipfile.ZipFile(archive, "w") as z:
+        for i in range(5):
+            z.writestr(f"f{i}.sql", "select 1")
+        z.writestr("notes.txt", "skip")
+    res = extract_archive_tool(str(archive), max_files=2, include_patterns=["*.sql"])
+    assert res["status"] == "success"
+    assert [Path(f).name for f in res["files"]] == ["f0.sql", "f1.sql"]
+    assert res["archive_info"]["file_count"] == 6
+    assert res["archive_info"]["returned_count"] == 2
+
+
+def test_detailed_mode_lists_without_extraction(tmp_path, monkeypatch):
+    from src.core.archive_handler import ArchiveHandler
+
+    def fail(*args, **kwargs):
+        raise AssertionError("listing modes must not extract")
+
+    monkeypatch.setattr(ArchiveHandler, "extract_archive", fail)
+    res = extract_archive_tool(
+        str(DATA_DIR / "mock_source.tar.gz"), extraction_mode="detailed"
+    )
+    assert res["status"] == "success"
+    info = res["files"][0]
+    assert info["path"] == "src/main.py"
+    assert info["size"] == len("print()")
+    assert info["type"] == "py"